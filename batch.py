@@ -0,0 +1,25 @@
+from argparse import ArgumentParser, FileType
+from json import dumps
+from sys import stdin
+
+from src.batch import prove_all
+from src.core.resolution import CLAUSIFIERS, ENGINES
+from src.config.limits_conf import add_limit_arguments, get_limits
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser(
+        description='Prove formulas (one per line) in parallel, print results as JSON lines')
+    arg_parser.add_argument('file', nargs='?', type=FileType('r'), default=stdin,
+                            help='file with formulas (standard input if not given)')
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None,
+                            help='number of worker processes (default: number of CPUs)')
+    arg_parser.add_argument('--clausifier', choices=CLAUSIFIERS, default='distribution',
+                            help='how to bring formula to CNF (default: %(default)s)')
+    arg_parser.add_argument('--engine', choices=ENGINES, default='auto',
+                            help='how to derive nil from clauses (default: %(default)s)')
+    add_limit_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    for result in prove_all(args.file, args.jobs, clausifier=args.clausifier,
+                            engine=args.engine, limits=get_limits(args)):
+        print(dumps(result, ensure_ascii=False), flush=True)
@@ -1,10 +1,11 @@
-from sys import argv
+from argparse import ArgumentParser
 from typing import Any
 from logging import getLogger
 
-from src.parser.parser import parser
-from src.core.resolution import Resolution, TransformationInfo
+from src.parser.parser import parser, ParseError
+from src.core.resolution import Resolution, TransformationInfo, CLAUSIFIERS, ENGINES, RESOURCE_OUT
 from src.config.logger_conf import configure_logger
+from src.config.limits_conf import add_limit_arguments, get_limits
 from src.core.resolution_info import ResolutionStep
 
 logger = getLogger('__main__')
@@ -39,23 +40,48 @@ def print_res_steps(res_steps: list[ResolutionStep]) -> None:
 if __name__ == '__main__':
     configure_logger()
 
+    arg_parser = ArgumentParser(description='Prove formula with resolution method')
+    arg_parser.add_argument('formula', nargs='*', help='formula (prompted for if not given)')
+    arg_parser.add_argument('--clausifier', choices=CLAUSIFIERS, default='distribution',
+                            help='how to bring formula to CNF (default: %(default)s)')
+    arg_parser.add_argument('--engine', choices=ENGINES, default='auto',
+                            help='how to derive nil from clauses (default: %(default)s)')
+    arg_parser.add_argument('--no-trace', action='store_true',
+                            help='bring formula to clauses in one pass, don\'t show transformations')
+    arg_parser.add_argument('--full-trace', action='store_true',
+                            help='show all resolution steps, not only ones that nil is derived with')
+    add_limit_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
     formula_str = ''
-    if len(argv) > 1:
-        formula_str = ' '.join(argv[1:])
+    if len(args.formula) > 0:
+        formula_str = ' '.join(args.formula)
     else:
         formula_str = input('Enter formula: ')
-    formula = parser.parse(formula_str)
-    resolution = Resolution(formula)
+    try:
+        formula = parser.parse(formula_str)
+    except ParseError as e:
+        print(e)
+        exit(1)
+    resolution = Resolution(formula, clausifier=args.clausifier, trace=not args.no_trace,
+                            engine=args.engine, limits=get_limits(args))
     result = resolution.resolution()
 
     print(f'* {formula} *')
-    print_transformations(resolution.get_transformations_info())
+    if not args.no_trace:
+        print_transformations(resolution.get_transformations_info())
     print(f'Clauses: {clauses_to_str(resolution.get_first_clauses())}\n')
-    print_res_steps(resolution.get_resolution_steps())
+    if result and not args.full_trace:
+        print_res_steps(resolution.get_proof_steps())
+    else:
+        print_res_steps(resolution.get_resolution_steps())
 
     if (result):
         print('Formula proved.')
         exit(0)
+    elif resolution.get_status() == RESOURCE_OUT:
+        print(f'Formula cannot be proved: resources are out ({resolution.resource_out})')
+        exit(6)
     else:
         print('Formula cannot be proved')
         exit(5)
@@ -0,0 +1,30 @@
+from argparse import ArgumentParser, FileType
+from json import dumps
+from sys import stdin
+
+from src.portfolio import race, load_portfolio, WinStatistics, DEFAULT_PORTFOLIO
+from src.config.limits_conf import add_limit_arguments, get_limits
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser(
+        description='Race strategies on formulas (one per line), print results as JSON lines')
+    arg_parser.add_argument('file', nargs='?', type=FileType('r'), default=stdin,
+                            help='file with formulas (standard input if not given)')
+    arg_parser.add_argument('--portfolio', default=DEFAULT_PORTFOLIO,
+                            help='TOML or JSON file with strategies (default: %(default)s)')
+    arg_parser.add_argument('--stats',
+                            help='JSON file where wins of strategies are accumulated')
+    add_limit_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    strategies = load_portfolio(args.portfolio)
+    stats = None if args.stats is None else WinStatistics(args.stats)
+    for number, formula_str in enumerate(args.file, 1):
+        formula_str = formula_str.strip()
+        if len(formula_str) == 0:
+            continue
+        result = race(formula_str, strategies, number, get_limits(args))
+        print(dumps(result, ensure_ascii=False), flush=True)
+        if stats is not None:
+            stats.record(result)
+            stats.save()
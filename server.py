@@ -0,0 +1,40 @@
+from argparse import ArgumentParser
+from os import cpu_count
+
+from src.server import Prover, ProverServer, UnixProverServer
+from src.core.resolution import CLAUSIFIERS, ENGINES
+from src.config.limits_conf import add_limit_arguments, get_limits
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser(
+        description='Serve proofs over HTTP: POST /prove with JSON {"formula": ...}')
+    arg_parser.add_argument('--host', default='127.0.0.1',
+                            help='address to listen on (default: %(default)s)')
+    arg_parser.add_argument('--port', type=int, default=8765,
+                            help='port to listen on (default: %(default)s)')
+    arg_parser.add_argument('--socket', metavar='PATH',
+                            help='listen on Unix socket instead of host and port')
+    arg_parser.add_argument('-j', '--jobs', type=int, default=cpu_count(),
+                            help='number of worker processes, 0 to prove in threads of server '
+                                 '(default: number of CPUs)')
+    arg_parser.add_argument('--clausifier', choices=CLAUSIFIERS, default='distribution',
+                            help='how to bring formula to CNF (default: %(default)s)')
+    arg_parser.add_argument('--engine', choices=ENGINES, default='auto',
+                            help='how to derive nil from clauses (default: %(default)s)')
+    add_limit_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    prover = Prover(args.jobs, get_limits(args), clausifier=args.clausifier, engine=args.engine)
+    if args.socket is not None:
+        server = UnixProverServer(args.socket, prover)
+        print(f'Listening on {args.socket}', flush=True)
+    else:
+        server = ProverServer((args.host, args.port), prover)
+        print(f'Listening on http://{args.host}:{server.server_port}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        prover.close()
@@ -0,0 +1,69 @@
+'''Proving many formulas in a pool of worker processes.
+
+Parser tables and the model are built once per worker, not once per formula. Each formula gets a
+result dictionary with its status, time and clause counts; results are yielded as soon as they are
+ready, so they can be streamed (e. g. as JSON lines), and they aren't in the order of formulas.'''
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from os import cpu_count
+from time import perf_counter
+
+from src.parser.parser import parse, ParseError
+from src.core.resolution import Resolution, PROVED, UNPROVED, RESOURCE_OUT
+
+# Formula can't be parsed or prover failed on it
+ERROR = 'error'
+
+# Formulas sent to pool but not finished yet, per worker
+PENDING_PER_JOB = 4
+
+
+# Result for formula on the given line; options are passed to Resolution
+def prove(formula_str: str, line: int = 0, **options) -> dict:
+    result = {'line': line, 'formula': formula_str}
+    start = perf_counter()
+    try:
+        resolution = Resolution(parse(formula_str), **options)
+        proved = resolution.resolution()
+    except ParseError as e:
+        result.update(status=ERROR, error=str(e), time=perf_counter() - start)
+        return result
+    except Exception as e:
+        result.update(status=ERROR, error=f'{type(e).__name__}: {e}', time=perf_counter() - start)
+        return result
+    result['status'] = resolution.get_status()
+    if result['status'] == RESOURCE_OUT:
+        result['resource'] = resolution.resource_out.resource
+    result['time'] = perf_counter() - start
+    budget = resolution.get_budget()
+    result['steps'] = budget.steps
+    result['generated'] = budget.clauses
+    result['clauses'] = len(resolution.get_first_clauses())
+    proof = resolution.proof
+    # Nodes without parents are input clauses
+    result['derived'] = 0 if proof is None else sum(len(p) > 0 for p in proof.parents)
+    result['proof_steps'] = len(resolution.get_proof_steps())
+    if not proved:
+        result['clauses_left'] = len(resolution.get_clauses_left())
+    return result
+
+
+# Lines are read lazily, empty ones are skipped; jobs is number of worker processes (number of
+# CPUs if None)
+def prove_all(lines: Iterable[str], jobs: int | None = None, **options) -> Iterator[dict]:
+    jobs = cpu_count() if jobs is None else jobs
+    with ProcessPoolExecutor(jobs) as pool:
+        pending = set()
+        for number, formula_str in enumerate(lines, 1):
+            formula_str = formula_str.strip()
+            if len(formula_str) == 0:
+                continue
+            pending.add(pool.submit(prove, formula_str, number, **options))
+            if len(pending) >= PENDING_PER_JOB * jobs:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while len(pending) > 0:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
@@ -0,0 +1,23 @@
+from argparse import ArgumentParser, Namespace
+
+from src.core.limits import Limits
+
+
+# Command line options for Limits (see get_limits)
+def add_limit_arguments(arg_parser: ArgumentParser) -> None:
+    group = arg_parser.add_argument_group('resource limits (no limit by default)')
+    group.add_argument('--time-limit', type=float, metavar='SECONDS',
+                       help='wall-clock time of one proof')
+    group.add_argument('--max-clauses', type=int, metavar='N',
+                       help='number of clauses generated by distribution and by engine')
+    group.add_argument('--max-steps', type=int, metavar='N',
+                       help='number of steps of engine (given clauses, conflicts, ...)')
+    group.add_argument('--max-term-depth', type=int, metavar='N',
+                       help='nesting depth of atoms in clauses')
+    group.add_argument('--memory-limit', type=float, metavar='MB',
+                       help='resident memory of process (checked from time to time)')
+
+
+def get_limits(args: Namespace) -> Limits:
+    return Limits(time=args.time_limit, clauses=args.max_clauses, steps=args.max_steps,
+                  term_depth=args.max_term_depth, memory=args.memory_limit)
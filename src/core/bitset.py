@@ -0,0 +1,149 @@
+'''Resolution for propositional clauses over NumPy bitsets.
+
+Clause is a pair of bitmasks over atom ids: atoms of its positive literals and atoms of its negative
+ones (each row consists of 64-bit words). Given clause is resolved with all active clauses at once:
+clashing atoms of each pair are (pos_a & neg_b) | (neg_a & pos_b), only pairs with exactly one of
+them give non-tautological resolvents, and resolvents are (pos_a | pos_b) & ~clash and
+(neg_a | neg_b) & ~clash. Clause c subsumes d iff both masks of c are subsets of masks of d, which
+is checked against all kept clauses at once too.
+
+NumPy is only needed for this engine.'''
+from logging import getLogger
+
+import numpy as np
+
+from src.core.clause_store import ClauseStore, EncodedClause
+from src.core.resolution_info import ProofGraph
+from src.core.limits import current_budget
+
+logger = getLogger(__name__)
+
+
+class BitsetResolution:
+    '''Given-clause loop (see Saturation) where the shortest passive clause is selected. Atoms of
+    store are propositional variables'''
+
+    def __init__(self, store: ClauseStore, clauses: list[EncodedClause],
+                 record_steps: bool = True):
+        self.store = store
+        self.record_steps = record_steps
+        self.proof = ProofGraph(store)
+        self.steps = []
+        self.words = (len(store.atoms) + 63) // 64
+        capacity = max(16, 2 * len(clauses))
+        self.pos = np.zeros((capacity, self.words), dtype=np.uint64)
+        self.neg = np.zeros((capacity, self.words), dtype=np.uint64)
+        # Kept clauses (not subsumed) and active ones among them
+        self.kept = np.zeros(capacity, dtype=bool)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.weights = np.zeros(capacity, dtype=np.int64)
+        self.size = 0
+        # Row -> clause, for steps
+        self.clauses = []
+        self.generated = 0
+        self.has_nil = False
+        self.budget = current_budget()
+        for clause in dict.fromkeys(clauses):
+            if len(clause) == 0:
+                self.has_nil = True
+            elif not ClauseStore.is_tautology(clause):
+                pos, neg = self.masks(clause)
+                if not self.is_subsumed(pos, neg):
+                    self.add(pos, neg, clause)
+
+    def masks(self, clause: EncodedClause) -> (np.ndarray, np.ndarray):
+        masks = np.zeros((2, self.words), dtype=np.uint64)
+        for lit in clause:
+            atom = abs(lit)
+            masks[int(lit < 0), atom // 64] |= np.uint64(1 << (atom % 64))
+        return masks[0], masks[1]
+
+    @staticmethod
+    def atoms_of(mask: np.ndarray) -> np.ndarray:
+        return np.flatnonzero(np.unpackbits(mask.view(np.uint8), bitorder='little'))
+
+    def decode(self, pos: np.ndarray, neg: np.ndarray) -> EncodedClause:
+        literals = [-int(atom) for atom in BitsetResolution.atoms_of(neg)]
+        literals += [int(atom) for atom in BitsetResolution.atoms_of(pos)]
+        return tuple(sorted(literals))
+
+    def is_subsumed(self, pos: np.ndarray, neg: np.ndarray) -> bool:
+        rows = np.flatnonzero(self.kept[:self.size])
+        return bool((((self.pos[rows] & ~pos) == 0).all(axis=1) &
+                     ((self.neg[rows] & ~neg) == 0).all(axis=1)).any())
+
+    def grow(self) -> None:
+        extend = lambda array: np.concatenate([array, np.zeros_like(array)])
+        self.pos, self.neg = extend(self.pos), extend(self.neg)
+        self.kept, self.active = extend(self.kept), extend(self.active)
+        self.weights = extend(self.weights)
+
+    # Keep clause, removing kept clauses it subsumes (backward subsumption)
+    def add(self, pos: np.ndarray, neg: np.ndarray, clause: EncodedClause) -> int:
+        subsumed = (((pos & ~self.pos[:self.size]) == 0).all(axis=1) &
+                    ((neg & ~self.neg[:self.size]) == 0).all(axis=1))
+        self.kept[:self.size] &= ~subsumed
+        self.active[:self.size] &= ~subsumed
+        if self.size == len(self.kept):
+            self.grow()
+        row = self.size
+        self.size += 1
+        self.pos[row], self.neg[row] = pos, neg
+        self.kept[row] = True
+        self.weights[row] = len(clause)
+        self.clauses.append(clause)
+        return row
+
+    # Passive clause with the least number of literals, None if there are no passive clauses
+    def select(self) -> int | None:
+        passive = self.kept[:self.size] & ~self.active[:self.size]
+        if not passive.any():
+            return None
+        return int(np.argmin(np.where(passive, self.weights[:self.size], np.iinfo(np.int64).max)))
+
+    # Resolvents of given clause and active clauses (without duplicates) and their partners
+    def resolvents(self, given: int) -> (np.ndarray, np.ndarray, np.ndarray):
+        rows = np.flatnonzero(self.active[:self.size])
+        clash = (self.pos[given] & self.neg[rows]) | (self.neg[given] & self.pos[rows])
+        single = np.bitwise_count(clash).sum(axis=1) == 1
+        rows, clash = rows[single], clash[single]
+        pos = (self.pos[given] | self.pos[rows]) & ~clash
+        neg = (self.neg[given] | self.neg[rows]) & ~clash
+        _, unique = np.unique(np.hstack([pos, neg]), axis=0, return_index=True)
+        unique = np.sort(unique)
+        self.generated += len(rows)
+        return pos[unique], neg[unique], rows[unique]
+
+    # Returns True if nil is derived
+    def run(self) -> bool:
+        if self.has_nil:
+            return True
+        while (given := self.select()) is not None:
+            logger.info(f'Given clause: {self.store.decode(self.clauses[given])}')
+            self.active[given] = True
+            self.budget.step()
+            pos, neg, partners = self.resolvents(given)
+            if len(partners) == 0:
+                continue
+            # Resolvents subsumed by clauses kept before this round
+            rows = np.flatnonzero(self.kept[:self.size])
+            subsumed = (((self.pos[rows][None] & ~pos[:, None]) == 0).all(axis=2) &
+                        ((self.neg[rows][None] & ~neg[:, None]) == 0).all(axis=2)).any(axis=1)
+            added = False
+            for i in np.flatnonzero(~subsumed):
+                # Resolvents of this round can subsume each other
+                if added and self.is_subsumed(pos[i], neg[i]):
+                    continue
+                added = True
+                new_clause = self.decode(pos[i], neg[i])
+                self.add(pos[i], neg[i], new_clause)
+                self.budget.generated()
+                if self.record_steps:
+                    self.steps.append(self.proof.derive(
+                        new_clause, [self.clauses[given], self.clauses[partners[i]]]))
+                if len(new_clause) == 0:
+                    return True
+        return False
+
+    def clauses_left(self) -> list[EncodedClause]:
+        return [self.clauses[row] for row in np.flatnonzero(self.active[:self.size])]
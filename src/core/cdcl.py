@@ -0,0 +1,277 @@
+'''CDCL SAT solver for clause sets that unification can't change (see is_propositional).
+
+Conflict-driven clause learning: literals are decided (most active variable first, VSIDS), and
+their consequences are propagated with two watched literals per clause. Conflict is analyzed by
+resolving conflicting clause with reasons of its literals until only one literal of the current
+decision level is left (first UIP). Such clause is learned, and solver jumps back to the level
+where it becomes unit. Search is restarted after Luby sequence of conflicts; learned clauses and
+activities are kept. Nil is derived when conflict arises without decisions.'''
+from heapq import heapify, heappush, heappop
+from logging import getLogger
+
+from src.model.formula_representation import *
+from src.core.clause_store import ClauseStore, EncodedClause
+from src.core.resolution_info import ProofGraph
+from src.core.limits import current_budget
+
+logger = getLogger(__name__)
+
+
+# Check if only same atoms can be unified, i. e. clauses are propositional (see Unification.unify)
+def is_propositional(store: ClauseStore) -> bool:
+    types = set()
+    for atom in store.atoms[1:]:
+        stack = [atom]
+        while len(stack) > 0:
+            token = stack.pop()
+            types.add(type(token))
+            stack += token.children()
+    if SkolemovConstant in types or SkolemovFunction in types:
+        return False
+    return Variable not in types or Constant not in types
+
+
+# i-th element of Luby sequence (1, 1, 2, 1, 1, 2, 4, ...), i starts from 1
+def luby(i: int) -> int:
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if i == (1 << k) - 1:
+        return 1 << (k - 1)
+    return luby(i - (1 << (k - 1)) + 1)
+
+
+class CDCL:
+    '''Atoms of store are propositional variables. Resolutions done by conflict analysis are
+    saved as ResolutionSteps if record_steps is True'''
+
+    def __init__(self, store: ClauseStore, clauses: list[EncodedClause],
+                 record_steps: bool = True, restart_unit: int = 32, decay: float = 0.95):
+        self.store = store
+        self.record_steps = record_steps
+        self.restart_unit = restart_unit
+        self.decay = decay
+        self.proof = ProofGraph(store)
+        self.steps = []
+        self.conflicts = 0
+        self.decisions = 0
+        self.budget = current_budget()
+
+        variables = len(store.atoms)
+        # Atom id -> 1 (true), -1 (false) or 0 (unassigned)
+        self.values = [0] * variables
+        self.levels = [0] * variables
+        # Atom id -> index of clause that implied its value (None for decisions)
+        self.reasons = [None] * variables
+        # Saved phases: last value of variable is tried first
+        self.phases = [-1] * variables
+        self.activity = [0.0] * variables
+        self.var_inc = 1.0
+        self.heap = []
+        self.trail = []
+        # Indices of trail where decision levels start
+        self.trail_lim = []
+        self.propagated = 0
+
+        # Clauses are lists, their first two literals are watched
+        self.clauses = []
+        # Literal -> indices of clauses that watch it
+        self.watches = dict()
+        self.has_nil = False
+        self.conflict_at_start = None
+        for clause in dict.fromkeys(clauses):
+            if ClauseStore.is_tautology(clause):
+                continue
+            if len(clause) == 0:
+                self.has_nil = True
+                continue
+            self.add_clause(list(clause))
+        for var in {abs(lit) for clause in self.clauses for lit in clause}:
+            heappush(self.heap, (0.0, var))
+
+    def value(self, literal: int) -> int:
+        value = self.values[abs(literal)]
+        return value if literal > 0 else -value
+
+    def level(self) -> int:
+        return len(self.trail_lim)
+
+    def add_clause(self, clause: list[int]) -> int:
+        idx = len(self.clauses)
+        self.clauses.append(clause)
+        for lit in clause[:2]:
+            self.watches.setdefault(lit, []).append(idx)
+        if len(clause) == 1:
+            if self.value(clause[0]) == -1:
+                self.conflict_at_start = idx
+            elif self.value(clause[0]) == 0:
+                self.enqueue(clause[0], idx)
+        return idx
+
+    def enqueue(self, literal: int, reason: int | None) -> None:
+        var = abs(literal)
+        self.values[var] = 1 if literal > 0 else -1
+        self.levels[var] = self.level()
+        self.reasons[var] = reason
+        self.trail.append(literal)
+
+    # Returns index of conflicting clause or None
+    def propagate(self) -> int | None:
+        while self.propagated < len(self.trail):
+            false_lit = -self.trail[self.propagated]
+            self.propagated += 1
+            watching = self.watches.get(false_lit, [])
+            kept = []
+            for i in range(len(watching)):
+                idx = watching[i]
+                clause = self.clauses[idx]
+                if len(clause) == 1:
+                    kept.append(idx)
+                    kept += watching[i + 1:]
+                    self.watches[false_lit] = kept
+                    return idx
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self.value(clause[0]) == 1:
+                    kept.append(idx)
+                    continue
+                # Look for new literal to watch
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) != -1:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches.setdefault(clause[1], []).append(idx)
+                        break
+                else:
+                    kept.append(idx)
+                    if self.value(clause[0]) == -1:
+                        kept += watching[i + 1:]
+                        self.watches[false_lit] = kept
+                        return idx
+                    self.enqueue(clause[0], idx)
+            self.watches[false_lit] = kept
+        return None
+
+    def bump(self, var: int) -> None:
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.heap = [(-self.activity[v], v) for _, v in self.heap]
+            heapify(self.heap)
+        heappush(self.heap, (-self.activity[var], var))
+
+    def resolve(self, a: EncodedClause, b: list[int], literal: int) -> EncodedClause:
+        new_clause = ClauseStore.resolvent(a, tuple(sorted(set(b))), literal)
+        if self.record_steps:
+            self.steps.append(self.proof.derive(new_clause, [a, tuple(sorted(b))],
+                                                rule='conflict analysis'))
+        return new_clause
+
+    # First UIP clause (first literal is asserting one) and level to jump back to
+    def analyze(self, conflict: int) -> (list[int], int):
+        seen = set()
+        learned = []
+        # Literals of current level that are not resolved yet
+        counter = 0
+        clause = self.clauses[conflict]
+        resolvent = tuple(sorted(set(clause)))
+        literal = None
+        i = len(self.trail) - 1
+        while True:
+            for lit in clause if literal is None else clause[1:]:
+                var = abs(lit)
+                if var in seen:
+                    continue
+                seen.add(var)
+                self.bump(var)
+                if self.levels[var] == self.level():
+                    counter += 1
+                else:
+                    learned.append(lit)
+            while abs(self.trail[i]) not in seen:
+                i -= 1
+            literal = self.trail[i]
+            i -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.clauses[self.reasons[abs(literal)]]
+            resolvent = self.resolve(resolvent, clause, -literal)
+        learned = [-literal] + learned
+        back_level = 0
+        if len(learned) > 1:
+            # Second watched literal is the one that becomes false last
+            j = max(range(1, len(learned)), key=lambda j: self.levels[abs(learned[j])])
+            learned[1], learned[j] = learned[j], learned[1]
+            back_level = self.levels[abs(learned[1])]
+        self.var_inc /= self.decay
+        return learned, back_level
+
+    # Resolve conflicting clause with reasons of its literals (all of them are implied without
+    # decisions) until nil is derived
+    def refute(self, conflict: int) -> None:
+        resolvent = tuple(sorted(set(self.clauses[conflict])))
+        for literal in reversed(self.trail):
+            if -literal in resolvent:
+                resolvent = self.resolve(resolvent, self.clauses[self.reasons[abs(literal)]],
+                                         -literal)
+
+    def backjump(self, level: int) -> None:
+        if self.level() <= level:
+            return
+        for literal in self.trail[self.trail_lim[level]:]:
+            var = abs(literal)
+            self.phases[var] = self.values[var]
+            self.values[var] = 0
+            self.reasons[var] = None
+            heappush(self.heap, (-self.activity[var], var))
+        del self.trail[self.trail_lim[level]:]
+        del self.trail_lim[level:]
+        self.propagated = len(self.trail)
+
+    def decide(self) -> bool:
+        while len(self.heap) > 0:
+            _, var = heappop(self.heap)
+            if self.values[var] == 0:
+                self.decisions += 1
+                self.trail_lim.append(len(self.trail))
+                self.enqueue(var * self.phases[var], None)
+                return True
+        return False
+
+    # Returns True if clauses are unsatisfiable, i. e. nil is derived
+    def solve(self) -> bool:
+        if self.has_nil:
+            return True
+        if self.conflict_at_start is not None:
+            self.refute(self.conflict_at_start)
+            return True
+        restarts = 1
+        conflicts_left = self.restart_unit * luby(restarts)
+        while True:
+            self.budget.step()
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if self.level() == 0:
+                    self.refute(conflict)
+                    logger.info(f'Unsatisfiable: {self.conflicts} conflicts, ' +
+                                f'{self.decisions} decisions')
+                    return True
+                learned, back_level = self.analyze(conflict)
+                self.backjump(back_level)
+                idx = self.add_clause(learned)
+                self.budget.generated()
+                if len(learned) > 1:
+                    self.enqueue(learned[0], idx)
+                conflicts_left -= 1
+                continue
+            if conflicts_left <= 0:
+                restarts += 1
+                conflicts_left = self.restart_unit * luby(restarts)
+                self.backjump(0)
+                continue
+            if not self.decide():
+                logger.info(f'Satisfiable: {self.conflicts} conflicts, ' +
+                            f'{self.decisions} decisions')
+                return False
@@ -0,0 +1,94 @@
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count
+
+from src.model.formula_representation import *
+from src.core.clause_store import ClauseStore, EncodedClause
+
+
+# Weight of clause is number of its literals
+def literal_count(store: ClauseStore, clause: EncodedClause) -> int:
+    return len(clause)
+
+
+class SymbolCount:
+    '''Weight of clause is weighted number of symbols and variables in its literals'''
+
+    def __init__(self, symbol_weight: int = 2, variable_weight: int = 1):
+        self.symbol_weight = symbol_weight
+        self.variable_weight = variable_weight
+        self.atom_weights = dict()
+
+    def atom_weight(self, atom: Token) -> int:
+        weight = self.atom_weights.get(atom)
+        if weight is None:
+            weight = 0
+            stack = [atom]
+            while len(stack) > 0:
+                token = stack.pop()
+                weight += self.variable_weight if isinstance(token, Variable) else \
+                        self.symbol_weight
+                stack += token.children()
+            self.atom_weights[atom] = weight
+        return weight
+
+    def __call__(self, store: ClauseStore, clause: EncodedClause) -> int:
+        return sum(self.atom_weight(store.atom(lit)) for lit in clause)
+
+
+WEIGHT_FUNCTIONS = {
+    'symbols': SymbolCount,
+    'literals': lambda: literal_count,
+}
+
+
+class ClauseQueue:
+    '''Passive clauses of given-clause loop.
+
+    Clauses are picked by weight (lightest first), but after pick_ratio such picks the oldest
+    clause is picked, so that heavy clauses are not postponed forever (pick_ratio 0 means
+    weight only). Weight is computed once, when clause is pushed.'''
+
+    def __init__(self, store: ClauseStore, weight=None, pick_ratio: int = 5):
+        self.store = store
+        self.weight = SymbolCount() if weight is None else weight
+        self.pick_ratio = pick_ratio
+        # Heap of (weight, age, clause)
+        self.by_weight = []
+        # (age, clause)
+        self.by_age = deque()
+        # Clauses that are not picked or removed yet. Other entries of queues are skipped
+        self.ages = dict()
+        self.live = dict()
+        self.age_counter = count()
+        self.picks = 0
+
+    def push(self, clause: EncodedClause) -> None:
+        age = next(self.age_counter)
+        self.ages[clause] = age
+        self.live[age] = clause
+        heappush(self.by_weight, (self.weight(self.store, clause), age, clause))
+        self.by_age.append((age, clause))
+
+    def pop(self) -> EncodedClause:
+        self.picks += 1
+        if self.pick_ratio > 0 and self.picks % (self.pick_ratio + 1) == 0:
+            age, clause = self.by_age.popleft()
+            while age not in self.live:
+                age, clause = self.by_age.popleft()
+        else:
+            _, age, clause = heappop(self.by_weight)
+            while age not in self.live:
+                _, age, clause = heappop(self.by_weight)
+        del self.live[age]
+        del self.ages[clause]
+        return clause
+
+    def remove(self, clause: EncodedClause) -> None:
+        del self.live[self.ages.pop(clause)]
+
+    def __contains__(self, clause: EncodedClause) -> bool:
+        return clause in self.ages
+
+    def __len__(self):
+        return len(self.live)
@@ -0,0 +1,105 @@
+'''Integer encoding of clauses used by the resolution core.
+
+Every distinct atom gets a positive number, literal is +number or -number (for negated atom),
+and clause is a sorted tuple of distinct literals. Empty tuple is nil.
+Trees are rebuilt only for output (see decode).'''
+from src.model.formula_representation import *
+from src.core.limits import current_budget
+
+EncodedClause = tuple[int, ...]
+
+# Symbol of atoms that can be replaced with something else by unifier entirely
+ANY_SYMBOL = 0
+
+
+class ClauseStore:
+
+    def __init__(self):
+        # 0 is not used, because it cannot be negated
+        self.atoms = [None]
+        self.atom_ids = dict()
+        self.atom_symbols = [ANY_SYMBOL]
+        self.symbol_ids = dict()
+        self.budget = current_budget()
+
+    def symbol_id(self, atom: Token) -> int:
+        # See Unification.can_substitute
+        if isinstance(atom, Variable | SkolemovConstant | SkolemovFunction):
+            return ANY_SYMBOL
+        key = (type(atom), atom.stem_key())
+        id_ = self.symbol_ids.get(key)
+        if id_ is None:
+            id_ = len(self.symbol_ids) + 1
+            self.symbol_ids[key] = id_
+        return id_
+
+    def atom_id(self, atom: Token) -> int:
+        id_ = self.atom_ids.get(atom)
+        if id_ is None:
+            self.budget.check_term(atom)
+            id_ = len(self.atoms)
+            self.atoms.append(atom)
+            self.atom_ids[atom] = id_
+            self.atom_symbols.append(self.symbol_id(atom))
+        return id_
+
+    def literal(self, literal: Token) -> int:
+        if isinstance(literal, Not):
+            return -self.atom_id(literal.children()[0])
+        return self.atom_id(literal)
+
+    def encode(self, clause: Clause) -> EncodedClause:
+        literals = clause.children() if isinstance(clause, Or) else [clause]
+        # False is an empty disjunction
+        return tuple(sorted({self.literal(lit) for lit in literals if lit != CONSTANT_FALSE}))
+
+    def encode_all(self, clauses: list[Clause]) -> list[EncodedClause]:
+        return list(dict.fromkeys(map(self.encode, clauses)))
+
+    def atom(self, literal: int) -> Token:
+        return self.atoms[abs(literal)]
+
+    def decode_literal(self, literal: int) -> Token:
+        if literal < 0:
+            return Not([self.atoms[-literal]])
+        return self.atoms[literal]
+
+    def decode(self, clause: EncodedClause) -> Clause | None:
+        if len(clause) == 0:
+            return None
+        if len(clause) == 1:
+            return self.decode_literal(clause[0])
+        return Or(list(map(self.decode_literal, clause)))
+
+    def decode_all(self, clauses: list[EncodedClause]) -> list[Clause | None]:
+        return list(map(self.decode, clauses))
+
+    # Check if literals can be complementary after unification
+    def may_resolve(self, a: int, b: int) -> bool:
+        if (a > 0) == (b > 0):
+            return False
+        a_sym = self.atom_symbols[abs(a)]
+        b_sym = self.atom_symbols[abs(b)]
+        return a_sym == b_sym or a_sym == ANY_SYMBOL or b_sym == ANY_SYMBOL
+
+    def apply_literal(self, literal: int, subst) -> int:
+        atom = subst.apply(self.atom(literal))
+        return self.atom_id(atom) if literal > 0 else -self.atom_id(atom)
+
+    # Substitution is applied to each literal once, and repeated literals are merged
+    def apply(self, clause: EncodedClause, subst) -> EncodedClause:
+        if len(subst) == 0:
+            return clause
+        return tuple(sorted({self.apply_literal(lit, subst) for lit in clause}))
+
+    @staticmethod
+    def is_tautology(clause: EncodedClause) -> bool:
+        literals = set(clause)
+        return any(-lit in literals for lit in clause if lit < 0)
+
+    # Resolve a (containing literal) and b (containing -literal)
+    @staticmethod
+    def resolvent(a: EncodedClause, b: EncodedClause, literal: int) -> EncodedClause:
+        literals = {lit for lit in a if lit != literal}
+        literals.update(lit for lit in b if lit != -literal)
+        return tuple(sorted(literals))
@@ -0,0 +1,281 @@
+'''Clausification without separate passes over formula.
+
+Definitional (Plaisted-Greenbaum) clausification: distributing disjunction over conjunction can make
+CNF exponentially larger than formula. Instead, conjunctive subformula G of a disjunction is replaced
+with a fresh predicate d(x1, ..., xn) over its variables, and definition d -> G is added. Formula is
+in negation normal form here, so G occurs only positively and the other direction (G -> d) is not
+needed. Subformulas are named only when distribution would give more clauses than naming.
+
+Fused clausification does transformations 1-8 of Resolution.transofrm in one traversal.'''
+from itertools import count
+from math import prod
+
+from src.model.formula_representation import *
+from src.core.transformations import remove_logical_ops, narrow_negation, to_cnf, \
+        remove_redundancy
+from src.util import recursive_instances, recursive_filter, transform_children, \
+        transform_top_down, has_free_variable, SKIP_CHILDREN
+from src.core.limits import current_budget
+
+
+class DefinitionalClausifier:
+    '''Use one clausifier for all parts of formula, so that definitions are shared'''
+    name_subformulas = True
+
+    def __init__(self):
+        # Subformula -> its clauses (each is a tuple of literals)
+        self.clauses = dict()
+        # Subformula (or its clauses) -> atom that names it
+        self.names = dict()
+        self.name_counter = count()
+        # Definitions that are not returned by to_cnf yet
+        self.new_definitions = []
+
+    # Digits cannot appear in parsed names, so definitions never clash with custom predicates
+    def name(self, key, clauses: list[tuple]) -> Token:
+        name = self.names.get(key)
+        if name is None:
+            variables = {var for clause in clauses for lit in clause
+                         for var in recursive_instances(lit, Variable)}
+            name = CustomFunctionOrPredicate(f'def{next(self.name_counter)}',
+                                             sorted(variables, key=Variable.get_name))
+            self.names[key] = name
+            self.new_definitions += [(Not([name]), ) + clause for clause in clauses]
+        return name
+
+    # Clauses of disjunction of children (keys identify children for naming)
+    def disjunction(self, keys: list, ch_clauses: list[list[tuple]]) -> list[tuple]:
+        if self.name_subformulas and prod(map(len, ch_clauses)) > sum(map(len, ch_clauses)):
+            ch_clauses = [[(self.name(key, clauses), )] if len(clauses) > 1 else clauses
+                          for key, clauses in zip(keys, ch_clauses)]
+        # Clauses are kept as lists of parts and joined at the end, so that children with one
+        # clause are added in place and long disjunctions are not copied on each child
+        budget = current_budget()
+        result = [[]]
+        for clauses in ch_clauses:
+            if len(clauses) == 1:
+                for parts in result:
+                    parts.append(clauses[0])
+            else:
+                # Checked before clauses are built, so that limits stop exponential growth
+                budget.generated(len(result) * max(len(clauses) - 1, 0))
+                new_result = []
+                for parts in result:
+                    budget.check()
+                    new_result += [parts + [ch_clause] for ch_clause in clauses]
+                result = new_result
+        clauses = []
+        for parts in result:
+            budget.check()
+            clauses.append(tuple(lit for part in parts for lit in part))
+        return clauses
+
+    # Operands of formula and of its nested operations of the same type
+    @staticmethod
+    def operands(formula: Token) -> list[Token]:
+        return recursive_filter(formula, lambda f: not isinstance(f, type(formula)))
+
+    # Children are brought to clauses before their parents (explicit stack)
+    def clauses_of(self, formula: Token) -> list[tuple]:
+        stack = [formula]
+        while len(stack) > 0:
+            current = stack[-1]
+            if current in self.clauses:
+                stack.pop()
+                continue
+            if not isinstance(current, And | Or):
+                stack.pop()
+                self.clauses[current] = [(current, )]
+                continue
+            operands = DefinitionalClausifier.operands(current)
+            pending = [op for op in operands if op not in self.clauses]
+            if len(pending) > 0:
+                stack += reversed(pending)
+                continue
+            stack.pop()
+            if isinstance(current, And):
+                self.clauses[current] = [clause for op in operands for clause in self.clauses[op]]
+            else:
+                self.clauses[current] = self.disjunction(operands,
+                                                         [self.clauses[op] for op in operands])
+        return self.clauses[formula]
+
+    def join_clauses(self, clauses: list[tuple]) -> Token:
+        clauses = list(dict.fromkeys(clauses + self.new_definitions))
+        self.new_definitions = []
+        clauses = [clause[0] if len(clause) == 1 else Or(list(clause)) for clause in clauses]
+        return clauses[0] if len(clauses) == 1 else And(clauses)
+
+    # Formula should be in negation normal form and shouldn't contain quantifiers
+    def to_cnf(self, formula: Token) -> Token:
+        return self.join_clauses(self.clauses_of(formula))
+
+
+# Bring arguments of predicates to the same form as transformations do
+def normalize_term(term: Token) -> Token:
+    if isinstance(term, Atom):
+        return term
+    return remove_redundancy(to_cnf(narrow_negation(remove_logical_ops(term))))
+
+
+# Replace variables with terms (inserted terms are not substituted again)
+def substitute(term: Token, env: dict) -> Token:
+
+    def replace(term: Token, _) -> (Token, object):
+        replacement = env.get(term)
+        return (term, None) if replacement is None else (replacement, SKIP_CHILDREN)
+
+    return transform_top_down(term, replace)
+
+
+# Equivalent formula with And or Or on the top, if there is one
+def expose_connective(formula: Token) -> Token:
+    while not isinstance(formula, And | Or):
+        if isinstance(formula, Not):
+            inner = formula.children()[0]
+            if isinstance(inner, LogicalOp) and not isinstance(inner, And | Or | Not):
+                formula = Not([inner.remove()])
+                continue
+            narrowed = formula.narrow()
+            if narrowed is formula or isinstance(narrowed, Quantifier):
+                return formula
+            formula = narrowed
+        elif isinstance(formula, LogicalOp):
+            formula = formula.remove()
+        else:
+            return formula
+    return formula
+
+
+class FusedClausifier(DefinitionalClausifier):
+    '''Formula is traversed once, tracking polarity of subformulas: logical operations are
+    eliminated and negation is narrowed on the way down. Bound variables are renamed (universal)
+    or replaced with Skolemov terms (existential) using environment, and clauses are built on the
+    way up. Conjunctive subformulas are named if name_subformulas is True'''
+
+    def __init__(self, name_subformulas: bool = False):
+        super().__init__()
+        self.name_subformulas = name_subformulas
+        # See standartize_var_names
+        self.known_names = set()
+
+    def bind_universal(self, var: Variable) -> Variable:
+        name = var.get_name()
+        while name in self.known_names:
+            name = Variable.new_name()
+        self.known_names.add(name)
+        return var if name == var.get_name() else Variable(name)
+
+    def literal_clauses(self, atom: Token, positive: bool, env: dict) -> list[tuple]:
+        if isinstance(atom, Atom):
+            atom = substitute(atom, env)
+        else:
+            atom = transform_children(atom, lambda arg: normalize_term(substitute(arg, env)))
+        atom = atom.remove_redundancy()
+        self.known_names.update(var.get_name() for var in recursive_instances(atom, Variable))
+        if isinstance(atom, Constant) and atom in (CONSTANT_TRUE, CONSTANT_FALSE):
+            # True clause is dropped, False literal is dropped from clause
+            return [] if (atom == CONSTANT_TRUE) == positive else [()]
+        return [(atom if positive else Not([atom]), )]
+
+    # One step of traversal: clauses of formula in given polarity (list), or whether clauses of
+    # its subformulas are conjoined and the subformulas (with their polarity and environment).
+    # env: bound variable -> its replacement, universal: variables for Skolemov functions
+    def expand(self, formula: Token, positive: bool, env: dict,
+               universal: tuple) -> list[tuple] | tuple[bool, list]:
+        while True:
+            if isinstance(formula, Not):
+                formula, positive = formula.children()[0], not positive
+                continue
+            if isinstance(formula, And | Or):
+                return (isinstance(formula, And) == positive,
+                        [(ch, positive, env, universal) for ch in formula.children()])
+            if isinstance(formula, LogicalOp):
+                formula = formula.remove()
+                continue
+            if not isinstance(formula, Quantifier):
+                return self.literal_clauses(formula, positive, env)
+            var = formula.get_var()
+            body = expose_connective(formula.get_body())
+            # Miniscoping of existential quantifier (see push_quantifier): it distributes over
+            # disjunction, and conjuncts that don't depend on its variable are moved out of it
+            if isinstance(formula, Forall) != positive and isinstance(body, And | Or):
+                children = body.children()
+                if isinstance(body, Or) == positive:
+                    formula = type(body)([type(formula)(var, ch) for ch in children])
+                    continue
+                dependent = [ch for ch in children if has_free_variable(ch, var)]
+                if 0 < len(dependent) < len(children):
+                    inner = dependent[0] if len(dependent) == 1 else type(body)(dependent)
+                    formula = type(body)([ch for ch in children if ch not in dependent] +
+                                         [type(formula)(var, inner)])
+                    continue
+            if not has_free_variable(body, var):
+                formula = body
+                continue
+            if isinstance(formula, Forall) == positive:
+                new_var = self.bind_universal(var)
+                formula, env = formula.get_body(), {**env, var: new_var}
+                universal = universal + (new_var, )
+                continue
+            # Skolemov term depends only on variables that occur in the body
+            used = {u for v in recursive_instances(formula.get_body(), Variable)
+                    for u in recursive_instances(env.get(v, v), Variable)}
+            args = [u for u in universal if u in used]
+            sk_term = SkolemovConstant() if len(args) == 0 else SkolemovFunction(args)
+            formula, env = formula.get_body(), {**env, var: sk_term}
+
+    def combine(self, conjunction: bool, ch_clauses: list[list[tuple]]) -> list[tuple]:
+        if conjunction:
+            return [clause for clauses in ch_clauses for clause in clauses]
+        return self.disjunction([tuple(clauses) for clauses in ch_clauses], ch_clauses)
+
+    # Subformulas are expanded with explicit stack. Subformulas with the same connective as their
+    # parent (after polarity is taken into account) are merged into it
+    def clauses_of(self, formula: Token, positive: bool = True, env: dict | None = None,
+                   universal: tuple = ()) -> list[tuple]:
+        root = self.expand(formula, positive, dict() if env is None else env, universal)
+        if isinstance(root, list):
+            return root
+        # Frames: whether clauses are conjoined, subformulas left (last one is the next),
+        # clauses of expanded subformulas
+        stack = [(root[0], root[1][::-1], [])]
+        budget = current_budget()
+        while True:
+            conjunction, tasks, ch_clauses = stack[-1]
+            if len(tasks) > 0:
+                budget.check()
+                expanded = self.expand(*tasks.pop())
+                if isinstance(expanded, list):
+                    ch_clauses.append(expanded)
+                elif expanded[0] == conjunction:
+                    tasks += expanded[1][::-1]
+                else:
+                    stack.append((expanded[0], expanded[1][::-1], []))
+                continue
+            stack.pop()
+            clauses = self.combine(conjunction, ch_clauses)
+            if len(stack) == 0:
+                return clauses
+            stack[-1][2].append(clauses)
+
+    @staticmethod
+    def is_tautology(clause: tuple) -> bool:
+        literals = set(clause)
+        return any(Not([lit]) in literals for lit in clause if not isinstance(lit, Not))
+
+    # Clauses of formula (or of its negation if positive is False)
+    def to_cnf(self, formula: Token, positive: bool = True) -> Token:
+        self.known_names = set()
+        budget = current_budget()
+        clauses = []
+        for clause in self.clauses_of(formula, positive):
+            budget.check()
+            clause = tuple(dict.fromkeys(clause))
+            if not FusedClausifier.is_tautology(clause):
+                clauses.append(clause)
+        if len(clauses) == 0:
+            return CONSTANT_TRUE
+        if () in clauses:
+            return CONSTANT_FALSE
+        return self.join_clauses(clauses)
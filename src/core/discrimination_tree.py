@@ -0,0 +1,124 @@
+'''Imperfect discrimination tree: index of clauses by their literals.
+
+Atom is flattened to a sequence of keys (preorder). Subterms that unification can replace
+entirely (Skolemov functions) become STAR, and so do children of n-ary operations, which are
+unified as sets (see Unification.unify).
+Retrieval over-approximates: partners still should be checked by Unification.resolvents.'''
+from src.model.formula_representation import *
+from src.core.clause_store import ClauseStore, EncodedClause
+
+STAR = None
+
+# Atoms that can be unified with atoms of other types (see Unification.unify)
+UNIFIABLE_ATOM_TYPES = {
+    Variable: (Constant, SkolemovConstant),
+    Constant: (Variable, SkolemovConstant),
+    SkolemovConstant: (Variable, Constant),
+}
+
+
+class Node:
+    __slots__ = ('children', 'clauses')
+
+    def __init__(self):
+        # type (or STAR) -> stem and arity -> Node
+        self.children = dict()
+        self.clauses = set()
+
+
+# Key of term: (type, (stem, arity)), where arity is number of children in the key sequence
+def term_key(term: Token):
+    if isinstance(term, SkolemovFunction):
+        return STAR, None
+    if isinstance(term, NaryLogicalOp):
+        return type(term), (None, 0)
+    return type(term), (term.stem_key(), len(term.children()))
+
+
+def flatten(atom: Token) -> list:
+    keys = []
+    stack = [atom]
+    while len(stack) > 0:
+        term = stack.pop()
+        key = term_key(term)
+        keys.append(key)
+        if key[0] is not STAR and key[1][1] > 0:
+            stack += reversed(term.children())
+    return keys
+
+
+class DiscriminationTree:
+    '''Active clauses indexed by their literals, separately for each polarity'''
+
+    def __init__(self):
+        self.roots = {True: Node(), False: Node()}
+
+    def insert(self, store: ClauseStore, clause: EncodedClause) -> None:
+        for literal in clause:
+            node = self.roots[literal > 0]
+            for type_, rest in flatten(store.atom(literal)):
+                node = node.children.setdefault(type_, dict()).setdefault(rest, Node())
+            node.clauses.add(clause)
+
+    def remove(self, store: ClauseStore, clause: EncodedClause) -> None:
+        for literal in clause:
+            path = [(None, None, self.roots[literal > 0])]
+            for type_, rest in flatten(store.atom(literal)):
+                path.append((type_, rest, path[-1][2].children[type_][rest]))
+            path[-1][2].clauses.discard(clause)
+            # Remove empty branches
+            for i in reversed(range(1, len(path))):
+                type_, rest, node = path[i]
+                if len(node.clauses) > 0 or len(node.children) > 0:
+                    break
+                parent = path[i - 1][2]
+                del parent.children[type_][rest]
+                if len(parent.children[type_]) == 0:
+                    del parent.children[type_]
+
+    # Nodes that are reached from node by skipping one term of the index
+    @staticmethod
+    def skip_term(node: Node):
+        stack = [(node, 1)]
+        while len(stack) > 0:
+            node, to_skip = stack.pop()
+            if to_skip == 0:
+                yield node
+                continue
+            for type_, children in node.children.items():
+                for rest, child in children.items():
+                    arity = 0 if type_ is STAR else rest[1]
+                    stack.append((child, to_skip - 1 + arity))
+
+    # Indexed clauses that have literal that may be unified with atom and has given polarity
+    def retrieve(self, atom: Token, positive: bool) -> set[EncodedClause]:
+        result = set()
+        # Node and terms of query that are not matched yet
+        stack = [(self.roots[positive], (atom, ))]
+        while len(stack) > 0:
+            node, terms = stack.pop()
+            if len(terms) == 0:
+                result |= node.clauses
+                continue
+            term, rest = terms[0], terms[1:]
+            type_, key_rest = term_key(term)
+            # Skolemov function matches any term
+            if type_ is STAR:
+                stack += [(child, rest) for child in DiscriminationTree.skip_term(node)]
+                continue
+            if STAR in node.children:
+                stack.append((node.children[STAR][None], rest))
+            children = node.children.get(type_, dict())
+            if key_rest in children:
+                stack.append((children[key_rest], tuple(term.children()) + rest
+                              if key_rest[1] > 0 else rest))
+            for other_type in UNIFIABLE_ATOM_TYPES.get(type_, ()):
+                stack += [(child, rest) for child in node.children.get(other_type, dict()).values()]
+        return result
+
+    # Clauses that may be resolved with clause
+    def partners(self, store: ClauseStore, clause: EncodedClause) -> set[EncodedClause]:
+        result = set()
+        for literal in clause:
+            result |= self.retrieve(store.atom(literal), literal < 0)
+        return result
@@ -0,0 +1,205 @@
+'''Engines for Horn clauses (clauses with at most one positive literal).
+
+Propositional clauses are checked by Dowling-Gallier forward chaining: each clause counts its
+negative literals whose atoms are not derived yet, and when counter becomes zero, the positive
+literal is derived (or nil, if there is no one). Each clause is visited once per its literal,
+so time is linear. Steps aren't made while chaining: after nil is derived, each clause that it
+depends on is hyper-resolved with unit clauses of its negative literals (if steps are recorded).
+
+First-order clauses are saturated with unit-resulting resolution: all negative literals of a
+clause are resolved with derived positive unit clauses at once. Result is either a positive unit
+clause or nil, so only unit clauses are ever kept.'''
+from collections import deque
+from logging import getLogger
+
+from src.core.clause_store import ClauseStore, EncodedClause, ANY_SYMBOL
+from src.core.resolution_info import ProofGraph
+from src.core.subsumption import subsumes
+from src.core.unification import Unification
+from src.core.limits import current_budget
+
+logger = getLogger(__name__)
+
+
+def is_horn(clauses: list[EncodedClause]) -> bool:
+    return all(sum(1 for lit in clause if lit > 0) <= 1 for clause in clauses)
+
+
+def head(clause: EncodedClause) -> int | None:
+    return clause[-1] if len(clause) > 0 and clause[-1] > 0 else None
+
+
+class HornSAT:
+    '''Dowling-Gallier forward chaining, atoms of store are propositional variables'''
+
+    def __init__(self, store: ClauseStore, clauses: list[EncodedClause],
+                 record_steps: bool = True):
+        self.store = store
+        self.clauses = list(dict.fromkeys(clauses))
+        self.record_steps = record_steps
+        self.proof = ProofGraph(store)
+        self.steps = []
+        self.budget = current_budget()
+
+    # Resolve clause with unit clauses of all its negative literals at once, saving the step.
+    # One step instead of a chain of binary ones, so that its size is linear in the clause
+    def fire(self, clause: EncodedClause) -> EncodedClause:
+        new_head = head(clause)
+        new_clause = () if new_head is None else (new_head, )
+        units = [(-lit, ) for lit in clause if lit < 0]
+        self.steps.append(self.proof.derive(new_clause, [clause] + units, rule='hyper-resolution'))
+        return new_clause
+
+    # Fire clauses that nil (derived by conflict clause) depends on, in order they were fired.
+    # reasons maps derived atom to index of clause that derived it, in order of derivation
+    def record_refutation(self, conflict: int, reasons: dict) -> None:
+        used = {conflict}
+        stack = [conflict]
+        while len(stack) > 0:
+            for lit in self.clauses[stack.pop()]:
+                if lit < 0 and reasons[-lit] not in used:
+                    used.add(reasons[-lit])
+                    stack.append(reasons[-lit])
+        for idx in reasons.values():
+            # Clauses without negative literals are input facts
+            if idx in used and self.clauses[idx][0] < 0:
+                self.fire(self.clauses[idx])
+        self.fire(self.clauses[conflict])
+
+    # Returns True if nil is derived
+    def solve(self) -> bool:
+        # Clause index -> number of its negative literals that are not derived yet
+        counters = []
+        # Atom -> indices of clauses that contain its negation
+        occurences = dict()
+        # Derived atom -> index of clause that derived it
+        reasons = dict()
+        queue = deque()
+        for idx, clause in enumerate(self.clauses):
+            negative = [lit for lit in clause if lit < 0]
+            counters.append(len(negative))
+            for lit in negative:
+                occurences.setdefault(-lit, []).append(idx)
+            if len(negative) == 0:
+                if len(clause) == 0:
+                    return True
+                if clause[0] not in reasons:
+                    reasons[clause[0]] = idx
+                    queue.append(clause[0])
+        while len(queue) > 0:
+            atom = queue.popleft()
+            self.budget.step()
+            for idx in occurences.get(atom, []):
+                counters[idx] -= 1
+                if counters[idx] > 0:
+                    continue
+                new_head = head(self.clauses[idx])
+                if new_head in reasons:
+                    continue
+                self.budget.generated()
+                if new_head is None:
+                    if self.record_steps:
+                        self.record_refutation(idx, reasons)
+                    return True
+                reasons[new_head] = idx
+                queue.append(new_head)
+        return False
+
+
+class UnitResultingResolution:
+    '''Given-clause loop over positive unit clauses ("facts"). Other clauses are nuclei: given fact
+    is resolved with one of their negative literals, and the rest of them are resolved with
+    processed facts, backtracking over choices. Each resolution has its own unifier, as in
+    Saturation'''
+
+    def __init__(self, store: ClauseStore, clauses: list[EncodedClause],
+                 record_steps: bool = True):
+        self.store = store
+        self.record_steps = record_steps
+        self.proof = ProofGraph(store)
+        self.steps = []
+        self.budget = current_budget()
+        self.clauses = list(dict.fromkeys(clauses))
+        self.known = set(self.clauses)
+        # Symbol -> nuclei and their negative literals with this symbol
+        self.nuclei = dict()
+        for clause in self.clauses:
+            if len(clause) == 1 and clause[0] > 0:
+                continue
+            for lit in clause:
+                if lit < 0:
+                    self.nuclei.setdefault(store.atom_symbols[-lit], []).append((clause, lit))
+        # Symbol -> processed facts
+        self.facts = dict()
+        self.queue = deque(clause for clause in self.clauses
+                           if len(clause) == 1 and clause[0] > 0)
+
+    def symbol(self, literal: int) -> int:
+        return self.store.atom_symbols[abs(literal)]
+
+    # Items of index that may be unified with literal of given symbol
+    @staticmethod
+    def candidates(index: dict, symbol: int) -> list:
+        if symbol == ANY_SYMBOL:
+            return [item for items in index.values() for item in items]
+        return index.get(symbol, []) + index.get(ANY_SYMBOL, [])
+
+    # Resolve negative literal of clause with fact, None if they can't be resolved.
+    # Returns resolvent and its derivation (parents and unifiers)
+    def resolve(self, clause: EncodedClause, literal: int,
+                fact: EncodedClause) -> tuple[EncodedClause, tuple] | None:
+        subst = Unification.unify_either(self.store.atom(literal), self.store.atom(fact[0]))
+        if subst is None:
+            return None
+        new_literal = self.store.apply_literal(literal, subst)
+        # Unification of n-ary operations doesn't always give equal atoms
+        if self.store.apply_literal(fact[0], subst) != -new_literal:
+            return None
+        new_clause = ClauseStore.resolvent(self.store.apply(clause, subst),
+                                           self.store.apply(fact, subst), new_literal)
+        return new_clause, ([clause, fact], subst.unifiers())
+
+    # Resolve all negative literals of clause with processed facts.
+    # Yields results (positive unit clauses or nil) and derivations of resolvents that lead to them
+    def complete(self, clause: EncodedClause, derivations: list[tuple]):
+        if len(clause) == 0 or clause[0] > 0:
+            yield clause, derivations
+            return
+        for fact in UnitResultingResolution.candidates(self.facts, self.symbol(clause[0])):
+            resolved = self.resolve(clause, clause[0], fact)
+            if resolved is not None:
+                yield from self.complete(resolved[0], derivations + [resolved])
+
+    # Returns True if nil is derived
+    def solve(self) -> bool:
+        if () in self.known:
+            return True
+        while len(self.queue) > 0:
+            given = self.queue.popleft()
+            self.budget.step()
+            symbol = self.symbol(given[0])
+            if any(subsumes(self.store, fact, given)
+                   for fact in UnitResultingResolution.candidates(self.facts, symbol)):
+                continue
+            self.facts.setdefault(symbol, []).append(given)
+            logger.info(f'Given fact: {self.store.decode(given)}')
+            for nucleus, lit in UnitResultingResolution.candidates(self.nuclei, symbol):
+                resolved = self.resolve(nucleus, lit, given)
+                if resolved is None:
+                    continue
+                for new_clause, derivations in self.complete(resolved[0], [resolved]):
+                    if new_clause in self.known:
+                        continue
+                    self.known.add(new_clause)
+                    self.budget.generated()
+                    if self.record_steps:
+                        self.steps += [
+                            self.proof.derive(resolvent, parents, unifiers,
+                                              'unit-resulting resolution')
+                            for resolvent, (parents, unifiers) in derivations]
+                    logger.info(f'\t{self.store.decode(nucleus)} gives ' +
+                                f'{self.store.decode(new_clause)}')
+                    if len(new_clause) == 0:
+                        return True
+                    self.queue.append(new_clause)
+        return False
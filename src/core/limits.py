@@ -0,0 +1,129 @@
+'''Resource limits of a proof.
+
+Engines count steps of their main loops and generated clauses in Budget of the current proof (it's
+kept in a context variable, see ProofContext), clausification counts clauses generated by
+distribution, and ClauseStore checks depth of new atoms. Time and memory are checked on the way.
+When some limit is exceeded, ResourceOut is raised and proof ends with status 'resource_out'.
+
+Outside of proofs the default Budget without limits is used.'''
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sys import platform
+from time import monotonic
+
+from src.model.abstract.token import Token
+
+# Seconds, number of generated clauses, number of steps of main loop, depth of atoms and
+# resident memory of process in megabytes; None means no limit
+Limits = namedtuple('Limits', ['time', 'clauses', 'steps', 'term_depth', 'memory'],
+                    defaults=[None] * 5)
+
+# Memory is checked at most once in this many seconds, because reading it is slower than other
+# checks
+MEMORY_CHECK_INTERVAL = 0.01
+
+
+class ResourceOut(Exception):
+
+    def __init__(self, resource: str, limit):
+        super().__init__(f'{resource} limit ({limit}) exceeded')
+        self.resource = resource
+        self.limit = limit
+
+
+try:
+    from os import sysconf
+    PAGE_SIZE = sysconf('SC_PAGE_SIZE')
+except (ImportError, ValueError):
+    PAGE_SIZE = 4096
+
+
+# Resident memory of process in megabytes (peak one if current one is unknown, 0 if neither is)
+def memory_used() -> float:
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE / 2**20
+    except OSError:
+        pass
+    try:
+        from resource import getrusage, RUSAGE_SELF
+    except ImportError:
+        return 0
+    # Kilobytes on Linux, bytes on macOS
+    peak = getrusage(RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if platform == 'darwin' else peak / 2**10
+
+
+# Nesting depth of the whole tree of term: unlike term_depth of subsumption (feature of clause
+# that stops at atoms and Skolemov functions), children of every node are counted. This is the
+# depth that Limits.term_depth restricts
+def tree_depth(term: Token) -> int:
+    result = 0
+    stack = [(term, 1)]
+    while len(stack) > 0:
+        term, depth = stack.pop()
+        result = max(result, depth)
+        stack += [(ch, depth + 1) for ch in term.children()]
+    return result
+
+
+class Budget:
+    '''Resources used by one proof'''
+
+    def __init__(self, limits: Limits = Limits()):
+        self.limits = limits
+        self.start = monotonic()
+        self.deadline = None if limits.time is None else self.start + limits.time
+        self.steps = 0
+        self.clauses = 0
+        self.next_memory_check = self.start
+
+    def elapsed(self) -> float:
+        return monotonic() - self.start
+
+    # Time and memory
+    def check(self) -> None:
+        if self.deadline is None and self.limits.memory is None:
+            return
+        now = monotonic()
+        if self.deadline is not None and now > self.deadline:
+            raise ResourceOut('time', self.limits.time)
+        if self.limits.memory is not None and now >= self.next_memory_check:
+            self.next_memory_check = now + MEMORY_CHECK_INTERVAL
+            if memory_used() > self.limits.memory:
+                raise ResourceOut('memory', self.limits.memory)
+
+    # Step of main loop of engine
+    def step(self) -> None:
+        self.steps += 1
+        if self.limits.steps is not None and self.steps > self.limits.steps:
+            raise ResourceOut('steps', self.limits.steps)
+        self.check()
+
+    def generated(self, clauses: int = 1) -> None:
+        self.clauses += clauses
+        if self.limits.clauses is not None and self.clauses > self.limits.clauses:
+            raise ResourceOut('clauses', self.limits.clauses)
+        self.check()
+
+    def check_term(self, term: Token) -> None:
+        if self.limits.term_depth is not None and tree_depth(term) > self.limits.term_depth:
+            raise ResourceOut('term depth', self.limits.term_depth)
+
+
+_current = ContextVar('budget', default=Budget())
+
+
+def current_budget() -> Budget:
+    return _current.get()
+
+
+# Resources are counted in given budget inside of with-block
+@contextmanager
+def use_budget(budget: Budget):
+    token = _current.set(budget)
+    try:
+        yield budget
+    finally:
+        _current.reset(token)
@@ -0,0 +1,29 @@
+'''State of one proof.
+
+Everything that a proof accumulates (counters of fresh names, used resources and trace of
+transformations and resolution steps) belongs to its ProofContext, so that proofs don't share
+state: memory of a process that proves many formulas doesn't grow, and proofs can run in different
+threads.'''
+from contextlib import contextmanager
+
+from src.model.fresh_names import FreshNames, use_names
+from src.core.limits import Limits, Budget, use_budget
+
+
+class ProofContext:
+
+    def __init__(self, limits: Limits = Limits()):
+        self.names = FreshNames()
+        self.limits = limits
+        self.budget = Budget(limits)
+        self.transformations_info = []
+        self.branches_info = []
+        self.resolution_steps = []
+
+    # Fresh names are generated by this context and resources are counted from the beginning of
+    # with-block
+    @contextmanager
+    def active(self):
+        self.budget = Budget(self.limits)
+        with use_names(self.names), use_budget(self.budget):
+            yield self
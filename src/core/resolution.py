@@ -3,18 +3,32 @@ from logging import getLogger
 from src.model.formula_representation import *
 from src.core.transformations import *
 from src.util import recursively_transform_children, recursive_search, recursive_instances
+from src.core.clause_store import ClauseStore, EncodedClause
 from src.core.resolution_info import BranchInfo, TransformationInfo, ResolutionStep
-from src.core.unification import Unification, short_first
+from src.core.unification import short_first
+from src.core.clause_selection import ClauseQueue, SymbolCount, WEIGHT_FUNCTIONS
+from src.core.saturation import Saturation
+from src.core.cdcl import CDCL, is_propositional
+from src.core.horn import HornSAT, UnitResultingResolution, is_horn
+from src.core.twosat import TwoSAT, is_binary
+from src.core.clausification import DefinitionalClausifier, FusedClausifier
+from src.core.variants import remove_variants
+from src.core.proof_context import ProofContext
+from src.core.limits import Limits, Budget, ResourceOut
 
 logger = getLogger(__name__)
 
+CLAUSIFIERS = ['distribution', 'definitional']
+ENGINES = ['auto', 'saturation', 'cdcl', 'horn', '2sat', 'bitset']
+
+# Statuses of proof
+PROVED = 'proved'
+UNPROVED = 'unproved'
+# Some limit is exceeded (see Limits)
+RESOURCE_OUT = 'resource_out'
+
 
 class Resolution:
-    transformations_info = []
-    branches_info = []
-    resolution_steps = []
-    clauses_left = []
-    first_clauses = []
 
     def transofrm(self, formula: Token) -> (Token, Token):
         if not isinstance(formula, ImplicationSign):
@@ -22,51 +36,93 @@ class Resolution:
                 f'Resolution can only be applied to ImplicationSign, got {type(formula)}')
         lhs, rhs = formula.children()
         neg_rhs = Not([rhs])
-        logger.info(f'Working with {lhs} and {neg_rhs}')
+        logger.info('Working with %s and %s', lhs, neg_rhs)
+
+        # Resources are checked after each transformation
+        def save_tr_info(text: str) -> None:
+            self.context.transformations_info.append(TransformationInfo(text, lhs, neg_rhs))
+            self.context.budget.check()
 
-        save_tr_info = lambda s: self.transformations_info.append(
-            TransformationInfo(s, lhs, neg_rhs))
         save_tr_info('Negate right-hand side')
 
         lhs = remove_logical_ops(lhs)
         neg_rhs = remove_logical_ops(neg_rhs)
-        logger.info(f'Removed logical operations: {lhs} and {neg_rhs}')
+        logger.info('Removed logical operations: %s and %s', lhs, neg_rhs)
         save_tr_info('Apply equivalences to get rid of non-trivial logical operations')
 
         lhs = narrow_negation(lhs)
         neg_rhs = narrow_negation(neg_rhs)
-        logger.info(f'Narrowed negation: {lhs} and {neg_rhs}')
+        logger.info('Narrowed negation: %s and %s', lhs, neg_rhs)
         save_tr_info('Use de-Morgan laws to narrow negation')
 
         lhs = standartize_var_names(lhs, set())
         neg_rhs = standartize_var_names(neg_rhs, set())
-        logger.info(f'Standartized variable names: {lhs} and {neg_rhs}')
+        logger.info('Standartized variable names: %s and %s', lhs, neg_rhs)
         save_tr_info('Rename bound variables so that all variable names are unique')
 
+        lhs = miniscope(lhs)
+        neg_rhs = miniscope(neg_rhs)
+        logger.info('Moved quantifiers inward: %s and %s', lhs, neg_rhs)
+        save_tr_info('Move quantifiers inward, so that Skolemov functions have less arguments')
+
         lhs = skolemize(lhs)
-        neg_rhs = skolemize(neg_rhs, [])
-        logger.info(f'Skolemized: {lhs} and {neg_rhs}')
+        neg_rhs = skolemize(neg_rhs)
+        logger.info('Skolemized: %s and %s', lhs, neg_rhs)
         save_tr_info('Get rid of existence quantifier (use Skolemov constants and functions)')
 
         lhs = remove_foralls(lhs)
         neg_rhs = remove_foralls(neg_rhs)
-        logger.info(f'Removed universal quantifiers: {lhs} and {neg_rhs}')
+        logger.info('Removed universal quantifiers: %s and %s', lhs, neg_rhs)
         save_tr_info('Get rid of universal quantifiers')
 
-        lhs = to_cnf(lhs)
-        neg_rhs = to_cnf(neg_rhs)
-        logger.info(f'Brought to CNF: {lhs} and {neg_rhs}')
-        save_tr_info('Bring formula to CNF')
+        if self.clausifier == 'definitional':
+            clausifier = DefinitionalClausifier()
+            lhs = clausifier.to_cnf(lhs)
+            neg_rhs = clausifier.to_cnf(neg_rhs)
+            logger.info('Brought to CNF: %s and %s', lhs, neg_rhs)
+            save_tr_info('Bring formula to CNF (name subformulas with new predicates)')
+        else:
+            lhs = to_cnf(lhs)
+            neg_rhs = to_cnf(neg_rhs)
+            logger.info('Brought to CNF: %s and %s', lhs, neg_rhs)
+            save_tr_info('Bring formula to CNF')
 
         lhs = remove_redundancy(lhs)
         neg_rhs = remove_redundancy(neg_rhs)
-        logger.info(f'Removed redundancy: {lhs} and {neg_rhs}')
+        logger.info('Removed redundancy: %s and %s', lhs, neg_rhs)
         save_tr_info('Get rid of redundancy')
 
         return (lhs, neg_rhs)
 
-    def __init__(self, formula: Token):
+    # weight: name from WEIGHT_FUNCTIONS, pick_ratio: see ClauseQueue,
+    # clausifier: one of CLAUSIFIERS ('definitional' avoids exponential growth of CNF),
+    # trace: transform formula step by step and save TransformationInfo after each step
+    # (otherwise formula is brought to clauses in one traversal),
+    # engine: one of ENGINES ('auto' uses 2-SAT solver for propositional clauses of at most two
+    # literals, Horn engine for other propositional Horn clauses, CDCL for the rest of
+    # propositional clauses and saturation otherwise; 'bitset' and unit-resulting resolution
+    # of 'horn' are never chosen automatically),
+    # limits: resources that proof can use (see Limits),
+    # set_of_support: saturation only resolves clauses derived from negated right-hand side with
+    # other clauses (see Saturation)
+    def __init__(self, formula: Token, weight: str = 'symbols', pick_ratio: int = 5,
+                 clausifier: str = 'distribution', trace: bool = False, engine: str = 'auto',
+                 limits: Limits = Limits(), set_of_support: bool = False):
         self.formula = formula
+        self.engine = engine
+        self.clausifier = clausifier
+        self.trace = trace
+        self.weight = weight
+        self.pick_ratio = pick_ratio
+        self.set_of_support = set_of_support
+        # Fresh names and trace of this proof only
+        self.context = ProofContext(limits)
+        self.status = None
+        self.resource_out = None
+        self.first_clauses = []
+        self.clauses_left = []
+        # Derivations made by engine (see ProofGraph)
+        self.proof = None
 
     @staticmethod
     def comb_clauses(clauses: list[Clause]) -> None:
@@ -74,38 +130,157 @@ class Resolution:
         sort_children = lambda clause: Or(sorted(clause.children(), key=child_key)) if \
                 isinstance(clause, Or) else clause
 
-        clauses = list(map(sort_children, clauses))
-        clauses = list(set(clauses))
         clauses = list(filter(lambda x: x is not None, clauses))
+        clauses = list(map(sort_children, clauses))
+        # Clauses that differ only in names of variables and order of literals are the same
+        clauses = remove_variants(clauses)
         clauses = list(
             filter(lambda x: not isinstance(x, Constant) or not x == CONSTANT_TRUE, clauses))
-        clauses.sort(key=short_first)
+        weight = SymbolCount()
+        clauses.sort(key=lambda clause: short_first(clause, weight))
         return clauses
 
+    def transform_fused(self, formula: Token) -> (Token, Token):
+        if not isinstance(formula, ImplicationSign):
+            raise TypeError(
+                f'Resolution can only be applied to ImplicationSign, got {type(formula)}')
+        lhs, rhs = formula.children()
+        clausifier = FusedClausifier(name_subformulas=self.clausifier == 'definitional')
+        lhs = clausifier.to_cnf(lhs)
+        neg_rhs = clausifier.to_cnf(rhs, positive=False)
+        logger.info('Brought to clauses: %s and %s', lhs, neg_rhs)
+        return (lhs, neg_rhs)
+
     def resolution(self) -> bool:
-        lhs, neg_rhs = self.transofrm(self.formula)
-        clauses = Resolution.comb_clauses(break_to_clauses(lhs) + break_to_clauses(neg_rhs))
-        self.first_clauses = clauses[:]
-        while len(clauses) > 0:
-            step = Unification.try_apply_resolution(clauses)
-            if step is None:
-                self.clauses_left = clauses
+        with self.context.active():
+            try:
+                proved = self.prove()
+            except ResourceOut as e:
+                logger.info('Resources are out: %s', e)
+                self.status = RESOURCE_OUT
+                self.resource_out = e
                 return False
-            self.resolution_steps.append(step)
-            clauses = Resolution.comb_clauses(step.new_clauses())
-        return True
+        self.status = PROVED if proved else UNPROVED
+        return proved
+
+    def prove(self) -> bool:
+        if self.trace:
+            lhs, neg_rhs = self.transofrm(self.formula)
+        else:
+            lhs, neg_rhs = self.transform_fused(self.formula)
+        self.first_clauses = Resolution.comb_clauses(
+            break_to_clauses(lhs) + break_to_clauses(neg_rhs))
+        store = ClauseStore()
+        clauses = store.encode_all(self.first_clauses)
+        engine = self.engine
+        if engine == 'auto':
+            propositional = is_propositional(store)
+            if propositional and is_binary(clauses):
+                engine = '2sat'
+            elif propositional and is_horn(clauses):
+                engine = 'horn'
+            else:
+                engine = 'cdcl' if propositional else 'saturation'
+        logger.info(f'Using {engine} engine')
+        if engine == 'cdcl':
+            return self.solve_cdcl(store, clauses)
+        if engine == 'horn':
+            return self.solve_horn(store, clauses)
+        if engine == '2sat':
+            return self.solve_2sat(store, clauses)
+        if engine == 'bitset':
+            return self.solve_bitset(store, clauses)
+        if engine != 'saturation':
+            raise ValueError(f'Unknown engine {engine!r}, expected one of: {", ".join(ENGINES)}')
+        support = None
+        if self.set_of_support:
+            support = set(store.encode_all(Resolution.comb_clauses(break_to_clauses(neg_rhs))))
+        return self.saturate(store, clauses, support)
+
+    # Derivations of engine are kept even if resources are out before it's done
+    def run_engine(self, engine, run) -> bool:
+        self.proof = engine.proof
+        try:
+            return run()
+        finally:
+            self.context.resolution_steps += engine.steps
+
+    def saturate(self, store: ClauseStore, clauses: list[EncodedClause],
+                 support: set[EncodedClause] | None = None) -> bool:
+        passive = ClauseQueue(store, WEIGHT_FUNCTIONS[self.weight](), self.pick_ratio)
+        saturation = Saturation(store, clauses, passive, support)
+        result = self.run_engine(saturation, saturation.run)
+        if not result:
+            self.clauses_left = store.decode_all(list(saturation.active))
+        return result
+
+    # Atoms are treated as propositional variables, so this is sound, but incomplete if
+    # unification is needed
+    def solve_cdcl(self, store: ClauseStore, clauses: list[EncodedClause]) -> bool:
+        solver = CDCL(store, clauses)
+        return self.run_engine(solver, solver.solve)
+
+    # Forward chaining for propositional clauses, unit-resulting resolution otherwise
+    def solve_horn(self, store: ClauseStore, clauses: list[EncodedClause]) -> bool:
+        if not is_horn(clauses):
+            raise ValueError('Horn engine can only be applied to Horn clauses')
+        if is_propositional(store):
+            solver = HornSAT(store, clauses)
+        else:
+            solver = UnitResultingResolution(store, clauses)
+        result = self.run_engine(solver, solver.solve)
+        if not result and isinstance(solver, UnitResultingResolution):
+            self.clauses_left = store.decode_all(
+                [fact for facts in solver.facts.values() for fact in facts])
+        return result
+
+    # Atoms are treated as propositional variables, as in solve_cdcl
+    def solve_2sat(self, store: ClauseStore, clauses: list[EncodedClause]) -> bool:
+        if not is_binary(clauses):
+            raise ValueError('2-SAT engine can only be applied to clauses of at most two literals')
+        solver = TwoSAT(store, clauses)
+        return self.run_engine(solver, solver.solve)
+
+    # Resolution over NumPy bitsets, for propositional clauses only (NumPy is imported here, so
+    # that other engines don't need it)
+    def solve_bitset(self, store: ClauseStore, clauses: list[EncodedClause]) -> bool:
+        if not is_propositional(store):
+            raise ValueError('Bitset engine can only be applied to propositional clauses')
+        try:
+            from src.core.bitset import BitsetResolution
+        except ModuleNotFoundError as e:
+            if e.name != 'numpy':
+                raise
+            raise ValueError('Bitset engine requires NumPy')
+        solver = BitsetResolution(store, clauses)
+        result = self.run_engine(solver, solver.run)
+        if not result:
+            self.clauses_left = store.decode_all(solver.clauses_left())
+        return result
+
+    # One of PROVED, UNPROVED, RESOURCE_OUT (None before resolution)
+    def get_status(self) -> str | None:
+        return self.status
+
+    # Resources used by proof, counted even if they are out
+    def get_budget(self) -> Budget:
+        return self.context.budget
 
     def get_branch_info(self) -> list[BranchInfo]:
-        return self.branches_info
+        return self.context.branches_info
 
     def get_transformations_info(self) -> list[TransformationInfo]:
-        return self.transformations_info
+        return self.context.transformations_info
 
     def get_first_clauses(self) -> list[Clause]:
         return self.first_clauses
 
     def get_resolution_steps(self) -> list[ResolutionStep]:
-        return self.resolution_steps
+        return self.context.resolution_steps
+
+    # Only steps that nil is derived with (empty if formula isn't proved)
+    def get_proof_steps(self) -> list[ResolutionStep]:
+        return [] if self.proof is None else self.proof.refutation()
 
     def get_clauses_left(self) -> list[Clause]:
         return self.clauses_left
@@ -2,6 +2,7 @@ from collections import namedtuple
 
 from src.model.abstract.token import Token
 from src.model.formula_representation import Clause
+from src.core.clause_store import EncodedClause
 
 # Substitute source instead of dest
 UnifierInfo = namedtuple('UnifierInfo', ['source', 'dest'])
@@ -15,34 +16,115 @@ def pad_strings(a: str, b: str) -> (str, str):
     return a, b
 
 
+class ProofGraph:
+    '''Derivations of clauses (encoded in store). Node is a clause with ids of its parents,
+    unifiers and rule that derived it; input clauses are nodes without parents'''
+
+    def __init__(self, store):
+        self.store = store
+        # Node id -> its clause, parents, unifiers and rule
+        self.clauses = []
+        self.parents = []
+        self.unifiers = []
+        self.rules = []
+        # Clause -> id of the last node with it
+        self.ids = dict()
+
+    def __len__(self):
+        return len(self.clauses)
+
+    def add(self, clause: EncodedClause, parents: tuple[int, ...] = (),
+            unifiers: list[UnifierInfo] | None = None, rule: str = 'input') -> int:
+        node = len(self.clauses)
+        self.clauses.append(clause)
+        self.parents.append(parents)
+        self.unifiers.append([] if unifiers is None else unifiers)
+        self.rules.append(rule)
+        self.ids[clause] = node
+        return node
+
+    # Node of clause, clause is added as input if it's not derived
+    def node(self, clause: EncodedClause) -> int:
+        node = self.ids.get(clause)
+        return self.add(clause) if node is None else node
+
+    def derive(self, new_clause: EncodedClause, parents: list[EncodedClause],
+               unifiers: list[UnifierInfo] | None = None, rule: str = 'resolution'):
+        parent_ids = tuple(map(self.node, parents))
+        return ResolutionStep(self, self.add(new_clause, parent_ids, unifiers, rule))
+
+    # Derivations that nil depends on (walking back from it), in order they were made
+    def refutation(self) -> list:
+        root = self.ids.get(())
+        if root is None:
+            return []
+        used = {root}
+        stack = [root]
+        while len(stack) > 0:
+            for parent in self.parents[stack.pop()]:
+                if parent not in used:
+                    used.add(parent)
+                    stack.append(parent)
+        # Parents are added before their children, so ids are in topological order
+        return [ResolutionStep(self, node) for node in sorted(used) if len(self.parents[node]) > 0]
+
+
 class ResolutionStep:
+    '''Derivation of node of proof graph: resolution of clauses[lhs_idx] and clauses[rhs_idx]
+    (hyper-resolution has more parents, then rhs is the last one). Clauses shown with it are its
+    parents, they are found when needed'''
+    lhs_idx = 0
+
+    def __init__(self, graph: ProofGraph, node: int):
+        self.graph = graph
+        self.node = node
+
+    @property
+    def rhs_idx(self) -> int:
+        return max(1, len(self.graph.parents[self.node]) - 1)
+
+    @property
+    def store(self):
+        return self.graph.store
+
+    @property
+    def clauses(self) -> list[EncodedClause]:
+        return [self.graph.clauses[parent] for parent in self.graph.parents[self.node]]
+
+    @property
+    def new_clause(self) -> EncodedClause:
+        return self.graph.clauses[self.node]
+
+    @property
+    def unifiers(self) -> list[UnifierInfo]:
+        return self.graph.unifiers[self.node]
+
+    @property
+    def rule(self) -> str:
+        return self.graph.rules[self.node]
+
+    # Parents are kept, resolvent is added
+    def new_encoded_clauses(self) -> list[EncodedClause]:
+        if len(self.new_clause) == 0:
+            return self.clauses
+        return self.clauses + [self.new_clause]
+
+    def get_clauses(self) -> list[Clause]:
+        return self.store.decode_all(self.clauses)
 
-    def __init__(self, clauses: list[Clause], lhs_idx: int, rhs_idx: int, new_clause,
-                 unifiers: list[UnifierInfo]):
-        self.clauses = clauses
-        self.lhs_idx = lhs_idx
-        self.rhs_idx = rhs_idx
-        if self.rhs_idx < self.lhs_idx:
-            self.lhs_idx, self.rhs_idx = self.rhs_idx, self.lhs_idx
-        self.new_clause = new_clause
-        self.unifiers = unifiers
+    def get_new_clause(self) -> Clause | None:
+        return self.store.decode(self.new_clause)
 
     def new_clauses(self) -> list[Clause]:
-        new_clauses = self.clauses[:]
-        del new_clauses[self.lhs_idx]
-        del new_clauses[self.rhs_idx - 1]
-        if isinstance(self.new_clause, Clause):
-            new_clauses.append(self.new_clause)
-        elif self.new_clause is not None:
-            new_clauses += self.new_clause
-        return new_clauses
+        return self.store.decode_all(self.new_encoded_clauses())
 
     def __repr__(self):
         return f'''Resolution step:
-\tClauses before: {self.clauses}
+\tClauses before: {self.get_clauses()}
 \tLhs: {self.lhs_idx}
 \tRhs: {self.rhs_idx}
-\tNew clause: {self.new_clause}
+\tRule: {self.rule}
+\tNew clause: {self.get_new_clause()}
 \tUnifiers: {self.unifiers}'''
 
     def __str__(self):
@@ -51,13 +133,14 @@ class ResolutionStep:
         # After lhs end (2 is needed for comma after lhs)
         before_rhs = 2
         rhs_len = 0
+        clauses = self.get_clauses()
         clauses_str = ''
-        for i in range(len(self.clauses)):
-            s = str(self.clauses[i])
+        for i in range(len(clauses)):
+            s = str(clauses[i])
             if (i == self.lhs_idx or i == self.rhs_idx) and len(s) == 1:
                 s = f' {s}'
             clauses_str += s
-            if i != len(self.clauses) - 1:
+            if i != len(clauses) - 1:
                 clauses_str += ', '
 
             if i < self.lhs_idx:
@@ -75,13 +158,8 @@ class ResolutionStep:
 
         # Center between lhs and rhs
         center = before_lhs + lhs_len + before_rhs // 2
-        new_clause_str = ''
-        if self.new_clause is None:
-            new_clause_str = 'nil'
-        elif isinstance(self.new_clause, Clause):
-            new_clause_str = str(self.new_clause)
-        else:
-            new_clause_str = ', '.join(list(map(str, self.new_clause)))
+        new_clause = self.get_new_clause()
+        new_clause_str = 'nil' if new_clause is None else str(new_clause)
         before_new_clause = center - len(new_clause_str) // 2
 
         unifiers_str_1 = ''
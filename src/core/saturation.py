@@ -0,0 +1,102 @@
+from itertools import count
+from logging import getLogger
+
+from src.core.clause_store import ClauseStore, EncodedClause
+from src.core.resolution_info import ProofGraph
+from src.core.clause_selection import ClauseQueue
+from src.core.subsumption import FeatureVectorIndex, clause_features
+from src.core.discrimination_tree import DiscriminationTree
+from src.core.unification import Unification
+from src.core.limits import current_budget
+
+logger = getLogger(__name__)
+
+
+class Saturation:
+    '''Given-clause loop (Otter style).
+
+    Passive clauses wait to be selected. Selected ("given") clause is resolved against active
+    clauses and becomes active itself, so every pair of clauses is resolved only once.
+    Only active clauses that have literals unifiable with complementary ones are retrieved
+    (see DiscriminationTree).
+    New resolvents go to passive clauses, unless they are subsumed by some kept clause.
+    Kept clauses subsumed by new one are removed.
+
+    If set of support is given, other clauses are active from the start, so they are never given
+    and are only resolved with clauses derived from the support (complete if clauses out of the
+    support are satisfiable, e. g. support is the negated conclusion).'''
+
+    def __init__(self, store: ClauseStore, clauses: list[EncodedClause],
+                 passive: ClauseQueue | None = None, support: set[EncodedClause] | None = None):
+        self.store = store
+        # Active clause -> number of activation
+        self.active = dict()
+        self.activations = count()
+        self.literal_index = DiscriminationTree()
+        self.passive = ClauseQueue(store) if passive is None else passive
+        # Active and passive clauses (and given one)
+        self.index = FeatureVectorIndex()
+        # All clauses that have ever been derived
+        self.known = set()
+        self.proof = ProofGraph(store)
+        self.steps = []
+        self.subsumed_num = 0
+        self.budget = current_budget()
+        for clause in clauses:
+            if self.keep(clause) and support is not None and clause not in support:
+                self.passive.remove(clause)
+                self.activate(clause)
+
+    # Add clause to passive ones if it isn't redundant
+    def keep(self, clause: EncodedClause) -> bool:
+        if clause in self.known or ClauseStore.is_tautology(clause):
+            return False
+        self.known.add(clause)
+        features = clause_features(self.store, clause)
+        # Forward subsumption
+        if self.index.find_subsuming(self.store, clause, features) is not None:
+            self.subsumed_num += 1
+            return False
+        # Backward subsumption
+        for subsumed in self.index.find_subsumed(self.store, clause, features):
+            self.subsumed_num += 1
+            self.index.remove(subsumed)
+            if subsumed in self.passive:
+                self.passive.remove(subsumed)
+            elif subsumed in self.active:
+                del self.active[subsumed]
+                self.literal_index.remove(self.store, subsumed)
+        self.index.insert(clause, features)
+        self.passive.push(clause)
+        return True
+
+    def activate(self, clause: EncodedClause) -> None:
+        self.active[clause] = next(self.activations)
+        self.literal_index.insert(self.store, clause)
+
+    # Returns True if nil is derived
+    def run(self) -> bool:
+        if () in self.known:
+            return True
+        while len(self.passive) > 0:
+            given = self.passive.pop()
+            self.budget.step()
+            logger.info(f'Given clause: {self.store.decode(given)}')
+            partners = sorted(self.literal_index.partners(self.store, given),
+                              key=self.active.__getitem__)
+            for i in range(len(partners)):
+                if partners[i] not in self.active:
+                    continue
+                for new_clause, unif in Unification.resolvents(self.store, given, partners[i]):
+                    if not self.keep(new_clause):
+                        continue
+                    self.budget.generated()
+                    self.steps.append(self.proof.derive(new_clause, [partners[i], given], unif))
+                    logger.info(f'\t{self.store.decode(partners[i])} gives ' +
+                                f'{self.store.decode(new_clause)}, unifiers: {unif}')
+                    if len(new_clause) == 0:
+                        return True
+            # Given clause can be subsumed by its own resolvents
+            if given in self.index:
+                self.activate(given)
+        return False
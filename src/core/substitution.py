@@ -0,0 +1,59 @@
+'''Substitution found by unification.
+
+Bound term (variable, Skolemov constant or Skolemov function) is mapped to the term it's replaced
+with. All bindings are applied at once: a term that replaces a bound term isn't substituted
+itself, so bindings are never chained. Substituted terms are built only when they're needed
+(apply) and are memoized.'''
+from src.model.formula_representation import *
+from src.core.resolution_info import UnifierInfo
+from src.util import transform_children
+
+
+class Substitution:
+
+    def __init__(self):
+        # Bound term -> term it's replaced with
+        self.bindings = dict()
+        # Term -> term with substitution applied
+        self.applied = dict()
+
+    def __len__(self):
+        return len(self.bindings)
+
+    # Check if bound term occurs in term
+    @staticmethod
+    def occurs(bound: Token, term: Token) -> bool:
+        stack = [term]
+        while len(stack) > 0:
+            term = stack.pop()
+            if term is bound:
+                return True
+            stack += term.children()
+        return False
+
+    def bind(self, bound: Token, term: Token) -> None:
+        self.bindings[bound] = term
+        self.applied.clear()
+
+    # Terms are substituted after their children (explicit stack, so depth isn't limited)
+    def apply(self, term: Token) -> Token:
+        stack = [term]
+        while len(stack) > 0:
+            top = stack[-1]
+            if top in self.applied:
+                stack.pop()
+                continue
+            result = self.bindings.get(top)
+            if result is None:
+                pending = [ch for ch in top.children() if ch not in self.applied]
+                if len(pending) > 0:
+                    stack += pending
+                    continue
+                result = transform_children(top, self.applied.__getitem__)
+            self.applied[top] = result
+            stack.pop()
+        return self.applied[term]
+
+    # Bindings in printable form
+    def unifiers(self) -> list[UnifierInfo]:
+        return [UnifierInfo(term, bound) for bound, term in self.bindings.items()]
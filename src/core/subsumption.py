@@ -0,0 +1,126 @@
+'''Subsumption: clause C subsumes D if C's literals can be matched to distinct D's literals.
+Then D is redundant and can be removed.'''
+from collections import Counter, namedtuple
+
+from src.model.formula_representation import *
+from src.core.clause_store import ClauseStore, EncodedClause, ANY_SYMBOL
+from src.core.unification import Unification
+
+# If C subsumes D, C's features are less than or equal to D's ones:
+#   sizes: (positive literals, negative literals, max depth of literal),
+#   symbols: number of literals with each (polarity, predicate symbol).
+# Substituted parts of terms have depth 1, because substitution can make them shorter.
+ClauseFeatures = namedtuple('ClauseFeatures', ['sizes', 'symbols'])
+
+
+def term_depth(term: Token) -> int:
+    result = 0
+    stack = [(term, 1)]
+    while len(stack) > 0:
+        term, depth = stack.pop()
+        result = max(result, depth)
+        if not isinstance(term, Atom | SkolemovFunction):
+            stack += [(ch, depth + 1) for ch in term.children()]
+    return result
+
+
+def clause_features(store: ClauseStore, clause: EncodedClause) -> ClauseFeatures:
+    positive = sum(1 for lit in clause if lit > 0)
+    depth = max((term_depth(store.atom(lit)) for lit in clause), default=0)
+    symbols = Counter()
+    for lit in clause:
+        symbol = store.atom_symbols[abs(lit)]
+        if symbol != ANY_SYMBOL:
+            symbols[(lit > 0, symbol)] += 1
+    return ClauseFeatures((positive, len(clause) - positive, depth), symbols)
+
+
+def symbols_le(a: Counter, b: Counter) -> bool:
+    return all(b[symbol] >= num for symbol, num in a.items())
+
+
+def subsumes(store: ClauseStore, c: EncodedClause, d: EncodedClause) -> bool:
+    if len(c) > len(d):
+        return False
+    d_literals = set(d)
+    if all(lit in d_literals for lit in c):
+        return True
+
+    # Match literals of c one by one, backtracking if bindings cannot be extended
+    def match_from(i: int, used: set[int], bindings: dict) -> bool:
+        if i == len(c):
+            return True
+        c_lit = c[i]
+        for d_lit in d:
+            if d_lit in used or (c_lit > 0) != (d_lit > 0):
+                continue
+            new_bindings = Unification.try_match(store.atom(c_lit), store.atom(d_lit), bindings)
+            if new_bindings is not None and match_from(i + 1, used | {d_lit}, new_bindings):
+                return True
+        return False
+
+    return match_from(0, set(), dict())
+
+
+class FeatureVectorIndex:
+    '''Clauses in a trie over their features sizes, so that subsumption candidates are found
+    without looking at most clauses'''
+
+    def __init__(self):
+        self.root = dict()
+        self.features = dict()
+
+    def insert(self, clause: EncodedClause, features: ClauseFeatures) -> None:
+        node = self.root
+        for size in features.sizes:
+            node = node.setdefault(size, dict())
+        node[clause] = features.symbols
+        self.features[clause] = features
+
+    def remove(self, clause: EncodedClause) -> None:
+        features = self.features.pop(clause)
+        nodes = [self.root]
+        for size in features.sizes:
+            nodes.append(nodes[-1][size])
+        del nodes[-1][clause]
+        # Remove empty branches
+        for i in reversed(range(len(features.sizes))):
+            if len(nodes[i + 1]) > 0:
+                break
+            del nodes[i][features.sizes[i]]
+
+    def __contains__(self, clause: EncodedClause) -> bool:
+        return clause in self.features
+
+    def __len__(self):
+        return len(self.features)
+
+    # Clauses whose features are all <= (if less is True) or >= given ones
+    def candidates(self, features: ClauseFeatures, less: bool):
+        nodes = [self.root]
+        for size in features.sizes:
+            nodes = [
+                child for node in nodes for child_size, child in node.items()
+                if (child_size <= size if less else child_size >= size)
+            ]
+        for leaf in nodes:
+            for clause, symbols in leaf.items():
+                if symbols_le(symbols, features.symbols) if less else \
+                        symbols_le(features.symbols, symbols):
+                    yield clause
+
+    # Some clause of index that subsumes clause (forward subsumption)
+    def find_subsuming(self, store: ClauseStore, clause: EncodedClause,
+                       features: ClauseFeatures) -> EncodedClause | None:
+        for candidate in self.candidates(features, less=True):
+            if subsumes(store, candidate, clause):
+                return candidate
+        return None
+
+    # All clauses of index that are subsumed by clause (backward subsumption)
+    def find_subsumed(self, store: ClauseStore, clause: EncodedClause,
+                      features: ClauseFeatures) -> list[EncodedClause]:
+        return [
+            candidate for candidate in self.candidates(features, less=False)
+            if candidate != clause and subsumes(store, clause, candidate)
+        ]
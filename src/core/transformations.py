@@ -1,149 +1,196 @@
+from collections.abc import Sequence
 from logging import getLogger
 
 from src.model.formula_representation import *
-from src.util import transform_children, replace_free_variable
+from src.util import transform_top_down, recursively_transform_children, recursive_filter, \
+        rewrite, rewrite_to_fixpoint, replace_free_variable, has_free_variable, SKIP_CHILDREN
+from src.core.limits import current_budget
 
 logger = getLogger(__name__)
 
 
 # 1. Remove all logical operations, except for And, Or, Not
-def remove_logical_ops(formula: Token) -> Token:
-    if isinstance(formula, LogicalOp) and not isinstance(formula, And | Or | Not):
+def remove_logical_op(formula: Token) -> Token:
+    while isinstance(formula, LogicalOp) and not isinstance(formula, And | Or | Not):
         formula = formula.remove()
-        return remove_logical_ops(formula)
+    return formula
 
-    return transform_children(formula, remove_logical_ops)
+
+def remove_logical_ops(formula: Token) -> Token:
+    return recursively_transform_children(formula, remove_logical_op)
 
 
 # 2. Narrow negation operations as much as possible
-def narrow_negation(formula: Token) -> Token:
+def narrow_step(formula: Token) -> Token:
     while isinstance(formula, Not):
         new_formula = formula.narrow()
         if new_formula == formula:
             break
         formula = new_formula
+    return formula
+
 
-    return transform_children(formula, narrow_negation)
+def narrow_negation(formula: Token) -> Token:
+    return recursively_transform_children(formula, narrow_step)
 
 
 # 3. Standartize variable names ("alpha-conversion")
-def standartize_var_names(formula: Token, known_names: set[str] = set()) -> Token:
+def standartize_var_names(formula: Token, known_names: set[str] | None = None) -> Token:
+    known_names = set() if known_names is None else known_names
+
+    # Quantifiers and variables are visited in preorder, names are collected on the way
+    def standartize(formula: Token, _) -> (Token, None):
+        if isinstance(formula, Quantifier):
+            old_name = formula.var.get_name()
+            logger.debug('Formula: %s', formula)
+            logger.debug('Variable name: %s, known names: %s', old_name, known_names)
+            if old_name in known_names:
+                new_name = old_name
+                while new_name in known_names:
+                    new_name = Variable.new_name()
+                new_var = Variable(new_name)
+                new_body = replace_free_variable(formula.body, formula.var, new_var)
+                formula = formula.rename_var(new_var)
+                formula = formula.replace_child(0, new_body)
+                logger.debug('After replacing free variables: %s', formula)
+                known_names.add(new_name)
+            else:
+                known_names.add(old_name)
+        elif isinstance(formula, Variable):
+            known_names.add(formula.get_name())
+        return formula, None
+
+    return transform_top_down(formula, standartize)
+
+
+# 3.5. Move quantifiers inward ("miniscoping"), so that Skolemov functions get less arguments:
+#   Qx F <=> F if x is not free in F,
+#   forall x (A and B) <=> (forall x A) and (forall x B), exists x (A or B) <=> (exists x A) or
+#   (exists x B), forall x (A or B) <=> (forall x A) or B if x is not free in B (same for exists).
+# Formula should be in negation normal form with unique variable names
+def push_quantifier(quantifier: type, var: Variable, body: Token) -> Token:
+    distributed, partitioned = (And, Or) if quantifier == Forall else (Or, And)
+
+    # Quantifier over var is moved one level down, children of result are moved further
+    def push(formula: Token, _) -> (Token, object):
+        if not isinstance(formula, quantifier) or formula.get_var() != var:
+            return formula, SKIP_CHILDREN
+        body = formula.get_body()
+        if not has_free_variable(body, var):
+            return body, SKIP_CHILDREN
+        if isinstance(body, distributed):
+            return distributed([quantifier(var, ch) for ch in body.children()]), None
+        if isinstance(body, partitioned):
+            children = body.children()
+            dependent = [ch for ch in children if has_free_variable(ch, var)]
+            if len(dependent) < len(children):
+                inner = dependent[0] if len(dependent) == 1 else partitioned(dependent)
+                first = children.index(dependent[0])
+                return partitioned(list(children[:first]) + [quantifier(var, inner)] +
+                                   [ch for ch in children[first:] if ch not in dependent]), None
+        return formula, SKIP_CHILDREN
+
+    return transform_top_down(quantifier(var, body), push)
+
+
+def miniscope_step(formula: Token) -> (Token, bool):
     if isinstance(formula, Quantifier):
-        old_name = formula.var.get_name()
-        logger.debug(f'Formula: {formula}')
-        logger.debug(f'Variable name: {old_name}, known names: {list(map(str, known_names))}')
-        if old_name in known_names:
-            new_name = old_name
-            while new_name in known_names:
-                new_name = Variable.new_name()
-            new_var = Variable(new_name)
-            new_body = replace_free_variable(formula.body, formula.var, new_var)
-            formula = formula.rename_var(new_var)
-            formula = formula.replace_child(0, new_body)
-            logger.debug(f'After replacing free variables: {formula}')
-            known_names.add(new_name)
-        else:
-            known_names.add(old_name)
-    elif isinstance(formula, Variable):
-        known_names.add(formula.get_name())
-
-    return transform_children(formula, lambda c: standartize_var_names(c, known_names))
+        new_formula = push_quantifier(type(formula), formula.get_var(), formula.get_body())
+        return new_formula, new_formula is not formula
+    return formula, False
+
+
+def miniscope(formula: Token) -> Token:
+    return rewrite(formula, miniscope_step)[0]
 
 
 # 4. Get rid of existance quantifier ("skolemize")
-def skolemize(formula: Token, universal_variables: list[Variable] = []) -> Token:
-    if isinstance(formula, Exists):
-        formula = formula.remove(universal_variables)
-        return skolemize(formula, universal_variables)
-    elif isinstance(formula, Forall):
-        universal_variables.append(formula.get_var())
-
-    children = formula.children()
-    for i in range(len(children)):
-        child = children[i]
-        formula = formula.replace_child(i, skolemize(child, universal_variables))
-    return formula
+def skolemize(formula: Token, universal_variables: Sequence[Variable] = ()) -> Token:
+
+    # Context is universal variables of enclosing quantifiers
+    def skolemize_step(formula: Token, universal_variables: tuple) -> (Token, tuple):
+        while isinstance(formula, Exists):
+            formula = formula.remove(list(universal_variables))
+        if isinstance(formula, Forall):
+            # New tuple, so that variables don't leak to siblings
+            universal_variables = (*universal_variables, formula.get_var())
+        return formula, universal_variables
+
+    return transform_top_down(formula, skolemize_step, tuple(universal_variables))
 
 
 # 5, 6. Move universal quantifiers to the beginning and remove them
-def remove_foralls(formula: Token) -> Token:
-    if isinstance(formula, Forall):
+def remove_forall(formula: Token) -> Token:
+    while isinstance(formula, Forall):
         formula = formula.body
-        return remove_foralls(formula)
-
-    children = formula.children()
-    for i in range(len(children)):
-        child = children[i]
-        formula = formula.replace_child(i, remove_foralls(child))
     return formula
 
 
+def remove_foralls(formula: Token) -> Token:
+    return recursively_transform_children(formula, remove_forall)
+
+
 # 7. Conjunctive normal form:
 #   a. Merge n-ary logical operations
-def merge_nary_ops(formula: Token) -> Token:
-    while isinstance(formula, NaryLogicalOp):
-        new_formula = formula.merge()
-        if new_formula == formula:
+def merge_step(formula: Token) -> (Token, bool):
+    new_formula = formula
+    while isinstance(new_formula, NaryLogicalOp):
+        merged = new_formula.merge()
+        if merged == new_formula:
             break
-        formula = new_formula
+        new_formula = merged
+    return new_formula, new_formula is not formula
+
 
-    children = formula.children()
-    for i in range(len(children)):
-        child = children[i]
-        formula = formula.replace_child(i, to_cnf(child))
+# Operations are merged top-down: all nested operations of the same type are merged at once, so
+# that long chains (And(a, And(b, And(c, ...)))) are not rebuilt on each level
+def merge_nested(formula: Token) -> Token:
+    if isinstance(formula, NaryLogicalOp) and \
+            any(isinstance(ch, type(formula)) for ch in formula.children()):
+        return type(formula)(recursive_filter(formula, lambda f: not isinstance(f, type(formula))))
     return formula
 
 
+def merge_nary_ops(formula: Token) -> Token:
+    return recursively_transform_children(formula, merge_nested)
+
+
 #   b. Apply Or's distributivity
 def distribute(formula: Token) -> Token:
-    if isinstance(formula, Or):
-        formula = formula.distribute()
+    return recursively_transform_children(
+        formula, lambda f: f.distribute() if isinstance(f, Or) else f)
 
-    children = formula.children()
-    for i in range(len(children)):
-        child = children[i]
-        formula = formula.replace_child(i, distribute(child))
-    return formula
+
+def cnf_step(formula: Token) -> (Token, bool):
+    new_formula, _ = merge_step(formula)
+    if isinstance(new_formula, Or):
+        new_formula = new_formula.distribute()
+        # Distribution over conjunction of n operands gives n - 1 more clauses
+        if isinstance(new_formula, And):
+            current_budget().generated(len(new_formula.children()) - 1)
+    return new_formula, new_formula is not formula
 
 
 def to_cnf(formula: Token) -> Token:
-    while True:
-        new_formula = merge_nary_ops(formula)
-        new_formula = distribute(new_formula)
-        if new_formula == formula:
-            return new_formula
-        formula = new_formula
+    return rewrite_to_fixpoint(merge_nary_ops(formula), cnf_step)
 
 
 # 7.5. Remove all kinds of redundancies
-def remove_redundancy_rec(formula: Token) -> Token:
+def redundancy_step(formula: Token) -> (Token, bool):
+    current_budget().check()
+    new_formula = formula
     while True:
-        new_formula = formula.remove_redundancy()
-        if new_formula == formula:
+        reduced = new_formula.remove_redundancy()
+        if reduced == new_formula:
             break
-        formula = new_formula
-
-    children = formula.children()
-    for i in range(len(children)):
-        child = children[i]
-        formula = formula.replace_child(i, remove_redundancy_rec(child))
-    return formula
+        new_formula = reduced
+    return new_formula, new_formula is not formula
 
 
 def remove_redundancy(formula: Token) -> Token:
-    while True:
-        new_formula = remove_redundancy_rec(formula)
-        if new_formula == formula:
-            return formula
-        formula = new_formula
+    return rewrite_to_fixpoint(formula, redundancy_step)
 
 
 # 8. Break to clauses (assume that conjunctions are outermost)
 def break_to_clauses(formula: Token) -> list[Token]:
-    if isinstance(formula, And):
-        formulas = formula.children()
-        clauses = []
-        for form in formulas:
-            clauses += break_to_clauses(form)
-        return clauses
-    return [formula]
+    return recursive_filter(formula, lambda f: not isinstance(f, And))
@@ -0,0 +1,141 @@
+'''2-SAT solver for propositional clause sets where every clause has at most two literals.
+
+Clause (a | b) gives implications -a -> b and -b -> a (unit clause (a) gives -a -> a). Clauses
+are unsatisfiable iff some atom x and its negation are in the same strongly connected component
+of this implication graph. Components are found by Tarjan's algorithm in linear time.
+
+Refutation: path x -> ... -> -x is turned into resolution of its clauses along the path, which
+gives unit clause (-x); the same is done for path -x -> ... -> x, and two units give nil.'''
+from collections import deque
+from logging import getLogger
+
+from src.core.clause_store import ClauseStore, EncodedClause
+from src.core.resolution_info import ProofGraph
+from src.core.limits import current_budget
+
+logger = getLogger(__name__)
+
+
+def is_binary(clauses: list[EncodedClause]) -> bool:
+    return all(len(clause) <= 2 for clause in clauses)
+
+
+class TwoSAT:
+    '''Atoms of store are propositional variables. Refutation is saved as ResolutionSteps if
+    record_steps is True'''
+
+    def __init__(self, store: ClauseStore, clauses: list[EncodedClause],
+                 record_steps: bool = True):
+        self.store = store
+        self.record_steps = record_steps
+        self.proof = ProofGraph(store)
+        self.steps = []
+        self.has_nil = False
+        self.budget = current_budget()
+        # Literal -> literals it implies and clauses that give these implications
+        self.graph = dict()
+        for clause in dict.fromkeys(clauses):
+            if len(clause) == 0:
+                self.has_nil = True
+            elif not ClauseStore.is_tautology(clause):
+                a, b = clause[0], clause[-1]
+                self.add_implication(-a, b, clause)
+                if a != b:
+                    self.add_implication(-b, a, clause)
+
+    def add_implication(self, a: int, b: int, clause: EncodedClause) -> None:
+        self.graph.setdefault(a, []).append((b, clause))
+        self.graph.setdefault(b, [])
+        self.graph.setdefault(-a, [])
+        self.graph.setdefault(-b, [])
+
+    # Literal -> number of its strongly connected component (Tarjan's algorithm with explicit stack)
+    def components(self) -> dict:
+        index = dict()
+        lowlink = dict()
+        component = dict()
+        stack = []
+        counter = 0
+        for root in self.graph:
+            if root in index:
+                continue
+            self.budget.step()
+            # Literal and position of the next implication to visit
+            work = [(root, 0)]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            while len(work) > 0:
+                literal, i = work.pop()
+                edges = self.graph[literal]
+                if i < len(edges):
+                    work.append((literal, i + 1))
+                    implied = edges[i][0]
+                    if implied not in index:
+                        index[implied] = lowlink[implied] = counter
+                        counter += 1
+                        stack.append(implied)
+                        work.append((implied, 0))
+                    elif implied not in component:
+                        lowlink[literal] = min(lowlink[literal], index[implied])
+                    continue
+                if lowlink[literal] == index[literal]:
+                    while True:
+                        member = stack.pop()
+                        component[member] = index[literal]
+                        if member == literal:
+                            break
+                if len(work) > 0:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[literal])
+        return component
+
+    # Clauses of the shortest path of implications from literal a to literal b
+    def path(self, a: int, b: int) -> list[EncodedClause]:
+        parents = {a: None}
+        queue = deque([a])
+        while b not in parents:
+            literal = queue.popleft()
+            for implied, clause in self.graph[literal]:
+                if implied not in parents:
+                    parents[implied] = (literal, clause)
+                    queue.append(implied)
+        clauses = []
+        while parents[b] is not None:
+            b, clause = parents[b]
+            clauses.append(clause)
+        return clauses[::-1]
+
+    # Resolve clauses of path from literal to its negation, gives unit clause (-literal)
+    def derive_unit(self, literal: int) -> EncodedClause:
+        path = self.path(literal, -literal)
+        resolvent = path[0]
+        for clause in path[1:]:
+            if resolvent == (-literal, ):
+                break
+            # Resolvent is (-literal | l), and clause is (-l | m)
+            implied = resolvent[0] if resolvent[1] == -literal else resolvent[1]
+            new_clause = ClauseStore.resolvent(resolvent, clause, implied)
+            self.add_step(resolvent, clause, new_clause)
+            resolvent = new_clause
+        return resolvent
+
+    def add_step(self, a: EncodedClause, b: EncodedClause, new_clause: EncodedClause) -> None:
+        self.budget.generated()
+        if self.record_steps:
+            self.steps.append(self.proof.derive(new_clause, [a, b]))
+
+    # Returns True if clauses are unsatisfiable
+    def solve(self) -> bool:
+        if self.has_nil:
+            return True
+        component = self.components()
+        for literal in self.graph:
+            if literal > 0 and component[literal] == component[-literal]:
+                logger.info(f'Atom {self.store.decode_literal(literal)} and its negation are ' +
+                            'in the same component')
+                negative = self.derive_unit(literal)
+                positive = self.derive_unit(-literal)
+                self.add_step(positive, negative, ())
+                return True
+        return False
@@ -1,71 +1,110 @@
 from logging import getLogger
 
 from src.model.formula_representation import *
-from src.core.resolution_info import UnifierInfo, ResolutionStep
-from src.util import recursively_substitute
+from src.core.clause_store import ClauseStore, EncodedClause
+from src.core.clause_selection import SymbolCount
+from src.core.resolution_info import UnifierInfo
+from src.core.substitution import Substitution
 
 logger = getLogger(__name__)
 
 
-# Short clauses are processed first, while repr ensures that right pairs are formed
-def short_first(ch: Token):
-    if isinstance(ch, Not):
-        ch = ch.children()[0]
-    return (len(ch.children()), repr(ch))
+# Short clauses are processed first, lighter ones first among them (weights are cached by
+# SymbolCount). Sort is stable, so clauses of the same length and weight keep their order
+def short_first(ch: Token, weight: SymbolCount):
+    literal = ch.children()[0] if isinstance(ch, Not) else ch
+    return (len(literal.children()), weight.atom_weight(ch))
 
 
 class Unification:
     # Check if two clauses can be unified to be *same*
-    # NOTE: this method doesn't substitute unifier, so it can give false positives
     @staticmethod
     def try_unify_to_same(a: Clause, b: Clause) -> (bool, list[UnifierInfo]):
         logger.debug(f'\t\t\tTrying to unify to same {a} and {b}')
-        if a == b:
-            return True, []
-        # Substitute constant instead of variable
-        if isinstance(a, Constant) and isinstance(b, Variable):
-            return True, [UnifierInfo(a, b)]
-        # Substitute constant or variable instead of Skolemov constant
-        if isinstance(a, Constant | Variable) and isinstance(b, SkolemovConstant):
-            return True, [UnifierInfo(a, b)]
-        # Substitute anything instead of Skolemov function
-        if isinstance(b, SkolemovFunction):
-            return True, [UnifierInfo(a, b)]
-        # Skolemov function, cases like a | f(b) | d -> a | b | c | d
-        if isinstance(a, NaryLogicalOp) and isinstance(b, NaryLogicalOp) and type(a) == type(b):
-            a_ch = set(a.children())
-            b_ch = set(b.children())
-            unique_a_ch = sorted(list(a_ch - b_ch), key=repr)
-            new_a = []
-            if len(unique_a_ch) == 0:
-                # len(unique_b_ch) > 0, because we've checked a == b already
+        subst = Unification.unify(a, b)
+        if subst is None:
+            return False, []
+        return True, subst.unifiers()
+
+    # Unifier that makes a and b same by substituting terms of a instead of terms of b, None if
+    # there is no one. Each position is bound by can_substitute in this direction only, and bound
+    # terms aren't followed, so bindings can't be chained through variables
+    @staticmethod
+    def unify(a: Token, b: Token) -> Substitution | None:
+        subst = Substitution()
+        stack = [(a, b)]
+        while len(stack) > 0:
+            a, b = stack.pop()
+            if a is b:
+                continue
+            if Unification.can_substitute(a, b):
+                bound = subst.bindings.get(b)
+                if bound is not None and bound is not a:
+                    return None
+                if Substitution.occurs(b, a):
+                    return None
+                subst.bind(b, a)
+            # Skolemov function, cases like a | f(b) | d -> a | b | c | d
+            elif isinstance(a, NaryLogicalOp) and type(a) == type(b):
+                a_ch = set(a.children())
+                b_ch = set(b.children())
+                unique_a_ch = sorted(list(a_ch - b_ch), key=repr)
+                unique_b_ch = sorted(list(b_ch - a_ch), key=repr)
                 # WARN: in theory, we can substitute a | f(x) | b -> a | False | b
-                return False, []
-            elif len(unique_a_ch) == 1:
-                new_a = unique_a_ch[0]
+                if len(unique_a_ch) == 0 or len(unique_b_ch) == 0:
+                    return None
+                stack.append((unique_a_ch[0] if len(unique_a_ch) == 1 else type(a)(unique_a_ch),
+                              unique_b_ch[0] if len(unique_b_ch) == 1 else type(b)(unique_b_ch)))
+            elif not isinstance(a, Atom) and a.stem_eq(b) and \
+                    len(a.children()) == len(b.children()):
+                stack += zip(a.children(), b.children())
             else:
-                new_a = type(a)(unique_a_ch)
-            unique_b_ch = sorted(list(b_ch - a_ch), key=repr)
-            new_b = []
-            if len(unique_b_ch) == 0:
-                return False, []
-            elif len(unique_b_ch) == 1:
-                new_b = unique_b_ch[0]
+                return None
+        return subst
+
+    # Unifier of complementary atoms: terms of a are substituted into b, or else terms of b into a
+    @staticmethod
+    def unify_either(a: Token, b: Token) -> Substitution | None:
+        subst = Unification.unify(a, b)
+        if subst is None:
+            subst = Unification.unify(b, a)
+        return subst
+
+    # Check if source can be substituted instead of dest (rules of unify).
+    # Skolemov terms are never substituted with each other
+    @staticmethod
+    def can_substitute(source: Token, dest: Token) -> bool:
+        if isinstance(dest, Variable):
+            return isinstance(source, Constant)
+        if isinstance(dest, SkolemovConstant):
+            return isinstance(source, Constant | Variable)
+        return isinstance(dest, SkolemovFunction) and \
+            not isinstance(source, SkolemovConstant | SkolemovFunction)
+
+    # Extend bindings (dest -> source) so that pattern becomes same as target.
+    # Unlike unification, target is not changed. Given bindings are copied, not modified
+    @staticmethod
+    def try_match(pattern: Token, target: Token, bindings: dict) -> dict | None:
+        bindings = dict(bindings)
+        stack = [(pattern, target)]
+        while len(stack) > 0:
+            pattern, target = stack.pop()
+            bound = bindings.get(pattern)
+            if bound is not None:
+                if bound is not target:
+                    return None
+                continue
+            if isinstance(pattern, Atom):
+                if pattern is not target and not Unification.can_substitute(target, pattern):
+                    return None
+                bindings[pattern] = target
+            elif Unification.can_substitute(target, pattern):
+                bindings[pattern] = target
+            elif pattern.stem_eq(target) and len(pattern.children()) == len(target.children()):
+                stack += reversed(list(zip(pattern.children(), target.children())))
             else:
-                new_b = type(b)(unique_b_ch)
-            return Unification.try_unify_to_same(new_a, new_b)
-        if a.stem_eq(b):
-            a_ch = a.children()
-            b_ch = b.children()
-            if len(a_ch) == len(b_ch):
-                replacements = []
-                for i in range(len(a_ch)):
-                    res, unif = Unification.try_unify_to_same(a_ch[i], b_ch[i])
-                    if not res:
-                        return False, []
-                    replacements += unif
-                return True, replacements
-        return False, []
+                return None
+        return bindings
 
     # Check if two clauses can be unified to be *shorten* by resolution, i. e. "resolved"
     # NOTE: still can give false positives
@@ -96,73 +135,33 @@ class Unification:
                         return True, unif
         return False, []
 
-    # Checks if two clauses are unified and returns resolved clause
+    # All resolvents of two encoded clauses (one for each complementary pair of literals)
     @staticmethod
-    def are_unified(a: Clause, b: Clause) -> (bool, (Clause | Clause) | Clause | None):
-        # a is negation of b, or vice versa
-        if isinstance(a, Not) and b == a.children()[0] or \
-                isinstance(b, Not) and a == b.children()[0]:
-            return True, None
-
-        # recursively go down
-        if isinstance(a, Or) or isinstance(b, Or):
-            a_ch = a.children() if isinstance(a, Or) else [a]
-            b_ch = b.children() if isinstance(b, Or) else [b]
-            for i in range(len(a_ch)):
-                for j in range(len(b_ch)):
-                    res, new_clause = Unification.are_unified(a_ch[i], b_ch[j])
-                    logger.debug(f'\t{a_ch[i]} and {b_ch[i]} are{'' if res else ' not'} unified, new clause: {new_clause}')
-                    if res:
-                        new_a_ch = a_ch[:]
-                        new_b_ch = b_ch[:]
-                        # if new_clause is None:
-                        del new_a_ch[i]
-                        del new_b_ch[j]
-                        if new_clause is None:
-                            pass
-                        elif new_clause is Clause:
-                            new_a_ch.append(new_clause)
-                        else:
-                            new_a_ch.append(new_clause[0])
-                            new_b_ch.append(new_clause[1])
-                        new_a = None
-                        new_b = None
-                        if len(new_a_ch) == 0:
-                            new_a = None
-                        elif len(new_a_ch) == 1:
-                            new_a = new_a_ch[0]
-                        else:
-                            new_a = Or(new_a_ch)
-                        if len(new_b_ch) == 0:
-                            new_b = None
-                        elif len(new_b_ch) == 1:
-                            new_b = new_b_ch[0]
-                        else:
-                            new_b = Or(new_b_ch)
+    def resolvents(store: ClauseStore, a: EncodedClause, b: EncodedClause):
+        # a contains negation of b's literal, or vice versa
+        b_literals = set(b)
+        for literal in a:
+            if -literal in b_literals:
+                yield ClauseStore.resolvent(a, b, literal), []
 
-                        if new_a is None:
-                            return True, new_b
-                        if new_b is None:
-                            return True, new_a
-                        return True, (new_a, new_b)
-        return False, None
+        for a_lit in a:
+            for b_lit in b:
+                if a_lit == -b_lit or not store.may_resolve(a_lit, b_lit):
+                    continue
+                subst = Unification.unify_either(store.atom(a_lit), store.atom(b_lit))
+                if subst is None:
+                    continue
+                # N-ary operations are unified as sets, so literals can still differ
+                new_a_lit = store.apply_literal(a_lit, subst)
+                if new_a_lit != -store.apply_literal(b_lit, subst):
+                    continue
+                yield ClauseStore.resolvent(store.apply(a, subst), store.apply(b, subst),
+                                            new_a_lit), subst.unifiers()
 
+    # Resolve two encoded clauses, return first resolvent and unifiers
     @staticmethod
-    def try_apply_resolution(clauses: list[Clause]) -> ResolutionStep | None:
-        clauses.sort(key=short_first)
-
-        for i in range(len(clauses)):
-            for j in range(i + 1, len(clauses)):
-                res, unif = Unification.try_resolve(clauses[i], clauses[j])
-                logger.info(f'{clauses[i]} and {clauses[j]} can{'' if res else 'not'} be unified, unifiers: {unif}')
-                if res:
-                    new_a = clauses[i]
-                    new_b = clauses[j]
-                    for source, dest in unif:
-                        new_a = recursively_substitute(new_a, source, dest)
-                        new_b = recursively_substitute(new_b, source, dest)
-                    are_unif, new_clause = Unification.are_unified(new_a, new_b)
-                    if are_unif:
-                        return ResolutionStep(clauses, i, j, new_clause, unif)
-        # No resolution can be applied
-        return None
+    def resolve_encoded(store: ClauseStore, a: EncodedClause,
+                        b: EncodedClause) -> (bool, EncodedClause | None, list[UnifierInfo]):
+        for new_clause, unif in Unification.resolvents(store, a, b):
+            return True, new_clause, unif
+        return False, None, []
@@ -0,0 +1,114 @@
+'''Renaming-invariant keys of clauses.
+
+Clauses are variants if they differ only in names of variables and order of literals (e. g.
+P(x) | Q(y) and Q(tmp7) | P(tmp3)). Only variables that are arguments of functions and predicates
+are renamed: variable that is a literal itself is a propositional letter. Variant key is the
+clause in canonical form: literals are sorted by their structure with variables erased, and then
+variables are numbered in order of first occurrence. Literals with the same structure can be
+ordered in different ways, so their orders are tried and the least key is taken (if there are
+too many orders, only one of them is used, then some variants may get different keys, but
+different clauses never get the same key).
+
+Keys are cached, so that variant detection is a single hash lookup.'''
+from itertools import permutations, product
+from math import factorial, prod
+from weakref import WeakKeyDictionary
+
+from src.model.formula_representation import *
+from src.core.limits import current_budget
+
+# Maximal number of literal orders tried for one clause
+MAX_ORDERS = 120
+
+# Marker of erased variable, less than labels of other Tokens
+ERASED = ('', )
+
+
+class VariantKey:
+    '''Canonical form with precomputed hash'''
+    __slots__ = ('key', '_hash')
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self._hash = hash(key)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return self._hash == other._hash and self.key == other.key
+
+
+_variant_keys = WeakKeyDictionary()
+
+
+# Variables that are not arguments of functions or predicates are propositional letters, so they
+# aren't renamed
+def letters(literals: list[Token]) -> set[Variable]:
+    result = set()
+    stack = list(literals)
+    while len(stack) > 0:
+        term = stack.pop()
+        if isinstance(term, Variable):
+            result.add(term)
+        elif not isinstance(term, FunctionOrPredicate):
+            stack += term.children()
+    return result
+
+
+# Preorder sequence of labels of Tokens; renamed variables are erased if numbers is None,
+# and numbered otherwise (numbers of new variables are added to it)
+def flatten(term: Token, kept: set[Variable], numbers: dict | None) -> tuple:
+    result = []
+    stack = [term]
+    while len(stack) > 0:
+        term = stack.pop()
+        if isinstance(term, Variable) and term not in kept:
+            result.append(ERASED if numbers is None else
+                          ('', numbers.setdefault(term, len(numbers))))
+        else:
+            result.append((type(term).__name__, repr(term.stem_key()), len(term.children())))
+            stack += reversed(term.children())
+    return tuple(result)
+
+
+def canonical_form(literals: list[Token]) -> tuple:
+    kept = letters(literals)
+    skeletons = {lit: flatten(lit, kept, None) for lit in literals}
+    literals = sorted(literals, key=skeletons.__getitem__)
+    # Groups of literals with the same structure
+    groups = []
+    for lit in literals:
+        if len(groups) > 0 and skeletons[groups[-1][0]] == skeletons[lit]:
+            groups[-1].append(lit)
+        else:
+            groups.append([lit])
+    if prod(factorial(len(group)) for group in groups) > MAX_ORDERS:
+        orders = [literals]
+    else:
+        orders = ([lit for group in order for lit in group]
+                  for order in product(*(permutations(group) for group in groups)))
+    forms = []
+    for order in orders:
+        numbers = dict()
+        forms.append(tuple(flatten(lit, kept, numbers) for lit in order))
+    return min(forms)
+
+
+def variant_key(clause: Clause) -> VariantKey:
+    key = _variant_keys.get(clause)
+    if key is None:
+        literals = list(dict.fromkeys(clause.children())) if isinstance(clause, Or) else [clause]
+        key = VariantKey(canonical_form(literals))
+        _variant_keys[clause] = key
+    return key
+
+
+# Clauses without variants of earlier ones
+def remove_variants(clauses: list[Clause]) -> list[Clause]:
+    unique = dict()
+    budget = current_budget()
+    for clause in clauses:
+        budget.check()
+        unique.setdefault(variant_key(clause), clause)
+    return list(unique.values())
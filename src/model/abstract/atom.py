@@ -2,6 +2,7 @@ from src.model.abstract.token import Token
 
 
 class Atom(Token):
+    __slots__ = ()
 
     # Atoms hve no stem
     def stem_eq(self, other) -> bool:
@@ -2,4 +2,4 @@ from src.model.abstract.symbol_template import SymbolTemplate
 
 
 class FunctionOrPredicate(SymbolTemplate):
-    pass
+    __slots__ = ()
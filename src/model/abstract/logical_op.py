@@ -1,9 +1,10 @@
 from collections.abc import Sequence
 
-from src.model.abstract.token import Token
+from src.model.abstract.token import Token, render
 
 
 class LogicalOp(Token):
+    __slots__ = ('operands', )
     unicode_repr = ''
     text_repr = ''
     operands_num = -1
@@ -13,7 +14,7 @@ class LogicalOp(Token):
         if self.operands_num >= 0:
             assert len(operands) == self.operands_num
 
-        self.operands = operands
+        self.operands = tuple(operands)
 
     def remove(self) -> Token:
         pass
@@ -21,17 +22,21 @@ class LogicalOp(Token):
     def children(self) -> Sequence[Token]:
         return self.operands
 
-    def replace_child(self, i: int, new_child: Token) -> Token:
-        new_ops = self.operands[:]
-        new_ops[i] = new_child
-        return type(self)(new_ops)
+    def with_children(self, children: Sequence[Token]) -> Token:
+        return type(self)(children)
 
     def __str__(self):
-        if len(self.operands) == 1:
-            return f'{self.unicode_repr}({self.operands[0]!s})'
-        return f' {self.unicode_repr} '.join(list(map(lambda op: f'({op!s})', self.operands)))
+        return render(self, str)
 
     def __repr__(self):
+        return render(self, repr)
+
+    # name(operand) or (operand1) name (operand2) name ...
+    def parts(self, representation) -> list:
+        name = self.unicode_repr if representation is str else self.text_repr
         if len(self.operands) == 1:
-            return f'{self.text_repr}({self.operands[0]!r})'
-        return f' {self.text_repr} '.join(list(map(lambda op: f'({op!r})', self.operands)))
+            return [f'{name}(', self.operands[0], ')']
+        result = []
+        for op in self.operands:
+            result += ['(' if len(result) == 0 else f') {name} (', op]
+        return result + [')'] if len(result) > 0 else result
@@ -3,6 +3,7 @@ from src.model.abstract.logical_op import LogicalOp
 
 
 class NaryLogicalOp(LogicalOp):
+    __slots__ = ()
 
     def merge(self) -> Token:
         return self
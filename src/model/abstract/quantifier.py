@@ -1,10 +1,11 @@
 from collections.abc import Sequence
 
-from src.model.abstract.token import Token
+from src.model.abstract.token import Token, render
 from src.model.concrete.variable import Variable
 
 
 class Quantifier(Token):
+    __slots__ = ('var', 'body')
     unicode_repr = ''
     text_repr = ''
 
@@ -18,16 +19,23 @@ class Quantifier(Token):
         pass
 
     def children(self) -> Sequence[Token]:
-        return [self.body]
+        return (self.body, )
 
     def __str__(self):
-        return f'{self.unicode_repr}{self.var} ({self.body})'
+        return render(self, str)
 
     def __repr__(self):
-        return f'{self.text_repr} {repr(self.var)} ({repr(self.body)})'
+        return render(self, repr)
 
-    def replace_child(self, i: int, new_child: Token) -> Token:
-        return type(self)(self.var, new_child)
+    def parts(self, representation) -> list:
+        name = self.unicode_repr if representation is str else f'{self.text_repr} '
+        return [name, self.var, ' (', self.body, ')']
+
+    def with_children(self, children: Sequence[Token]) -> Token:
+        return type(self)(self.var, children[0])
+
+    def stem_key(self):
+        return self.var
 
     def rename_var(self, new_var: Variable) -> Token:
         return type(self)(new_var, self.body)
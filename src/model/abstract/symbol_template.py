@@ -1,9 +1,10 @@
 from collections.abc import Sequence
 
-from src.model.abstract.token import Token
+from src.model.abstract.token import Token, render
 
 
 class SymbolTemplate(Token):
+    __slots__ = ('args', )
     unicode_repr = ''
     text_repr = ''
     num_args = -1
@@ -11,18 +12,22 @@ class SymbolTemplate(Token):
     def __init__(self, args: Sequence[Token]):
         if self.num_args >= 0:
             assert len(args) == self.num_args
-        self.args = args
+        self.args = tuple(args)
 
     def children(self):
         return self.args
 
-    def replace_child(self, i: int, new_child: Token) -> Token:
-        new_args = self.args[:]
-        new_args[i] = new_child
-        return type(self)(new_args)
+    def with_children(self, children: Sequence[Token]) -> Token:
+        return type(self)(children)
 
     def __str__(self):
-        return f'{self.unicode_repr}({', '.join(list(map(str, self.args)))})'
+        return render(self, str)
 
     def __repr__(self):
-        return f'{self.text_repr}({', '.join(list(map(repr, self.args)))})'
+        return render(self, repr)
+
+    def parts(self, representation) -> list:
+        result = [f'{self.unicode_repr if representation is str else self.text_repr}(']
+        for i, arg in enumerate(self.args):
+            result += [arg] if i == 0 else [', ', arg]
+        return result + [')']
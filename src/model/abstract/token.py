@@ -1,8 +1,30 @@
 from collections.abc import Sequence
 
+from src.model.hash_consing import TokenMeta
 
-# Base class for all that can appear in formula
-class Token:
+
+# String representation (representation is str or repr) that is built without recursion
+def render(token, representation) -> str:
+    pieces = []
+    stack = [token]
+    while len(stack) > 0:
+        piece = stack.pop()
+        if isinstance(piece, str):
+            pieces.append(piece)
+            continue
+        parts = piece.parts(representation)
+        if parts is None:
+            pieces.append(representation(piece))
+        else:
+            stack += reversed(parts)
+    return ''.join(pieces)
+
+
+# Base class for all that can appear in formula.
+# Tokens are hash-consed (see hash_consing.py), so structurally equal Tokens are the same object.
+# Therefore Tokens are immutable: transformations build new Tokens with with_children()
+class Token(metaclass=TokenMeta):
+    __slots__ = ('_hash', '_id', '__weakref__')
     has_axioms = False
 
     def __str__(self):
@@ -11,23 +33,42 @@ class Token:
     def __repr__(self):
         raise NotImplementedError(f'Unknown token: {type(self)}')
 
+    # Pieces of representation: strings and children (they are rendered the same way), see render.
+    # None if Token renders itself (__str__ and __repr__ are overriden)
+    def parts(self, representation) -> list | None:
+        return None
+
     # Get all children Tokens
     def children(self) -> Sequence:
-        return []
+        return ()
+
+    # Build Token of the same kind with all children replaced at once
+    def with_children(self, children: Sequence):
+        return self
 
     # Replace child token
     def replace_child(self, num: int, new_child):
-        pass
+        children = list(self.children())
+        children[num] = new_child
+        return self.with_children(children)
+
+    # Everything that distinguishes Tokens of the same type, except for children
+    def stem_key(self):
+        return None
 
     def __eq__(self, other):
-        return type(self) == type(other) and self.children() == other.children()
+        return self is other
 
     # Tokens themselves are equal, children may differ
     def stem_eq(self, other):
         return type(self) == type(other)
 
     def __hash__(self):
-        return hash(str(self))
+        return self._hash
+
+    # Unique number of this Token, stable while it is alive
+    def get_id(self) -> int:
+        return self._id
 
     # Remove all kinds of redundancy (depending on type)
     def remove_redundancy(self):
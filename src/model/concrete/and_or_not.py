@@ -8,6 +8,7 @@ from src.model.concrete.constant import Constant, CONSTANT_TRUE, CONSTANT_FALSE
 
 
 class And(NaryLogicalOp):
+    __slots__ = ()
     unicode_repr = '&'
     text_repr = 'and'
 
@@ -40,8 +41,9 @@ class And(NaryLogicalOp):
             return And(new_ops)
 
         # A and not A <=> F
+        operands = set(self.operands)
         for op in self.operands:
-            if not isinstance(op, Not) and Not([op]) in self.operands:
+            if not isinstance(op, Not) and Not([op]) in operands:
                 return CONSTANT_FALSE
 
         # Single operand
@@ -52,6 +54,7 @@ class And(NaryLogicalOp):
 
 
 class Or(NaryLogicalOp):
+    __slots__ = ()
     unicode_repr = '∨'
     text_repr = 'or'
 
@@ -73,7 +76,7 @@ class Or(NaryLogicalOp):
             if isinstance(op, And):
                 new_ops = []
                 for and_op in op.children():
-                    new_or_ops = self.operands[:]
+                    new_or_ops = list(self.operands)
                     new_or_ops[i] = and_op
                     new_ops.append(Or(new_or_ops))
                 return And(new_ops)
@@ -97,8 +100,9 @@ class Or(NaryLogicalOp):
             return Or(new_ops)
 
         # A or not A <=> T
+        operands = set(self.operands)
         for op in self.operands:
-            if not isinstance(op, Not) and Not([op]) in self.operands:
+            if not isinstance(op, Not) and Not([op]) in operands:
                 return CONSTANT_TRUE
 
         # Single operand
@@ -109,6 +113,7 @@ class Or(NaryLogicalOp):
 
 
 class Not(LogicalOp):
+    __slots__ = ()
     unicode_repr = '¬'
     text_repr = 'not'
     operands_num = 1
@@ -1,10 +1,10 @@
 from typing import Any
 
-from src.model.abstract.token import Token
 from src.model.abstract.atom import Atom
 
 
 class Constant(Atom):
+    __slots__ = ('value', )
 
     def __init__(self, value: Any):
         self.value = value
@@ -15,10 +15,13 @@ class Constant(Atom):
     def __repr__(self):
         return f'c_{repr(self.value)}'
 
-    def __eq__(self, other):
-        return isinstance(other, Constant) and self.value == other.value
-
-    __hash__ = Token.__hash__
+    def stem_key(self):
+        # Constants are compared by value, but True and 1 are different constants
+        try:
+            hash(self.value)
+        except TypeError:
+            return (type(self.value), repr(self.value))
+        return (type(self.value), self.value)
 
     def get_value(self) -> Any:
         return self.value
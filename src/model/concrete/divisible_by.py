@@ -7,6 +7,7 @@ from src.model.concrete.multiply import Multiply
 
 
 class DivisibleBy(FunctionOrPredicate):
+    __slots__ = ()
     unicode_repr = '⋮'
     text_repr = 'divby'
     has_axioms = True
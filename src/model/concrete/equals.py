@@ -3,6 +3,7 @@ from src.model.concrete.constant import Constant
 
 
 class Equals(FunctionOrPredicate):
+    __slots__ = ()
     unicode_repr = '='
     text_repr = 'equals'
     has_axioms = True
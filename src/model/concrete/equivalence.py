@@ -5,6 +5,7 @@ from src.model.concrete.implication import Implication
 
 
 class Equivalence(LogicalOp):
+    __slots__ = ()
     unicode_repr = '↔'
     text_repr = 'equiv'
 
@@ -12,6 +12,7 @@ logger = getLogger(__name__)
 
 
 class Exists(Quantifier):
+    __slots__ = ()
     unicode_repr = '∃'
     text_repr = 'exists'
 
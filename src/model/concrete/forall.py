@@ -4,6 +4,7 @@ from src.model.abstract.quantifier import Quantifier
 
 class Forall(Quantifier):
     '''Universal quantifier'''
+    __slots__ = ()
     unicode_repr = '∀'
     text_repr = 'forall'
 
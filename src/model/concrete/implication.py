@@ -4,6 +4,7 @@ from src.model.concrete.and_or_not import Or, Not
 
 
 class Implication(LogicalOp):
+    __slots__ = ()
     unicode_repr = '→'
     text_repr = 'implies'
 
@@ -1,12 +1,13 @@
 from collections.abc import Sequence
 
-from src.model.abstract.token import Token
+from src.model.abstract.token import Token, render
 from src.model.concrete.and_or_not import And
 from src.model.concrete.constant import Constant
 
 
 class ImplicationSign(Token):
     '''Implication that should be proved'''
+    __slots__ = ('left', 'right')
 
     def __init__(self, left: Token | Sequence[Token] | None, right: Token | Sequence[Token]):
 
@@ -24,15 +25,16 @@ class ImplicationSign(Token):
         self.right = convert_side(right)
 
     def children(self):
-        return [self.left, self.right]
+        return (self.left, self.right)
 
-    def replace_child(self, i: int, new_child: Token) -> Token:
-        if i == 0:
-            return ImplicationSign(new_child, self.right)
-        return ImplicationSign(self.left, new_child)
+    def with_children(self, children: Sequence[Token]) -> Token:
+        return ImplicationSign(children[0], children[1])
 
     def __str__(self):
-        return f'{self.left!s} => {self.right!s}'
+        return render(self, str)
 
     def __repr__(self):
-        return f'{self.left!r} Implies {self.right!r}'
+        return render(self, repr)
+
+    def parts(self, representation) -> list:
+        return [self.left, ' => ' if representation is str else ' Implies ', self.right]
@@ -4,6 +4,7 @@ from src.model.concrete.and_or_not import Or, Not
 
 
 class PierceArrow(LogicalOp):
+    __slots__ = ()
     unicode_repr = '↓'
     text_repr = 'nor'
 
@@ -4,6 +4,7 @@ from src.model.concrete.and_or_not import And, Not
 
 
 class ShefferStroke(LogicalOp):
+    __slots__ = ()
     unicode_repr = '↑'
     text_repr = 'nand'
 
@@ -1,18 +1,17 @@
-from src.model.abstract.token import Token
 from src.model.abstract.atom import Atom
+from src.model.fresh_names import fresh_name, reset_names
 
 
 class SkolemovConstant(Atom):
-    counter = 0
+    __slots__ = ('name', )
 
     # For testing purposes only
     @staticmethod
     def reset_counter():
-        SkolemovConstant.counter = 0
+        reset_names('c')
 
     def __init__(self):
-        self.name = 'c' + str(SkolemovConstant.counter)
-        SkolemovConstant.counter += 1
+        self.name = fresh_name('c')
 
     def __str__(self):
         return self.name
@@ -20,7 +19,5 @@ class SkolemovConstant(Atom):
     def __repr__(self):
         return f'sc_{repr(self.name)}'
 
-    def __eq__(self, other):
-        return isinstance(other, SkolemovConstant) and self.name == other.name
-
-    __hash__ = Token.__hash__
+    def stem_key(self):
+        return self.name
@@ -3,15 +3,16 @@ from collections.abc import Sequence
 from src.model.abstract.token import Token
 from src.model.abstract.function_or_predicate import FunctionOrPredicate
 from src.model.concrete.variable import Variable
+from src.model.fresh_names import fresh_name, reset_names
 
 
 class SkolemovFunction(FunctionOrPredicate):
-    counter = 0
+    __slots__ = ('unicode_repr', 'text_repr')
 
     # For testing purposes only
     @staticmethod
     def reset_counter():
-        SkolemovFunction.counter = 0
+        reset_names('f')
 
     def __init__(self, args: Sequence[Variable], name: str = ""):
         assert isinstance(args, Sequence)
@@ -19,15 +20,15 @@ class SkolemovFunction(FunctionOrPredicate):
         if len(name) > 0:
             self.unicode_repr = name
         else:
-            self.unicode_repr = 'f' + str(SkolemovFunction.counter)
-            SkolemovFunction.counter += 1
+            self.unicode_repr = fresh_name('f')
         self.text_repr = f'sf_{self.unicode_repr}'
-        self.args = args[:]
+        self.args = tuple(args)
 
-    def replace_child(self, i: int, new_ch: Token):
-        new_args = self.args[:]
-        new_args[i] = new_ch
-        return SkolemovFunction(new_args, self.unicode_repr)
+    def with_children(self, children: Sequence[Token]) -> Token:
+        return SkolemovFunction(children, self.unicode_repr)
+
+    def stem_key(self):
+        return self.unicode_repr
 
     def get_args(self) -> Sequence[Variable]:
         return self.args
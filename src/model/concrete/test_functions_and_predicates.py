@@ -5,6 +5,7 @@ from src.model.concrete.constant import Constant, CONSTANT_TRUE, CONSTANT_FALSE
 
 class IsTrue(FunctionOrPredicate):
     '''Function S(x) = x for propositional variables'''
+    __slots__ = ()
     unicode_repr = 'IsTrue'
     text_repr = 'p_IsTrue'
     num_args = 1
@@ -1,20 +1,18 @@
-from src.model.abstract.token import Token
 from src.model.abstract.atom import Atom
+from src.model.fresh_names import fresh_name, reset_names
 
 
 class Variable(Atom):
-    counter = 0
+    __slots__ = ('name', )
 
     # For testing purposes only
     @staticmethod
     def reset_counter():
-        Variable.counter = 0
+        reset_names('tmp')
 
     @staticmethod
     def new_name():
-        name = 'tmp' + str(Variable.counter)
-        Variable.counter += 1
-        return name
+        return fresh_name('tmp')
 
     def __init__(self, name: str):
         self.name = name
@@ -25,10 +23,8 @@ class Variable(Atom):
     def __repr__(self):
         return f'v_{self.name}'
 
-    def __eq__(self, other):
-        return isinstance(other, Variable) and self.name == other.name
-
-    __hash__ = Token.__hash__
+    def stem_key(self):
+        return self.name
 
     def get_name(self):
         return self.name
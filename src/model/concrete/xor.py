@@ -5,6 +5,7 @@ from src.model.concrete.equivalence import Equivalence
 
 
 class Xor(LogicalOp):
+    __slots__ = ()
     unicode_repr = '⊕'
     text_repr = 'xor'
 
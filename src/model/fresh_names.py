@@ -0,0 +1,44 @@
+'''Fresh names of renamed variables, Skolemov constants and Skolemov functions.
+
+Names are numbered separately for each prefix ('tmp0', 'c0', 'f0', ...). Counters are kept in the
+current FreshNames, which is a context variable: each proof sets its own one (see ProofContext), so
+proofs don't share counters, even if they run in different threads. Outside of proofs the default
+FreshNames of the process is used.'''
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class FreshNames:
+    '''Counters of names, by prefix'''
+
+    def __init__(self):
+        self.counters = dict()
+
+    def new(self, prefix: str) -> str:
+        number = self.counters.get(prefix, 0)
+        self.counters[prefix] = number + 1
+        return prefix + str(number)
+
+    def reset(self, prefix: str) -> None:
+        self.counters.pop(prefix, None)
+
+
+_current = ContextVar('fresh_names', default=FreshNames())
+
+
+def fresh_name(prefix: str) -> str:
+    return _current.get().new(prefix)
+
+
+def reset_names(prefix: str) -> None:
+    _current.get().reset(prefix)
+
+
+# Names are generated with given counters inside of with-block
+@contextmanager
+def use_names(names: FreshNames):
+    token = _current.set(names)
+    try:
+        yield names
+    finally:
+        _current.reset(token)
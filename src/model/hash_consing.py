@@ -0,0 +1,39 @@
+'''Hash-consing of Tokens: each structurally distinct subterm exists only once'''
+from itertools import count
+from threading import Lock
+from weakref import WeakValueDictionary
+
+
+class TermTable:
+    '''Weak table of all live Tokens, keyed by (type, stem, children)'''
+
+    def __init__(self):
+        self.table = WeakValueDictionary()
+        self.ids = count()
+        # Two threads must not add different instances of the same Token
+        self.lock = Lock()
+
+    def intern(self, token):
+        # Children are interned already, so hashing and comparing the key is O(number of children)
+        key = (type(token), token.stem_key(), tuple(token.children()))
+        with self.lock:
+            existing = self.table.get(key)
+            if existing is not None:
+                return existing
+            token._hash = hash(key)
+            token._id = next(self.ids)
+            self.table[key] = token
+        return token
+
+    def __len__(self):
+        return len(self.table)
+
+
+TERM_TABLE = TermTable()
+
+
+class TokenMeta(type):
+    '''Metaclass that replaces every newly constructed Token with its canonical instance'''
+
+    def __call__(cls, *args, **kwargs):
+        return TERM_TABLE.intern(super().__call__(*args, **kwargs))
@@ -1,5 +1,12 @@
 import ply.lex as lex
 
+
+# Formula string can't be parsed (raised instead of exiting, so that callers that prove many
+# formulas can report it and go on)
+class ParseError(ValueError):
+    pass
+
+
 ascii_ops = {
     'exists': 'EXISTS',
     'forall': 'FORALL',
@@ -66,8 +73,7 @@ t_ignore = ' \t'
 
 
 def t_error(t):
-    print(f'Illegal character \'{t.value[0]}\'')
-    t.lexer.skip(1)
+    raise ParseError(f'Illegal character \'{t.value[0]}\'')
 
 
 lexer = lex.lex()
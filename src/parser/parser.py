@@ -1,7 +1,9 @@
 import ply.yacc as yacc
+from ast import literal_eval
 from sys import argv
+from threading import Lock
 
-from src.parser.lexer import tokens
+from src.parser.lexer import tokens, ParseError
 from src.model.formula_representation import *
 '''
 formula : formula_side IMPLICATION_SIGN formula_side
@@ -232,7 +234,11 @@ def p_atom_variable(p):
 
 def p_atom_constant(p):
     'atom : CONSTANT'
-    p[0] = Constant(eval(p[1]))
+    # Only Python literals, so that formulas from network can't run code
+    try:
+        p[0] = Constant(literal_eval(p[1]))
+    except (ValueError, SyntaxError):
+        raise ParseError(f'Constant is not a literal: {p[1]}')
 
 
 def p_empty(p):
@@ -241,15 +247,25 @@ def p_empty(p):
 
 
 def p_error(p):
-    print(f'Syntax error: {p}')
-    exit(1)
+    if p is None:
+        raise ParseError('Syntax error: unexpected end of formula')
+    raise ParseError(f'Syntax error: {p}')
 
 
 parser = yacc.yacc()
 
+# PLY parser keeps its state in itself, so threads take turns
+parser_lock = Lock()
+
+
+def parse(formula_str: str) -> Token:
+    with parser_lock:
+        return parser.parse(formula_str)
+
+
 if __name__ == '__main__':
     if len(argv) > 1:
-        result = parser.parse(' '.join(argv[1:]))
+        result = parse(' '.join(argv[1:]))
         print(repr(result))
     else:
         while True:
@@ -259,5 +275,9 @@ if __name__ == '__main__':
                 break
             if not s:
                 continue
-            result = parser.parse(s)
+            try:
+                result = parse(s)
+            except ParseError as e:
+                print(e)
+                continue
             print(repr(result))
@@ -0,0 +1,127 @@
+'''Racing several strategies (configurations of Resolution) on the same formula.
+
+Each strategy is proved in its own process. The first proof wins and the other processes are
+terminated; if no strategy proves formula, all of them are waited for. Portfolio of strategies is
+read from TOML or JSON file with list of tables "strategy": each has a name, other keys are options
+of Resolution (see STRATEGY_OPTIONS). Wins of strategies can be accumulated in a JSON file to tune
+the portfolio.'''
+from collections import namedtuple
+from json import load, dump
+from multiprocessing import Process, Queue
+from os import replace
+from pathlib import Path
+from queue import Empty
+from time import perf_counter
+from tomllib import load as load_toml
+
+from src.batch import prove, ERROR
+from src.core.resolution import PROVED, UNPROVED, RESOURCE_OUT
+from src.core.limits import Limits
+
+DEFAULT_PORTFOLIO = Path(__file__).parent / 'config' / 'portfolio.toml'
+
+STRATEGY_OPTIONS = ['weight', 'pick_ratio', 'clausifier', 'engine', 'set_of_support']
+
+# Status of strategy that was terminated, because another one has proved formula
+CANCELLED = 'cancelled'
+
+# Result reported if no strategy proves formula, best first
+STATUS_ORDER = [PROVED, UNPROVED, RESOURCE_OUT, ERROR]
+
+# Seconds between checks that strategies are alive
+POLL_INTERVAL = 0.1
+
+Strategy = namedtuple('Strategy', ['name', 'options'])
+
+
+def load_portfolio(path: str | Path = DEFAULT_PORTFOLIO) -> list[Strategy]:
+    path = Path(path)
+    with open(path, 'rb') as file:
+        config = load(file) if path.suffix == '.json' else load_toml(file)
+    strategies = []
+    for table in config.get('strategy', []):
+        options = dict(table)
+        name = options.pop('name', f'strategy{len(strategies)}')
+        unknown = set(options) - set(STRATEGY_OPTIONS)
+        if len(unknown) > 0:
+            raise ValueError(f'Unknown options of strategy {name}: {", ".join(sorted(unknown))}')
+        strategies.append(Strategy(name, options))
+    if len(strategies) == 0:
+        raise ValueError(f'No strategies in {path}')
+    if len({strategy.name for strategy in strategies}) < len(strategies):
+        raise ValueError(f'Names of strategies in {path} are not unique')
+    return strategies
+
+
+def run_strategy(formula_str: str, line: int, strategy: Strategy, limits: Limits,
+                 results: Queue) -> None:
+    result = prove(formula_str, line, limits=limits, **strategy.options)
+    result['strategy'] = strategy.name
+    results.put(result)
+
+
+# Result of the winning strategy (or of the best one if formula isn't proved) with time of the whole
+# race, name of the winner (None if formula isn't proved) and statuses of all strategies
+def race(formula_str: str, strategies: list[Strategy], line: int = 0,
+         limits: Limits = Limits()) -> dict:
+    start = perf_counter()
+    results = Queue()
+    processes = [Process(target=run_strategy, args=(formula_str, line, strategy, limits, results),
+                         daemon=True) for strategy in strategies]
+    for process in processes:
+        process.start()
+    finished = []
+    try:
+        while len(finished) < len(processes):
+            try:
+                result = results.get(timeout=POLL_INTERVAL)
+            except Empty:
+                # Strategy can die without result (e. g. it's killed when out of memory)
+                if not any(process.is_alive() for process in processes) and results.empty():
+                    break
+                continue
+            finished.append(result)
+            if result['status'] == PROVED:
+                break
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+    statuses = {strategy.name: CANCELLED for strategy in strategies}
+    statuses.update({result['strategy']: result['status'] for result in finished})
+    if len(finished) == 0:
+        best = {'line': line, 'formula': formula_str, 'status': ERROR, 'strategy': None,
+                'error': 'all strategies died'}
+    else:
+        best = min(finished, key=lambda result: STATUS_ORDER.index(result['status']))
+    winner = best['strategy'] if best['status'] == PROVED else None
+    return dict(best, time=perf_counter() - start, winner=winner, strategies=statuses)
+
+
+class WinStatistics:
+    '''Number of races and wins (and total time of won races) of each strategy, kept in a JSON
+    file'''
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.stats = dict()
+        if self.path.exists():
+            with open(self.path) as file:
+                self.stats = load(file)
+
+    def record(self, result: dict) -> None:
+        for name in result['strategies']:
+            stats = self.stats.setdefault(name, {'races': 0, 'wins': 0, 'win_time': 0.0})
+            stats['races'] += 1
+            if name == result['winner']:
+                stats['wins'] += 1
+                stats['win_time'] += result['time']
+
+    # File is replaced at once, so that it's never left half-written
+    def save(self) -> None:
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as file:
+            dump(self.stats, file, indent=2)
+        replace(tmp_path, self.path)
@@ -0,0 +1,205 @@
+'''Prover daemon: proves formulas sent over HTTP on localhost or on a Unix socket.
+
+Parser tables, the model and worker processes are created once when the server starts, so a request
+costs only its proof, not the start of interpreter. POST /prove takes a JSON object with "formula",
+optional "options" (see STRATEGY_OPTIONS) and optional "limits" (fields of Limits, they can only
+tighten the limits of the server); the answer is the result of batch.prove. GET /health answers
+{"status": "ok"}. Connections are kept alive, so a client can send many requests over one.'''
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import loads, dumps
+from logging import getLogger
+from numbers import Real
+from os import unlink
+from pathlib import Path
+from socketserver import ThreadingUnixStreamServer
+from threading import Lock
+
+from src.batch import prove, ERROR
+from src.core.limits import Limits
+from src.core.resolution import CLAUSIFIERS, ENGINES
+from src.core.clause_selection import WEIGHT_FUNCTIONS
+from src.portfolio import STRATEGY_OPTIONS
+
+logger = getLogger(__name__)
+
+# Proved by each worker when it starts, so that the first request isn't slower than the rest
+WARM_UP_FORMULA = '(x) -> (y) (x) => y'
+
+# Biggest body of request, bytes
+MAX_BODY = 1 << 20
+
+# Allowed values of options that are names (see Resolution)
+OPTION_CHOICES = {
+    'engine': ENGINES,
+    'clausifier': CLAUSIFIERS,
+    'weight': list(WEIGHT_FUNCTIONS),
+}
+
+
+class RequestError(ValueError):
+    '''Request that can't be proved: body isn't a JSON object, formula is missing, etc.'''
+
+
+def warm_up() -> None:
+    prove(WARM_UP_FORMULA)
+
+
+# Formula and options of Resolution (with limits) from body of request
+def read_request(body: bytes, limits: Limits) -> tuple[str, dict]:
+    try:
+        request = loads(body)
+    except ValueError as e:
+        raise RequestError(f'Body is not JSON: {e}')
+    if not isinstance(request, dict):
+        raise RequestError('Body is not a JSON object')
+    unknown = set(request) - {'formula', 'options', 'limits'}
+    if len(unknown) > 0:
+        raise RequestError(f'Unknown fields: {", ".join(sorted(unknown))}')
+    formula_str = request.get('formula')
+    if not isinstance(formula_str, str) or len(formula_str.strip()) == 0:
+        raise RequestError('Field "formula" must be a non-empty string')
+    options = request.get('options', {})
+    if not isinstance(options, dict):
+        raise RequestError('Field "options" must be a JSON object')
+    unknown = set(options) - set(STRATEGY_OPTIONS)
+    if len(unknown) > 0:
+        raise RequestError(f'Unknown options: {", ".join(sorted(unknown))}')
+    for name, value in options.items():
+        if name in OPTION_CHOICES and value not in OPTION_CHOICES[name]:
+            raise RequestError(
+                f'Option "{name}" must be one of: {", ".join(OPTION_CHOICES[name])}')
+    pick_ratio = options.get('pick_ratio', 0)
+    if isinstance(pick_ratio, bool) or not isinstance(pick_ratio, int) or pick_ratio < 0:
+        raise RequestError('Option "pick_ratio" must be a non-negative integer')
+    if not isinstance(options.get('set_of_support', False), bool):
+        raise RequestError('Option "set_of_support" must be true or false')
+    request_limits = request.get('limits', {})
+    if not isinstance(request_limits, dict):
+        raise RequestError('Field "limits" must be a JSON object')
+    unknown = set(request_limits) - set(Limits._fields)
+    if len(unknown) > 0:
+        raise RequestError(f'Unknown limits: {", ".join(sorted(unknown))}')
+    for name, value in request_limits.items():
+        if value is not None and (isinstance(value, bool) or not isinstance(value, Real)):
+            raise RequestError(f'Limit "{name}" must be a number or null')
+    # Request can't lift limits of the server, so the smaller value of each limit is taken
+    tightened = {name: value if getattr(limits, name) is None else min(value, getattr(limits, name))
+                 for name, value in request_limits.items() if value is not None}
+    return formula_str.strip(), dict(options, limits=limits._replace(**tightened))
+
+
+class Prover:
+    '''Proves formulas in a pool of warm worker processes, or in the calling thread if there are
+    no jobs'''
+
+    def __init__(self, jobs: int = 0, limits: Limits = Limits(), **options):
+        self.jobs = jobs
+        self.limits = limits
+        self.options = options
+        self.pool = None
+        self.pool_lock = Lock()
+        if jobs > 0:
+            self.pool = self.start_pool()
+        else:
+            warm_up()
+
+    def start_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(self.jobs, initializer=warm_up)
+        # Workers are started lazily, make them start now
+        for future in [pool.submit(warm_up) for _ in range(self.jobs)]:
+            future.result()
+        return pool
+
+    def prove(self, formula_str: str, options: dict) -> dict:
+        options = dict(self.options, **options)
+        pool = self.pool
+        if pool is None:
+            return prove(formula_str, **options)
+        try:
+            return pool.submit(prove, formula_str, **options).result()
+        except BrokenProcessPool:
+            # Worker was killed (e. g. when out of memory) and the whole pool can't be used anymore
+            with self.pool_lock:
+                if self.pool is pool:
+                    logger.warning('Worker process died, restarting pool')
+                    pool.shutdown(wait=False)
+                    self.pool = self.start_pool()
+            return {'line': 0, 'formula': formula_str, 'status': ERROR,
+                    'error': 'worker process died'}
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+
+class ProverHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, with Nagle's algorithm the body waits for ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path != '/health':
+            self.send_json(HTTPStatus.NOT_FOUND, {'error': f'No such path: {self.path}'})
+            return
+        self.send_json(HTTPStatus.OK, {'status': 'ok'})
+
+    def do_POST(self):
+        if self.path != '/prove':
+            self.send_json(HTTPStatus.NOT_FOUND, {'error': f'No such path: {self.path}'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY:
+            # Body isn't read, so the rest of connection can't be parsed
+            self.close_connection = True
+            status = HTTPStatus.BAD_REQUEST if length < 0 else HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+            self.send_json(status, {'error': f'Body must be at most {MAX_BODY} bytes'})
+            return
+        prover = self.server.prover
+        try:
+            formula_str, options = read_request(self.rfile.read(length), prover.limits)
+        except RequestError as e:
+            self.send_json(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+            return
+        self.send_json(HTTPStatus.OK, prover.prove(formula_str, options))
+
+    def send_json(self, status: HTTPStatus, body: dict) -> None:
+        data = dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    # Client address of Unix socket is empty, so it isn't logged
+    def log_message(self, format, *args):
+        logger.info(format, *args)
+
+
+class ProverServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], prover: Prover):
+        self.prover = prover
+        super().__init__(address, ProverHandler)
+
+
+class UnixProverServer(ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str | Path, prover: Prover):
+        self.prover = prover
+        self.path = Path(path)
+        # Socket file is left if previous server was killed
+        if self.path.is_socket():
+            unlink(self.path)
+        super().__init__(str(self.path), ProverHandler)
+
+    def server_close(self):
+        super().server_close()
+        self.path.unlink(missing_ok=True)
@@ -8,21 +8,29 @@ from src.model.concrete.variable import Variable
 logger = getLogger(__name__)
 
 
+# Traversals use explicit stacks instead of recursion, so that depth of formula is not limited by
+# recursion limit
+
 def recursive_search(formula: Token, pred) -> bool:
-    if pred(formula):
-        return True
-    for ch in formula.children():
-        if recursive_search(ch, pred):
+    stack = [formula]
+    while len(stack) > 0:
+        formula = stack.pop()
+        if pred(formula):
             return True
+        stack += formula.children()
     return False
 
 
+# Subformulas that satisfy pred (their subformulas aren't checked), in preorder
 def recursive_filter(formula: Token, pred) -> list[Token]:
-    if pred(formula):
-        return [formula]
     result = []
-    for ch in formula.children():
-        result += recursive_filter(ch, pred)
+    stack = [formula]
+    while len(stack) > 0:
+        formula = stack.pop()
+        if pred(formula):
+            result.append(formula)
+        else:
+            stack += reversed(formula.children())
     return result
 
 
@@ -30,37 +38,111 @@ def recursive_instances(formula: Token, type_) -> list[Token]:
     return recursive_filter(formula, lambda f: isinstance(f, type_))
 
 
-def recursively_transform_children(formula: Token, op) -> Token:
-    formula = op(formula)
+# Returned by op of transform_top_down instead of context if children shouldn't be transformed
+SKIP_CHILDREN = object()
+
+
+# Transform formula top-down: op(node, context) -> (new node, context for its children) is applied
+# to each node before its children (in preorder, so op can collect state), then children of the
+# new node are transformed. Formula is rebuilt bottom-up as in transform_children
+def transform_top_down(formula: Token, op, context=None) -> Token:
+    formula, context = op(formula, context)
+    if context is SKIP_CHILDREN:
+        return formula
+    # Frames: node, context for its children, transformed children
+    stack = [(formula, context, [])]
+    while True:
+        formula, context, new_children = stack[-1]
+        children = formula.children()
+        if len(new_children) < len(children):
+            child, child_context = op(children[len(new_children)], context)
+            if child_context is SKIP_CHILDREN or len(child.children()) == 0:
+                new_children.append(child)
+            else:
+                stack.append((child, child_context, []))
+            continue
+        stack.pop()
+        if any(new_ch is not ch for new_ch, ch in zip(new_children, children)):
+            formula = formula.with_children(new_children)
+        if len(stack) == 0:
+            return formula
+        stack[-1][2].append(formula)
 
-    new_children = list(map(lambda f: recursively_transform_children(f, op), formula.children()))
-    for i in range(len(new_children)):
-        formula = formula.replace_child(i, new_children[i])
-    return formula
 
+def recursively_transform_children(formula: Token, op) -> Token:
+    return transform_top_down(formula, lambda f, _: (op(f), None))
 
+
+# Formula is rebuilt only if some child has changed (tokens are hash-consed, so unchanged child is
+# the same object), otherwise it's returned as is
 def transform_children(formula: Token, op) -> Token:
-    new_children = list(map(op, formula.children()))
-    for i in range(len(new_children)):
-        formula = formula.replace_child(i, new_children[i])
+    children = formula.children()
+    if len(children) == 0:
+        return formula
+    new_children = list(map(op, children))
+    if all(new_ch is ch for new_ch, ch in zip(new_children, children)):
+        return formula
+    return formula.with_children(new_children)
+
+
+# Rewrite formula bottom-up: op(node) -> (new node, changed) is applied to each node after its
+# children. Unchanged subtrees are shared with formula, not rebuilt.
+# Returns new formula and whether anything has changed
+def rewrite(formula: Token, op) -> (Token, bool):
+    changed = False
+    # Frames: node, its rewritten children, whether some of them have changed
+    stack = [[formula, [], False]]
+    while True:
+        frame = stack[-1]
+        formula, new_children, ch_changed = frame
+        children = formula.children()
+        if len(new_children) < len(children):
+            stack.append([children[len(new_children)], [], False])
+            continue
+        stack.pop()
+        if ch_changed:
+            formula = formula.with_children(new_children)
+        formula, node_changed = op(formula)
+        changed = changed or node_changed
+        if len(stack) == 0:
+            return formula, changed
+        stack[-1][1].append(formula)
+        stack[-1][2] = stack[-1][2] or ch_changed or node_changed
+
+
+# Apply rewrite until nothing changes
+def rewrite_to_fixpoint(formula: Token, op) -> Token:
+    changed = True
+    while changed:
+        formula, changed = rewrite(formula, op)
     return formula
 
 
+# Check if var has free occurences in formula. Used in miniscoping
+def has_free_variable(formula: Token, var: Variable) -> bool:
+    stack = [formula]
+    while len(stack) > 0:
+        formula = stack.pop()
+        if formula is var:
+            return True
+        # Inner occurences are bound
+        if not isinstance(formula, Quantifier) or formula.var != var:
+            stack += formula.children()
+    return False
+
+
 # Replace free occurences of var with term. Used in skolemization
 def replace_free_variable(formula: Token, var: Variable, term: Token) -> Token:
-    logger.debug(f'Replacing free occurences of {var} with {term} in {formula}...')
-    if isinstance(formula, Variable):
-        if formula == var:
-            return term
-        return formula
-    if isinstance(formula, Atom):
-        return formula
-    if isinstance(formula, Quantifier):
-        if formula.var == var:
-            # Inner occurences are bound
-            return formula
+    logger.debug('Replacing free occurences of %s with %s in %s...', var, term, formula)
+
+    def replace(formula: Token, _) -> (Token, object):
+        if formula is var:
+            return term, SKIP_CHILDREN
+        if isinstance(formula, Atom) or isinstance(formula, Quantifier) and formula.var == var:
+            return formula, SKIP_CHILDREN
+        return formula, None
 
-    return transform_children(formula, lambda ch: replace_free_variable(ch, var, term))
+    return transform_top_down(formula, replace)
 
 
 def recursively_substitute(formula: Token, source: Token, dest: Token) -> Token:
@@ -4,6 +4,18 @@ from tests.test_parser import ParserTests
 from tests.test_transformations import TransformationsTests
 from tests.test_resolution import ResolutionTests
 from tests.test_unification import UnificationTests
+from tests.test_model import ModelTests
+from tests.test_saturation import SaturationTests
+from tests.test_clausification import ClausificationTests
+from tests.test_cdcl import CDCLTests
+from tests.test_horn import HornTests
+from tests.test_twosat import TwoSATTests
+from tests.test_bitset import BitsetTests
+from tests.test_variants import VariantsTests
+from tests.test_batch import BatchTests
+from tests.test_limits import LimitsTests
+from tests.test_portfolio import PortfolioTests
+from tests.test_server import ServerTests
 from src.config.logger_conf import configure_logger
 
 if __name__ == '__main__':
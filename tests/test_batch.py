@@ -0,0 +1,34 @@
+from unittest import TestCase
+
+from src.batch import prove, prove_all, PROVED, UNPROVED, ERROR
+from src.parser.parser import parser, ParseError
+
+
+class BatchTests(TestCase):
+
+    def test_syntax_error_is_raised(self):
+        with self.assertRaises(ParseError):
+            parser.parse('(x) &')
+        with self.assertRaises(ParseError):
+            parser.parse('x $ y')
+
+    def test_prove(self):
+        result = prove('(x) -> (y) (x) => y', 3)
+        self.assertEqual(result['line'], 3)
+        self.assertEqual(result['status'], PROVED)
+        self.assertEqual(result['clauses'], 3)
+        self.assertEqual(result['proof_steps'], 2)
+        self.assertEqual(prove('x => y')['status'], UNPROVED)
+
+    def test_errors_are_reported(self):
+        result = prove('(x) &')
+        self.assertEqual(result['status'], ERROR)
+        self.assertIn('Syntax error', result['error'])
+
+    def test_prove_all(self):
+        lines = ['(x) -> (y) (x) => y\n', '\n', 'x => y\n', '(x) &\n', '(x) (y) => (x) & (y)\n']
+        results = sorted(prove_all(lines, jobs=2, clausifier='definitional'),
+                         key=lambda result: result['line'])
+        self.assertEqual([result['line'] for result in results], [1, 3, 4, 5])
+        self.assertEqual([result['status'] for result in results],
+                         [PROVED, UNPROVED, ERROR, PROVED])
@@ -0,0 +1,57 @@
+from importlib.util import find_spec
+from itertools import combinations
+from unittest import TestCase, skipUnless
+
+from src.model.formula_representation import *
+from src.core.clause_store import ClauseStore
+from src.core.resolution import Resolution
+
+# Bitset engine is opt-in, NumPy is not required to run other tests
+HAS_NUMPY = find_spec('numpy') is not None
+if HAS_NUMPY:
+    from src.core.bitset import BitsetResolution
+
+
+@skipUnless(HAS_NUMPY, 'NumPy is not installed')
+class BitsetTests(TestCase):
+
+    def test_masks(self):
+        store = ClauseStore()
+        ids = [store.atom_id(Variable(f'v{i}')) for i in range(70)]
+        clause = (-ids[69], -ids[0], ids[64])
+        solver = BitsetResolution(store, [clause])
+        self.assertEqual(solver.decode(*solver.masks(clause)), tuple(sorted(clause)))
+
+    def test_pigeonhole(self):
+        store = ClauseStore()
+        var = lambda i, j: store.atom_id(Variable(f'p{i}h{j}'))
+        clauses = [(var(i, 0), var(i, 1)) for i in range(3)]
+        clauses += [(-var(i, j), -var(k, j)) for j in range(2) for i, k in combinations(range(3), 2)]
+        solver = BitsetResolution(store, clauses)
+        self.assertTrue(solver.run())
+        # Every step resolves input clauses or earlier resolvents, and the last one gives nil
+        known = set(clauses)
+        for step in solver.steps:
+            for clause in step.clauses:
+                self.assertIn(clause, known)
+            known.add(step.new_clause)
+        self.assertEqual(solver.steps[-1].new_clause, ())
+
+    def test_subsumption(self):
+        store = ClauseStore()
+        x, y, z = (store.atom_id(Variable(name)) for name in 'xyz')
+        solver = BitsetResolution(store, [(x, y, z), (x, y), (-z, x)])
+        # (x | y) subsumes (x | y | z)
+        self.assertFalse(solver.kept[0])
+        self.assertFalse(solver.run())
+        self.assertNotIn((x, y, z), solver.clauses_left())
+
+    def test_resolution_engines_agree(self):
+        # (P | Q) & (P -> R) & (Q -> R) => R
+        p, q, r = Variable('P'), Variable('Q'), Variable('R')
+        formula = ImplicationSign(And([Or([p, q]), Implication([p, r]), Implication([q, r])]), r)
+        self.assertTrue(Resolution(formula, engine='bitset').resolution())
+        self.assertTrue(Resolution(formula, engine='saturation').resolution())
+        formula = ImplicationSign(Or([p, q]), p)
+        self.assertFalse(Resolution(formula, engine='bitset').resolution())
+        self.assertFalse(Resolution(formula, engine='saturation').resolution())
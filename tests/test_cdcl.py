@@ -0,0 +1,72 @@
+from itertools import combinations
+from unittest import TestCase
+
+from src.model.formula_representation import *
+from src.core.clause_store import ClauseStore
+from src.core.cdcl import CDCL, is_propositional, luby
+from src.core.resolution import Resolution
+
+
+class CDCLTests(TestCase):
+
+    # Pigeon i is in hole j: atom (i, j)
+    def pigeonhole(self, pigeons: int, holes: int) -> (ClauseStore, list):
+        store = ClauseStore()
+        var = lambda i, j: store.atom_id(Variable(f'p{i}h{j}'))
+        clauses = [tuple(sorted(var(i, j) for j in range(holes))) for i in range(pigeons)]
+        for j in range(holes):
+            for i, k in combinations(range(pigeons), 2):
+                clauses.append(tuple(sorted((-var(i, j), -var(k, j)))))
+        return store, clauses
+
+    def test_luby(self):
+        self.assertEqual([luby(i) for i in range(1, 16)],
+                         [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8])
+
+    def test_is_propositional(self):
+        store = ClauseStore()
+        store.encode(Or([Variable('x'), CustomFunctionOrPredicate('P', [Variable('y')])]))
+        self.assertTrue(is_propositional(store))
+        store.encode(CustomFunctionOrPredicate('P', [Constant('I')]))
+        self.assertFalse(is_propositional(store))
+
+    def test_is_propositional_skolem(self):
+        store = ClauseStore()
+        store.encode(CustomFunctionOrPredicate('P', [SkolemovConstant()]))
+        self.assertFalse(is_propositional(store))
+
+    def test_pigeonhole_unsat(self):
+        store, clauses = self.pigeonhole(5, 4)
+        solver = CDCL(store, clauses)
+        self.assertTrue(solver.solve())
+        # Every step resolves input clauses or earlier resolvents, and the last one gives nil
+        known = set(clauses)
+        for step in solver.steps:
+            for clause in step.clauses:
+                self.assertIn(clause, known)
+            known.add(step.new_clause)
+        self.assertEqual(solver.steps[-1].new_clause, ())
+
+    def test_pigeonhole_sat(self):
+        store, clauses = self.pigeonhole(4, 4)
+        self.assertFalse(CDCL(store, clauses).solve())
+
+    def test_unit_conflict(self):
+        store = ClauseStore()
+        clauses = store.encode_all([Variable('x'), Not([Variable('x')])])
+        solver = CDCL(store, clauses)
+        self.assertTrue(solver.solve())
+        self.assertEqual(len(solver.steps), 1)
+
+    def test_resolution_engines_agree(self):
+        # P -> (Q -> R) => (P & Q) -> R
+        formula = ImplicationSign(
+            Implication([Variable('P'), Implication([Variable('Q'), Variable('R')])]),
+            Implication([And([Variable('P'), Variable('Q')]), Variable('R')]))
+        self.assertTrue(Resolution(formula, engine='cdcl').resolution())
+        self.assertTrue(Resolution(formula, engine='saturation').resolution())
+        # P -> Q => Q -> P
+        formula = ImplicationSign(Implication([Variable('P'), Variable('Q')]),
+                                  Implication([Variable('Q'), Variable('P')]))
+        self.assertFalse(Resolution(formula, engine='cdcl').resolution())
+        self.assertFalse(Resolution(formula, engine='saturation').resolution())
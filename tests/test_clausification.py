@@ -0,0 +1,149 @@
+import sys
+from unittest import TestCase
+
+from src.model.formula_representation import *
+from src.core.clausification import DefinitionalClausifier, FusedClausifier
+from src.core.resolution import Resolution
+from src.core.transformations import break_to_clauses
+
+
+class ClausificationTests(TestCase):
+
+    def test_small_disjunction_is_distributed(self):
+        formula = Or([Variable('x'), And([Variable('y'), Variable('z')])])
+        expected = '((v_x) or (v_y)) and ((v_x) or (v_z))'
+        actual = repr(DefinitionalClausifier().to_cnf(formula))
+        self.assertEqual(actual, expected)
+
+    def test_conjunctions_are_named(self):
+        formula = Or([
+            And([Variable('a'), Variable('b'), Variable('c')]),
+            And([Variable('d'), Variable('e'), Variable('f')]),
+        ])
+        clauses = break_to_clauses(DefinitionalClausifier().to_cnf(formula))
+        # def0 | def1 and three clauses for each definition, instead of 9 clauses
+        self.assertEqual(len(clauses), 7)
+        self.assertEqual(repr(clauses[0]),
+                         '(cfp_def0(v_a, v_b, v_c)) or (cfp_def1(v_d, v_e, v_f))')
+        self.assertIn(Or([Not([clauses[0].children()[0]]), Variable('a')]), clauses)
+
+    def test_definitions_are_shared(self):
+        conj = And([Variable('a'), Variable('b'), Variable('c')])
+        clausifier = DefinitionalClausifier()
+        lhs = break_to_clauses(clausifier.to_cnf(Or([conj, conj, Variable('d')])))
+        neg_rhs = break_to_clauses(clausifier.to_cnf(Or([conj, Variable('e'), conj])))
+        self.assertEqual(len(lhs), 4)
+        self.assertEqual(len(neg_rhs), 1)
+
+    def test_definitional_resolution(self):
+        # (a & b & c) | (d & e & f) => a | d
+        formula = ImplicationSign(
+            Or([
+                And([Variable('a'), Variable('b'), Variable('c')]),
+                And([Variable('d'), Variable('e'), Variable('f')]),
+            ]), Or([Variable('a'), Variable('d')]))
+        res = Resolution(formula, clausifier='definitional')
+        self.assertTrue(res.resolution())
+
+    def test_definitional_resolution_predicates(self):
+        # forall x ((P(x) & Q(x) & R(x)) | (S(x) & T(x) & U(x))) => forall y (P(y) | S(y))
+        p = lambda name, var: CustomFunctionOrPredicate(name, [Variable(var)])
+        formula = ImplicationSign(
+            Forall(Variable('x'), Or([
+                And([p('P', 'x'), p('Q', 'x'), p('R', 'x')]),
+                And([p('S', 'x'), p('T', 'x'), p('U', 'x')]),
+            ])), Forall(Variable('y'), Or([p('P', 'y'), p('S', 'y')])))
+        res = Resolution(formula, clausifier='definitional')
+        self.assertTrue(res.resolution())
+
+    def test_fused_narrows_negation(self):
+        # not (a or (b -> c))
+        formula = Not([Or([Variable('a'), Implication([Variable('b'), Variable('c')])])])
+        expected = '(not(v_a)) and (v_b) and (not(v_c))'
+        actual = repr(FusedClausifier().to_cnf(formula))
+        self.assertEqual(actual, expected)
+
+    def test_fused_skolemizes(self):
+        # forall x exists y P(x, y)
+        formula = Forall(Variable('x'), Exists(Variable('y'), CustomFunctionOrPredicate(
+            'P', [Variable('x'), Variable('y')])))
+        x, sk_fun = FusedClausifier().to_cnf(formula).children()
+        self.assertIs(x, Variable('x'))
+        self.assertIsInstance(sk_fun, SkolemovFunction)
+        self.assertEqual(sk_fun.children(), (Variable('x'), ))
+
+    def test_fused_skolem_constant(self):
+        # forall x exists y (P(x) or Q(y)): y doesn't depend on x
+        formula = Forall(Variable('x'), Exists(Variable('y'), Or([
+            CustomFunctionOrPredicate('P', [Variable('x')]),
+            CustomFunctionOrPredicate('Q', [Variable('y')]),
+        ])))
+        _, q = FusedClausifier().to_cnf(formula).children()
+        self.assertIsInstance(q.children()[0], SkolemovConstant)
+
+    def test_fused_negative_polarity(self):
+        # Negation of forall x P(x) is P(c) for Skolemov constant c
+        formula = Forall(Variable('x'), CustomFunctionOrPredicate('P', [Variable('x')]))
+        clause = FusedClausifier().to_cnf(formula, positive=False)
+        self.assertIsInstance(clause, Not)
+        self.assertIsInstance(clause.children()[0].children()[0], SkolemovConstant)
+
+    def test_fused_renames_variables(self):
+        # (forall x P(x)) or (forall x Q(x))
+        formula = Or([
+            Forall(Variable('x'), CustomFunctionOrPredicate('P', [Variable('x')])),
+            Forall(Variable('x'), CustomFunctionOrPredicate('Q', [Variable('x')])),
+        ])
+        p, q = FusedClausifier().to_cnf(formula).children()
+        self.assertIs(p.children()[0], Variable('x'))
+        self.assertIsNot(q.children()[0], Variable('x'))
+
+    def test_fused_removes_redundancy(self):
+        # (x or not x) and (y or False)
+        formula = And([Or([Variable('x'), Not([Variable('x')])]),
+                       Or([Variable('y'), CONSTANT_FALSE])])
+        self.assertIs(FusedClausifier().to_cnf(formula), Variable('y'))
+
+    def test_fused_and_traced_resolution(self):
+        # forall x ((S(x) -> L(x)) & (S(x) -> B(x))), not L(I), not B(T) => not (S(I) | S(T))
+        p = lambda name, arg: CustomFunctionOrPredicate(name, [arg])
+        formula = ImplicationSign([
+            Forall(Variable('x'), And([
+                Implication([p('S', Variable('x')), p('L', Variable('x'))]),
+                Implication([p('S', Variable('x')), p('B', Variable('x'))]),
+            ])),
+            Not([p('L', Constant('I'))]),
+            Not([p('B', Constant('T'))]),
+        ], Not([Or([p('S', Constant('I')), p('S', Constant('T'))])]))
+        traced = Resolution(formula, trace=True)
+        fused = Resolution(formula)
+        self.assertTrue(traced.resolution())
+        self.assertTrue(fused.resolution())
+        self.assertCountEqual(fused.get_first_clauses(), traced.get_first_clauses())
+
+    def test_formula_of_depth_1e5(self):
+        # a0 -> (a1 -> (... -> an)) is a single clause -a0 | -a1 | ... | an
+        depth = 10 ** 5
+        v = [Variable(f'a{i}') for i in range(depth + 1)]
+        formula = v[depth]
+        for i in range(depth - 1, -1, -1):
+            formula = Implication([v[i], formula])
+        self.assertTrue(str(formula).endswith(f'(a{depth - 1}) → (a{depth})' + ')' * (depth - 1)))
+        clauses = break_to_clauses(FusedClausifier().to_cnf(formula))
+        self.assertEqual(len(clauses), 1)
+        self.assertEqual(len(clauses[0].children()), depth + 1)
+        self.assertIn(Not([v[0]]), clauses[0].children())
+
+    def test_formulas_deeper_than_recursion_limit(self):
+        # a0 & (a0 -> a1 & (a1 -> a2 & ...)) => an, nested deeper than recursion limit
+        depth = sys.getrecursionlimit() + 1000
+        v = [Variable(f'a{i}') for i in range(depth + 1)]
+        lhs = Implication([v[depth - 1], v[depth]])
+        for i in range(depth - 1, 0, -1):
+            lhs = And([Implication([v[i - 1], v[i]]), lhs])
+        formula = ImplicationSign(And([v[0], lhs]), v[depth])
+        self.assertTrue(str(formula).endswith(f' => a{depth}'))
+        for trace in (False, True):
+            resolution = Resolution(formula, trace=trace)
+            self.assertTrue(resolution.resolution())
+            self.assertEqual(len(resolution.get_first_clauses()), depth + 2)
@@ -0,0 +1,90 @@
+from unittest import TestCase
+
+from src.model.formula_representation import *
+from src.core.clause_store import ClauseStore
+from src.core.horn import HornSAT, UnitResultingResolution, is_horn
+from src.core.resolution import Resolution
+from src.parser.parser import parser
+
+
+class HornTests(TestCase):
+
+    def check_steps(self, clauses: list, steps: list) -> None:
+        # Every step resolves input clauses or earlier resolvents, and the last one gives nil
+        known = set(clauses)
+        for step in steps:
+            for clause in step.clauses:
+                self.assertIn(clause, known)
+            known.add(step.new_clause)
+        self.assertEqual(steps[-1].new_clause, ())
+
+    def test_is_horn(self):
+        store = ClauseStore()
+        p, q, r = Variable('p'), Variable('q'), Variable('r')
+        self.assertTrue(is_horn(store.encode_all([Or([Not([p]), Not([q]), r]), Not([r]), p])))
+        self.assertFalse(is_horn(store.encode_all([Or([p, q])])))
+
+    def test_forward_chaining_unsat(self):
+        store = ClauseStore()
+        p, q, r, s = Variable('p'), Variable('q'), Variable('r'), Variable('s')
+        clauses = store.encode_all([p, q, Or([Not([p]), Not([q]), r]), Or([Not([r]), s]),
+                                    Or([Not([s]), Not([p])])])
+        solver = HornSAT(store, clauses)
+        self.assertTrue(solver.solve())
+        self.check_steps(clauses, solver.steps)
+
+    def test_forward_chaining_sat(self):
+        store = ClauseStore()
+        p, q, r = Variable('p'), Variable('q'), Variable('r')
+        clauses = store.encode_all([p, Or([Not([p]), Not([q]), r]), Not([r])])
+        self.assertFalse(HornSAT(store, clauses).solve())
+
+    def test_unit_resulting_resolution(self):
+        store = ClauseStore()
+        x = Variable('x')
+        human = lambda t: CustomFunctionOrPredicate('H', [t])
+        mortal = lambda t: CustomFunctionOrPredicate('M', [t])
+        clauses = store.encode_all([
+            Or([Not([human(x)]), mortal(x)]), human(Constant('I')),
+            Or([Not([mortal(Constant('I'))]), Not([mortal(Constant('J'))])]),
+            human(Constant('J'))])
+        solver = UnitResultingResolution(store, clauses)
+        self.assertTrue(solver.solve())
+        self.check_steps(clauses, solver.steps)
+
+    def test_unit_resulting_resolution_reuses_fact(self):
+        store = ClauseStore()
+        p = lambda t: CustomFunctionOrPredicate('P', [t])
+        clauses = store.encode_all([p(Variable('x')),
+                                    Or([Not([p(Constant('I'))]), Not([p(Constant('J'))])])])
+        solver = UnitResultingResolution(store, clauses)
+        self.assertTrue(solver.solve())
+        self.assertEqual(len(solver.steps), 2)
+
+    def test_resolution_engines_agree(self):
+        # P -> (Q -> R) => (P & Q) -> R
+        formula = ImplicationSign(
+            Implication([Variable('P'), Implication([Variable('Q'), Variable('R')])]),
+            Implication([And([Variable('P'), Variable('Q')]), Variable('R')]))
+        self.assertTrue(Resolution(formula, engine='horn').resolution())
+        self.assertTrue(Resolution(formula, engine='saturation').resolution())
+        # P | Q => P is not Horn
+        formula = ImplicationSign(Or([Variable('P'), Variable('Q')]), Variable('P'))
+        with self.assertRaises(ValueError):
+            Resolution(formula, engine='horn').resolution()
+
+    def test_skolemov_constants_are_not_identified(self):
+        # Horn clauses R(c0, y) and -R(c1, c1), c0 and c1 are different
+        formula = parser.parse('exists x (forall y (p_R(x, y))) => forall y (p_R(y, y))')
+        for engine in ['auto', 'horn', 'saturation']:
+            self.assertFalse(Resolution(formula, engine=engine).resolution())
+
+    def test_refutation_steps(self):
+        # Only clauses that nil depends on are fired: q -> r isn't used
+        store = ClauseStore()
+        p, q, r, s = Variable('p'), Variable('q'), Variable('r'), Variable('s')
+        clauses = store.encode_all([p, q, Or([Not([q]), r]), Or([Not([p]), s]), Not([s])])
+        solver = HornSAT(store, clauses)
+        self.assertTrue(solver.solve())
+        self.check_steps(clauses, solver.steps)
+        self.assertEqual(len(solver.steps), 2)
@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+from src.model.formula_representation import *
+from src.core.resolution import Resolution, UNPROVED, RESOURCE_OUT
+from src.core.limits import Limits, Budget, ResourceOut, tree_depth
+
+
+# a0 <-> (a1 <-> (... <-> an)) => z, CNF of lhs has 2^n clauses
+def equivalence_chain(n: int) -> Token:
+    formula = Variable(f'a{n}')
+    for i in range(n - 1, -1, -1):
+        formula = Equivalence([Variable(f'a{i}'), formula])
+    return ImplicationSign(formula, Variable('z'))
+
+
+class LimitsTests(TestCase):
+
+    def resource_out(self, formula: Token, limits: Limits, **options) -> Resolution:
+        res = Resolution(formula, limits=limits, **options)
+        self.assertFalse(res.resolution())
+        self.assertEqual(res.get_status(), RESOURCE_OUT)
+        return res
+
+    def test_no_limits_by_default(self):
+        budget = Budget()
+        for _ in range(1000):
+            budget.step()
+            budget.generated(1000)
+        self.assertEqual(budget.steps, 1000)
+
+    def test_clause_limit_stops_distribution(self):
+        for trace in (False, True):
+            res = self.resource_out(equivalence_chain(12), Limits(clauses=1000), trace=trace)
+            self.assertEqual(res.resource_out.resource, 'clauses')
+            self.assertGreater(res.get_budget().clauses, 1000)
+        res = Resolution(equivalence_chain(6), clausifier='definitional',
+                         limits=Limits(clauses=1000))
+        self.assertFalse(res.resolution())
+        self.assertEqual(res.get_status(), UNPROVED)
+
+    def test_time_limit(self):
+        res = self.resource_out(equivalence_chain(16), Limits(time=0.05))
+        self.assertEqual(res.resource_out.resource, 'time')
+        self.assertLess(res.get_budget().elapsed(), 1)
+
+    def test_step_limit_keeps_partial_derivations(self):
+        # (a | b) & (a | -b) & (-a | c) => c
+        a, b, c = Variable('a'), Variable('b'), Variable('c')
+        formula = ImplicationSign(And([Or([a, b]), Or([a, Not([b])]), Or([Not([a]), c])]), c)
+        res = Resolution(formula, engine='saturation')
+        self.assertTrue(res.resolution())
+        steps = res.get_budget().steps
+        res = self.resource_out(formula, Limits(steps=steps - 1), engine='saturation')
+        self.assertEqual(res.resource_out.resource, 'steps')
+        self.assertGreater(len(res.get_resolution_steps()), 0)
+        self.assertEqual(res.get_proof_steps(), [])
+
+    def test_term_depth_limit(self):
+        f = lambda arg: CustomFunctionOrPredicate('f', [arg])
+        atom = CustomFunctionOrPredicate('P', [f(f(Constant('a')))])
+        self.assertEqual(tree_depth(atom), 4)
+        res = self.resource_out(ImplicationSign(atom, atom), Limits(term_depth=3))
+        self.assertEqual(res.resource_out.resource, 'term depth')
+        self.assertTrue(Resolution(ImplicationSign(atom, atom),
+                                   limits=Limits(term_depth=4)).resolution())
+
+    def test_memory_limit(self):
+        budget = Budget(Limits(memory=1))
+        with self.assertRaises(ResourceOut):
+            budget.check()
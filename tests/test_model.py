@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from src.model.formula_representation import *
+
+
+class ModelTests(TestCase):
+
+    def test_structurally_equal_tokens_are_same(self):
+        a = Or([Not([CustomFunctionOrPredicate('P', [Variable('x')])]), Variable('y')])
+        b = Or([Not([CustomFunctionOrPredicate('P', [Variable('x')])]), Variable('y')])
+        self.assertIs(a, b)
+        self.assertEqual(a.get_id(), b.get_id())
+
+    def test_different_tokens_are_not_equal(self):
+        self.assertNotEqual(Forall(Variable('x'), Variable('z')),
+                            Forall(Variable('y'), Variable('z')))
+        self.assertNotEqual(CustomFunctionOrPredicate('P', [Variable('x')]),
+                            CustomFunctionOrPredicate('Q', [Variable('x')]))
+        self.assertNotEqual(SkolemovFunction([Variable('x')]), SkolemovFunction([Variable('x')]))
+        self.assertNotEqual(Constant(True), Constant(1))
+        self.assertNotEqual(SkolemovConstant(), SkolemovConstant())
+
+    def test_hash_is_structural(self):
+        clauses = {Or([Variable('x'), Variable('y')]), Not([Variable('x')])}
+        self.assertIn(Or([Variable('x'), Variable('y')]), clauses)
+        self.assertNotIn(Or([Variable('y'), Variable('x')]), clauses)
+
+    def test_unhashable_constant(self):
+        self.assertIs(Constant([1, 2]), Constant([1, 2]))
+
+    def test_tokens_have_no_dict(self):
+        tokens = [
+            Variable('x'),
+            Constant('x'),
+            SkolemovConstant(),
+            Not([Variable('x')]),
+            Or([Variable('x'), Variable('y')]),
+            Forall(Variable('x'), Variable('x')),
+            CustomFunctionOrPredicate('P', [Variable('x')]),
+            SkolemovFunction([Variable('x')]),
+            ImplicationSign(Variable('x'), Variable('y')),
+        ]
+        for token in tokens:
+            self.assertFalse(hasattr(token, '__dict__'), type(token))
+
+    def test_children_are_tuples(self):
+        formula = And([Variable('x'), Variable('y')])
+        self.assertIsInstance(formula.children(), tuple)
+        self.assertIsInstance(CustomFunctionOrPredicate('P', [Variable('x')]).children(), tuple)
+
+    def test_with_children(self):
+        formula = Or([Variable('x'), Variable('y'), Variable('z')])
+        expected = Or([Variable('a'), Variable('b'), Variable('c')])
+        actual = formula.with_children([Variable('a'), Variable('b'), Variable('c')])
+        self.assertIs(actual, expected)
+
+        sk_fun = SkolemovFunction([Variable('x')])
+        actual = sk_fun.with_children([Variable('y')])
+        self.assertEqual(repr(actual), f'{sk_fun.text_repr}(v_y)')
+
+    def test_replace_child(self):
+        formula = Forall(Variable('x'), CustomFunctionOrPredicate('P', [Variable('x'), Variable('y')]))
+        expected = 'forall v_x (cfp_P(v_x, v_z))'
+        actual = formula.replace_child(0, formula.get_body().replace_child(1, Variable('z')))
+        self.assertEqual(repr(actual), expected)
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from src.parser.parser import parser
+from src.parser.parser import parser, ParseError
 
 
 class ParserTests(TestCase):
@@ -12,6 +12,10 @@ class ParserTests(TestCase):
     def test_constant(self):
         self.templated_test('\'0.5\' => \'17\'', 'c_0.5 Implies c_17')
 
+    def test_constant_is_not_evaluated(self):
+        with self.assertRaises(ParseError):
+            parser.parse('\'__import__("os")\' => x')
+
     def test_variable(self):
         self.templated_test('x => y', 'v_x Implies v_y')
 
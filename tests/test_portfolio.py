@@ -0,0 +1,58 @@
+from json import dump
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.portfolio import race, load_portfolio, WinStatistics, Strategy, CANCELLED
+from src.core.resolution import PROVED, UNPROVED
+
+STRATEGIES = [
+    Strategy('default', {}),
+    Strategy('set-of-support', {'engine': 'saturation', 'set_of_support': True}),
+    Strategy('literals', {'engine': 'saturation', 'weight': 'literals', 'pick_ratio': 0}),
+]
+
+
+class PortfolioTests(TestCase):
+
+    def test_default_portfolio(self):
+        strategies = load_portfolio()
+        self.assertGreater(len(strategies), 1)
+        self.assertIn('default', [strategy.name for strategy in strategies])
+
+    def test_json_portfolio(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'portfolio.json'
+            with open(path, 'w') as file:
+                dump({'strategy': [{'name': 'sos', 'set_of_support': True}, {}]}, file)
+            self.assertEqual(load_portfolio(path), [Strategy('sos', {'set_of_support': True}),
+                                                    Strategy('strategy1', {})])
+            with open(path, 'w') as file:
+                dump({'strategy': [{'name': 'bad', 'ordering': 'kbo'}]}, file)
+            with self.assertRaises(ValueError):
+                load_portfolio(path)
+
+    def test_race(self):
+        result = race('(x) -> (y) (x) => y', STRATEGIES, 7)
+        self.assertEqual(result['line'], 7)
+        self.assertEqual(result['status'], PROVED)
+        self.assertIn(result['winner'], result['strategies'])
+        self.assertEqual(result['strategies'][result['winner']], PROVED)
+        for status in result['strategies'].values():
+            self.assertIn(status, [PROVED, CANCELLED])
+
+        result = race('x => y', STRATEGIES)
+        self.assertEqual(result['status'], UNPROVED)
+        self.assertIsNone(result['winner'])
+        self.assertEqual(set(result['strategies'].values()), {UNPROVED})
+
+    def test_win_statistics(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'stats.json'
+            stats = WinStatistics(path)
+            stats.record({'winner': 'a', 'time': 0.5, 'strategies': {'a': PROVED, 'b': CANCELLED}})
+            stats.record({'winner': None, 'time': 1, 'strategies': {'a': UNPROVED, 'b': UNPROVED}})
+            stats.save()
+            stats = WinStatistics(path).stats
+            self.assertEqual(stats['a'], {'races': 2, 'wins': 1, 'win_time': 0.5})
+            self.assertEqual(stats['b'], {'races': 2, 'wins': 0, 'win_time': 0.0})
@@ -1,7 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
 
 from src.model.formula_representation import *
 from src.core.resolution import Resolution
+from src.core.clause_store import ClauseStore
+from src.core.saturation import Saturation
+from src.parser.parser import parser
 from src.config.logger_conf import configure_logger
 from src.util import recursively_substitute
 
@@ -63,13 +67,31 @@ class ResolutionTests(TestCase):
         self.assertTrue(res.resolution())
 
     def test_predicate_resolution_2(self):
-        '''x | y => forall z (x & z)'''
+        '''x | y => forall z (x & z)
+        Resolvent of (x) | (y) and (not(x)) | (not(c0)) is (y) | (not(c0)), which cannot be
+        resolved further'''
         formula = ImplicationSign(Or([Variable('x'), Variable('y')]),
                                   Forall(Variable('z'), And([Variable('x'),
                                                              Variable('z')])))
         res = Resolution(formula)
+        self.assertFalse(res.resolution())
+
+    def test_resolution_extra_clause(self):
+        '''x y => x: nil is derived even though y is left'''
+        formula = ImplicationSign([Variable('x'), Variable('y')], Variable('x'))
+        res = Resolution(formula)
         self.assertTrue(res.resolution())
 
+    def test_resolvent_is_single_clause(self):
+        formula = ImplicationSign([
+            Or([Variable('a'), Variable('b')]),
+            Or([Not([Variable('a')]), Variable('c')])
+        ], Or([Variable('b'), Variable('c')]))
+        res = Resolution(formula)
+        self.assertTrue(res.resolution())
+        for step in res.get_resolution_steps():
+            self.assertIsInstance(step.new_clause, tuple)
+
     def test_predicate_textbook_example_1(self):
         '''All his ideas are brilliant. Some of his ideas are incorrect.
         Anything that is incorrect cannot be brilliant.
@@ -133,3 +155,93 @@ class ResolutionTests(TestCase):
             ]))
         res = Resolution(formula)
         self.assertTrue(res.resolution())
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            Resolution(ImplicationSign(Variable('x'), Variable('x')), engine='bogus').resolution()
+
+    def test_quantifiers_are_not_swapped(self):
+        '''Skolemov terms of different quantifiers must not be identified'''
+        for formula in ['forall x (exists y (p_R(x, y))) => exists y (forall x (p_R(x, y)))',
+                        'exists x (forall y (p_R(x, y))) => forall y (p_R(y, y))']:
+            for engine in ['auto', 'saturation']:
+                self.assertFalse(Resolution(parser.parse(formula), engine=engine).resolution())
+
+    def test_parents_are_kept(self):
+        '''(a | b) (not(a) | c) not(b) not(c) => x: a | b is needed twice'''
+        formula = ImplicationSign([
+            Or([Variable('a'), Variable('b')]),
+            Or([Not([Variable('a')]), Variable('c')]),
+            Not([Variable('b')]),
+            Not([Variable('c')])
+        ], Variable('x'))
+        res = Resolution(formula)
+        self.assertTrue(res.resolution())
+
+    def test_proof_steps(self):
+        x = Variable('x')
+        p = lambda t: CustomFunctionOrPredicate('P', [t])
+        q = lambda t: CustomFunctionOrPredicate('Q', [t])
+        r = lambda t: CustomFunctionOrPredicate('R', [t])
+        # R(T) and its consequences don't contribute to the proof
+        formula = ImplicationSign(
+            And([Forall(x, Implication([p(x), q(x)])), Forall(x, Implication([r(x), p(x)])),
+                 p(Constant('I')), r(Constant('T'))]), q(Constant('I')))
+        res = Resolution(formula, engine='saturation')
+        self.assertTrue(res.resolution())
+        proof = res.get_proof_steps()
+        self.assertLess(len(proof), len(res.get_resolution_steps()))
+        self.assertEqual(proof[-1].new_clause, ())
+        # Each step uses first clauses or clauses derived by earlier steps of the proof
+        first_clauses = set(proof[0].store.encode_all(res.get_first_clauses()))
+        derived = set()
+        for step in proof:
+            for clause in step.clauses:
+                self.assertTrue(clause in first_clauses or clause in derived)
+            derived.add(step.new_clause)
+
+    def test_resolvents_are_not_repeated(self):
+        store = ClauseStore()
+        clauses = store.encode_all([
+            Or([Variable('a'), Variable('b')]),
+            Or([Not([Variable('a')]), Variable('b')]),
+            Or([Variable('a'), Not([Variable('b')])]),
+            Not([Variable('c')])
+        ])
+        saturation = Saturation(store, clauses)
+        self.assertFalse(saturation.run())
+        new_clauses = [step.new_clause for step in saturation.steps]
+        self.assertEqual(len(new_clauses), len(set(new_clauses)))
+        # a and b subsume clauses they were derived from
+        self.assertCountEqual(saturation.active, [(-3, ), (2, ), (1, )])
+
+    def test_proofs_do_not_share_state(self):
+        # exists x P(x) => exists y P(y) gets Skolemov constant c0 in each proof
+        p = lambda arg: CustomFunctionOrPredicate('P', [arg])
+        formula = ImplicationSign(Exists(Variable('x'), p(Variable('x'))),
+                                  Exists(Variable('y'), p(Variable('y'))))
+        first = Resolution(formula, trace=True)
+        second = Resolution(formula, trace=True)
+        self.assertTrue(first.resolution())
+        self.assertTrue(second.resolution())
+        self.assertEqual(len(second.get_transformations_info()),
+                         len(first.get_transformations_info()))
+        self.assertEqual(len(second.get_resolution_steps()), len(first.get_resolution_steps()))
+        self.assertEqual(first.get_first_clauses(), second.get_first_clauses())
+        self.assertIn("cfp_P(sc_'c0')", map(repr, second.get_first_clauses()))
+
+    def test_proofs_in_threads(self):
+        # exists x (P_i(x) & Q_i(x)) => exists y P_i(y), Skolemov constant is c0 in each proof
+        p = lambda name, arg: CustomFunctionOrPredicate(name, [arg])
+        formulas = [ImplicationSign(
+            Exists(Variable('x'), And([p(f'P{i}', Variable('x')), p(f'Q{i}', Variable('x'))])),
+            Exists(Variable('y'), p(f'P{i}', Variable('y')))) for i in range(40)]
+
+        def prove(formula):
+            res = Resolution(formula)
+            return res.resolution(), res.get_first_clauses()
+
+        expected = list(map(prove, formulas))
+        with ThreadPoolExecutor(4) as pool:
+            self.assertEqual(list(pool.map(prove, formulas)), expected)
+        self.assertTrue(all(proved for proved, _ in expected))
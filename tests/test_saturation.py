@@ -0,0 +1,152 @@
+from unittest import TestCase
+
+from src.model.formula_representation import *
+from src.core.clause_store import ClauseStore
+from src.core.clause_selection import ClauseQueue, SymbolCount, literal_count
+from src.core.subsumption import FeatureVectorIndex, clause_features, subsumes
+from src.core.discrimination_tree import DiscriminationTree
+from src.core.saturation import Saturation
+
+
+class SaturationTests(TestCase):
+
+    def test_symbol_count(self):
+        store = ClauseStore()
+        clause = store.encode(
+            Or([
+                Not([CustomFunctionOrPredicate('P', [Variable('x'), Constant('c')])]),
+                Variable('y')
+            ]))
+        self.assertEqual(SymbolCount(symbol_weight=3, variable_weight=1)(store, clause), 8)
+
+    def test_clause_queue_weight_only(self):
+        store = ClauseStore()
+        queue = ClauseQueue(store, literal_count, pick_ratio=0)
+        for clause in [(1, 2, 3), (1, ), (1, 2)]:
+            queue.push(clause)
+        self.assertEqual([queue.pop() for _ in range(3)], [(1, ), (1, 2), (1, 2, 3)])
+        self.assertEqual(len(queue), 0)
+
+    def test_clause_queue_ratio(self):
+        store = ClauseStore()
+        queue = ClauseQueue(store, literal_count, pick_ratio=2)
+        for clause in [(1, 2, 3, 4), (1, 2, 3), (1, ), (2, ), (3, )]:
+            queue.push(clause)
+        self.assertEqual(len(queue), 5)
+        # Two lightest, then oldest
+        self.assertEqual([queue.pop() for _ in range(3)], [(1, ), (2, ), (1, 2, 3, 4)])
+        self.assertEqual(len(queue), 2)
+        self.assertEqual([queue.pop() for _ in range(2)], [(3, ), (1, 2, 3)])
+        self.assertEqual(len(queue), 0)
+
+    def test_subsumes_subset(self):
+        store = ClauseStore()
+        c = store.encode(Or([Variable('x'), Not([Variable('y')])]))
+        d = store.encode(Or([Variable('x'), Variable('z'), Not([Variable('y')])]))
+        self.assertTrue(subsumes(store, c, d))
+        self.assertFalse(subsumes(store, d, c))
+
+    def test_subsumes_matching(self):
+        store = ClauseStore()
+        p = lambda arg: CustomFunctionOrPredicate('P', [arg])
+        q = lambda arg: CustomFunctionOrPredicate('Q', [arg])
+        c = store.encode(Or([p(Variable('x')), Not([q(Variable('x'))])]))
+        d = store.encode(Or([p(Constant('a')), Not([q(Constant('a'))]), Variable('y')]))
+        self.assertTrue(subsumes(store, c, d))
+        # x cannot be both a and b
+        d = store.encode(Or([p(Constant('a')), Not([q(Constant('b'))])]))
+        self.assertFalse(subsumes(store, c, d))
+
+    def test_feature_vector_index(self):
+        store = ClauseStore()
+        index = FeatureVectorIndex()
+        clauses = store.encode_all([
+            Variable('x'),
+            Or([Variable('x'), Variable('y')]),
+            Or([Not([Variable('x')]), Variable('y')]),
+            Not([CustomFunctionOrPredicate('P', [Variable('x')])]),
+        ])
+        for clause in clauses:
+            index.insert(clause, clause_features(store, clause))
+        query = clauses[1]
+        features = clause_features(store, query)
+        self.assertCountEqual(index.candidates(features, less=True), clauses[:2])
+        self.assertEqual(index.find_subsuming(store, query, features), clauses[0])
+        self.assertEqual(index.find_subsumed(store, clauses[0], clause_features(store, clauses[0])),
+                         [clauses[1]])
+        index.remove(clauses[0])
+        self.assertEqual(index.find_subsuming(store, query, features), clauses[1])
+        self.assertEqual(len(index), 3)
+
+    def test_discrimination_tree_retrieve(self):
+        store = ClauseStore()
+        p = lambda *args: CustomFunctionOrPredicate('P', list(args))
+        tree = DiscriminationTree()
+        clauses = store.encode_all([
+            p(Variable('x'), Constant('a')),
+            Not([p(Constant('b'), Constant('a'))]),
+            p(SkolemovFunction([Variable('y')]), Constant('b')),
+            Or([CustomFunctionOrPredicate('Q', [Variable('x')]), Variable('z')]),
+        ])
+        for clause in clauses:
+            tree.insert(store, clause)
+        self.assertEqual(tree.retrieve(p(Constant('c'), Constant('a')), True), {clauses[0]})
+        self.assertEqual(tree.retrieve(p(Constant('c'), Constant('b')), True), {clauses[2]})
+        self.assertEqual(tree.retrieve(p(Constant('b'), Constant('a')), False), {clauses[1]})
+        self.assertEqual(tree.retrieve(SkolemovFunction([Variable('x')]), True),
+                         {clauses[0], clauses[2], clauses[3]})
+        self.assertEqual(tree.retrieve(Variable('z'), True), {clauses[3]})
+        self.assertEqual(tree.retrieve(Variable('x'), True), set())
+
+    def test_discrimination_tree_partners(self):
+        store = ClauseStore()
+        tree = DiscriminationTree()
+        clauses = store.encode_all([
+            Or([Variable('x'), Variable('y')]),
+            Or([Not([Variable('x')]), Variable('z')]),
+            Not([Variable('y')]),
+        ])
+        for clause in clauses:
+            tree.insert(store, clause)
+        self.assertEqual(tree.partners(store, clauses[0]), {clauses[1], clauses[2]})
+        self.assertEqual(tree.partners(store, clauses[2]), {clauses[0]})
+        tree.remove(store, clauses[0])
+        self.assertEqual(tree.partners(store, clauses[2]), set())
+        self.assertEqual(tree.roots[True].children.get(Variable, dict()).keys(), {('z', 0)})
+
+    def test_proof_graph(self):
+        store = ClauseStore()
+        p = lambda t: CustomFunctionOrPredicate('P', [t])
+        q = lambda t: CustomFunctionOrPredicate('Q', [t])
+        clauses = store.encode_all([Or([Not([p(Variable('x'))]), q(Variable('x'))]),
+                                    p(Constant('I')), Not([q(Constant('I'))])])
+        saturation = Saturation(store, clauses)
+        self.assertTrue(saturation.run())
+        graph = saturation.proof
+        for step in saturation.steps:
+            # Derived node refers to earlier nodes only
+            parents = graph.parents[step.node]
+            self.assertEqual(len(parents), 2)
+            self.assertTrue(all(parent < step.node for parent in parents))
+            self.assertEqual(step.clauses, [graph.clauses[parent] for parent in parents])
+            self.assertEqual(step.rule, 'resolution')
+        # Input clauses have no parents
+        inputs = [node for node in range(len(graph)) if graph.rules[node] == 'input']
+        self.assertTrue(all(graph.parents[node] == () for node in inputs))
+        self.assertTrue(all(graph.clauses[node] in clauses for node in inputs))
+
+    def test_set_of_support(self):
+        store = ClauseStore()
+        a, b, c, d = Variable('a'), Variable('b'), Variable('c'), Variable('d')
+        # d and -d resolve, but neither of them is in the support
+        clauses = store.encode_all([Or([Not([a]), b]), Or([Not([b]), c]), d, Not([d]), a])
+        support = {store.encode(a)}
+        saturation = Saturation(store, clauses, support=support)
+        self.assertFalse(saturation.run())
+        self.assertNotIn((), saturation.known)
+        # a gives b and c, all resolvents are derived from the support
+        self.assertCountEqual([step.new_clause for step in saturation.steps],
+                              store.encode_all([b, c]))
+        saturation = Saturation(store, clauses + [store.encode(Not([c]))],
+                                support={store.encode(Not([c]))})
+        self.assertTrue(saturation.run())
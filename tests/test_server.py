@@ -0,0 +1,103 @@
+from http.client import HTTPConnection
+from json import dumps, loads
+from threading import Thread
+from unittest import TestCase
+
+from src.server import Prover, ProverServer, read_request, RequestError
+from src.core.resolution import PROVED, UNPROVED, RESOURCE_OUT
+from src.core.limits import Limits
+from src.batch import ERROR
+
+
+class ServerTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ProverServer(('127.0.0.1', 0), Prover(1))
+        cls.thread = Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.server.prover.close()
+
+    def request(self, connection: HTTPConnection, method: str, path: str,
+                body: dict | None = None) -> tuple[int, dict]:
+        connection.request(method, path, None if body is None else dumps(body))
+        response = connection.getresponse()
+        return response.status, loads(response.read())
+
+    def test_read_request(self):
+        formula_str, options = read_request(b'{"formula": " a => a ", "limits": {"steps": 5}}',
+                                            Limits(time=1))
+        self.assertEqual(formula_str, 'a => a')
+        self.assertEqual(options, {'limits': Limits(time=1, steps=5)})
+        # Limits of the server can be tightened, but not raised or removed
+        _, options = read_request(
+            b'{"formula": "a", "limits": {"time": null, "steps": 1e18, "clauses": 10}}',
+            Limits(time=5, steps=1000, clauses=100))
+        self.assertEqual(options['limits'], Limits(time=5, steps=1000, clauses=10))
+        for body in [b'[', b'[]', b'{}', b'{"formula": 1}', b'{"formula": "a", "x": 1}',
+                     b'{"formula": "a", "options": {"ordering": "kbo"}}',
+                     b'{"formula": "a", "options": {"engine": "bogus"}}',
+                     b'{"formula": "a", "options": {"clausifier": ["distribution"]}}',
+                     b'{"formula": "a", "options": {"weight": "age"}}',
+                     b'{"formula": "a", "options": {"pick_ratio": 1.5}}',
+                     b'{"formula": "a", "options": {"pick_ratio": -1}}',
+                     b'{"formula": "a", "options": {"set_of_support": 1}}',
+                     b'{"formula": "a", "limits": {"steps": "5"}}']:
+            with self.assertRaises(RequestError):
+                read_request(body, Limits())
+
+    def test_prove(self):
+        connection = HTTPConnection('127.0.0.1', self.server.server_port)
+        try:
+            # Requests share one connection
+            self.assertEqual(self.request(connection, 'GET', '/health'), (200, {'status': 'ok'}))
+            status, result = self.request(connection, 'POST', '/prove',
+                                          {'formula': '(x) -> (y) (x) => y'})
+            self.assertEqual(status, 200)
+            self.assertEqual(result['status'], PROVED)
+            self.assertEqual(result['clauses'], 3)
+            status, result = self.request(
+                connection, 'POST', '/prove', {'formula': 'a => b',
+                                               'options': {'engine': 'saturation'}})
+            self.assertEqual(result['status'], UNPROVED)
+            status, result = self.request(connection, 'POST', '/prove',
+                                          {'formula': '(x) &'})
+            self.assertEqual(result['status'], ERROR)
+            status, result = self.request(connection, 'POST', '/prove',
+                                          {'formula': '(x) -> (y) (x) => y',
+                                           'limits': {'steps': 0}})
+            self.assertEqual((result['status'], result['resource']), (RESOURCE_OUT, 'steps'))
+            status, result = self.request(connection, 'POST', '/prove', {'text': 'a => a'})
+            self.assertEqual(status, 400)
+            self.assertIn('text', result['error'])
+            status, result = self.request(connection, 'POST', '/prove',
+                                          {'formula': 'a => a', 'options': {'engine': 'bogus'}})
+            self.assertEqual(status, 400)
+            self.assertIn('engine', result['error'])
+            status, result = self.request(connection, 'GET', '/prove')
+            self.assertEqual(status, 404)
+        finally:
+            connection.close()
+
+    def test_concurrent_requests(self):
+        results = [None] * 8
+
+        def run(i):
+            connection = HTTPConnection('127.0.0.1', self.server.server_port)
+            try:
+                results[i] = self.request(connection, 'POST', '/prove',
+                                          {'formula': f'(x) -> (y) (x) => y{i}'})[1]
+            finally:
+                connection.close()
+
+        threads = [Thread(target=run, args=(i,)) for i in range(len(results))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([result['status'] for result in results], [UNPROVED] * len(results))
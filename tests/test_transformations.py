@@ -3,6 +3,7 @@ from unittest import TestCase
 from src.model.formula_representation import *
 from src.core.transformations import *
 from src.config.logger_conf import configure_logger
+from src.util import rewrite
 
 CHARS = {
         'exists': '∃',
@@ -122,10 +123,44 @@ class TransformationsTests(TestCase):
             )
         expected = 'forall v_y1 (forall v_y2 (cfp_P(sc_\'c0\', sf_f0(v_y1), sf_f1(v_y1, v_y2), ' + \
                 'v_y1, v_y2)))'
-        # Variables somehow become [y] without [] here
         actual = repr(skolemize(formula, []))
         self.assertEqual(actual, expected)
 
+    def test_skolemize_siblings(self):
+        '''Universal variable of one conjunct doesn't leak to the other'''
+        SkolemovConstant.reset_counter()
+        formula = And([
+            Forall(Variable('x'), CustomFunctionOrPredicate('P', [Variable('x')])),
+            Exists(Variable('y'), CustomFunctionOrPredicate('Q', [Variable('y')])),
+        ])
+        expected = '(forall v_x (cfp_P(v_x))) and (cfp_Q(sc_\'c0\'))'
+        actual = repr(skolemize(formula))
+        self.assertEqual(actual, expected)
+
+    def test_miniscope_distribute(self):
+        # forall x (P(x) and Q) -> (forall x P(x)) and Q
+        formula = Forall(Variable('x'), And([
+            CustomFunctionOrPredicate('P', [Variable('x')]), Variable('Q')]))
+        expected = '(forall v_x (cfp_P(v_x))) and (v_Q)'
+        actual = repr(miniscope(formula))
+        self.assertEqual(actual, expected)
+
+    def test_miniscope_partition(self):
+        # forall x exists y (P(x) or Q(y)) -> (forall x P(x)) or (exists y Q(y))
+        formula = Forall(Variable('x'), Exists(Variable('y'), Or([
+            CustomFunctionOrPredicate('P', [Variable('x')]),
+            CustomFunctionOrPredicate('Q', [Variable('y')]),
+        ])))
+        expected = '(forall v_x (cfp_P(v_x))) or (exists v_y (cfp_Q(v_y)))'
+        actual = repr(miniscope(formula))
+        self.assertEqual(actual, expected)
+
+    def test_miniscope_keeps_dependency(self):
+        # forall x exists y P(x, y) cannot be changed
+        formula = Forall(Variable('x'), Exists(Variable('y'), CustomFunctionOrPredicate(
+            'P', [Variable('x'), Variable('y')])))
+        self.assertIs(miniscope(formula), formula)
+
     def test_remove_foralls(self):
         formula = Or([Forall(Variable('x'), Forall(Variable('y'), Equals([
             Variable('x'), Variable('y')
@@ -281,3 +316,16 @@ class TransformationsTests(TestCase):
         expected = ['equals(v_x, v_y)', 'v_z', '(v_t) or (v_p)']
         actual = list(map(repr, break_to_clauses(formula)))
         self.assertEqual(actual, expected)
+
+    def test_rewrite_unchanged(self):
+        formula = Or([Variable('x'), And([Variable('y'), Variable('z')])])
+        actual, changed = rewrite(formula, merge_step)
+        self.assertFalse(changed)
+        self.assertIs(actual, formula)
+
+    def test_rewrite_shares_subtrees(self):
+        unchanged = And([Variable('y'), Variable('z')])
+        formula = Or([Or([Variable('x'), Variable('t')]), unchanged])
+        actual, changed = rewrite(formula, merge_step)
+        self.assertTrue(changed)
+        self.assertIs(actual.children()[2], unchanged)
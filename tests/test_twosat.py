@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from src.model.formula_representation import *
+from src.core.clause_store import ClauseStore
+from src.core.twosat import TwoSAT, is_binary
+from src.core.resolution import Resolution
+
+
+class TwoSATTests(TestCase):
+
+    def encode(self, clauses: list[list[int]]) -> (ClauseStore, list):
+        store = ClauseStore()
+        ids = {abs(lit): store.atom_id(Variable(f'v{abs(lit)}'))
+               for clause in clauses for lit in clause}
+        return store, [tuple(sorted(ids[abs(lit)] * (1 if lit > 0 else -1) for lit in clause))
+                       for clause in clauses]
+
+    def test_is_binary(self):
+        self.assertTrue(is_binary([(1, 2), (-1, ), ()]))
+        self.assertFalse(is_binary([(1, 2, 3)]))
+
+    def test_unsat(self):
+        store, clauses = self.encode([[1, 2], [-1, 2], [1, -2], [-1, -2]])
+        solver = TwoSAT(store, clauses)
+        self.assertTrue(solver.solve())
+        # Every step resolves input clauses or earlier resolvents, and the last one gives nil
+        known = set(clauses)
+        for step in solver.steps:
+            for clause in step.clauses:
+                self.assertIn(clause, known)
+            known.add(step.new_clause)
+        self.assertEqual(solver.steps[-1].new_clause, ())
+
+    def test_sat(self):
+        store, clauses = self.encode([[1, 2], [-1, 3], [-2, -3], [3, 4]])
+        self.assertFalse(TwoSAT(store, clauses).solve())
+
+    def test_unit_clauses(self):
+        store, clauses = self.encode([[1], [-1, 2], [-2, 3], [-3]])
+        solver = TwoSAT(store, clauses)
+        self.assertTrue(solver.solve())
+        self.assertEqual(solver.steps[-1].new_clause, ())
+
+    def test_resolution_engines_agree(self):
+        # (a -> b) & (b -> c) => a -> c
+        a, b, c = Variable('a'), Variable('b'), Variable('c')
+        formula = ImplicationSign(And([Implication([a, b]), Implication([b, c])]),
+                                  Implication([a, c]))
+        self.assertTrue(Resolution(formula, engine='2sat').resolution())
+        self.assertTrue(Resolution(formula, engine='cdcl').resolution())
+        formula = ImplicationSign(Implication([a, b]), Implication([b, a]))
+        self.assertFalse(Resolution(formula, engine='2sat').resolution())
+        self.assertFalse(Resolution(formula, engine='cdcl').resolution())
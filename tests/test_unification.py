@@ -2,7 +2,10 @@ from unittest import TestCase
 
 from src.model.formula_representation import *
 from src.core.unification import Unification
+from src.core.clause_store import ClauseStore
 from src.core.resolution_info import UnifierInfo
+from src.core.substitution import Substitution
+from src.core.subsumption import term_depth
 
 
 class UnificationTests(TestCase):
@@ -68,6 +71,53 @@ class UnificationTests(TestCase):
             Implication([Not([Variable('x')]),
                          Equivalence([Variable('x'), Not([Variable('y')])])]), False, dict())
 
+    def test_unify_conflicting_bindings(self):
+        '''x cannot be replaced with two different constants'''
+        self.unification_to_same_test(
+            CustomFunctionOrPredicate('P', [Variable('x'), Variable('x')]),
+            CustomFunctionOrPredicate('P', [Constant('a'), Constant('b')]), False, dict())
+
+    def test_unify_occurs_check(self):
+        sk_fun = SkolemovFunction([Variable('x')])
+        self.assertIsNone(Unification.unify(sk_fun, Implication([sk_fun, Variable('y')])))
+
+    def test_unify_bindings_are_not_chained(self):
+        '''x can replace Skolemov constant, but c can't replace x, so c doesn't reach it'''
+        sk_const = SkolemovConstant()
+        a = CustomFunctionOrPredicate('P', [Variable('x'), Variable('x')])
+        b = CustomFunctionOrPredicate('P', [sk_const, Constant('c')])
+        self.assertIsNone(Unification.unify(a, b))
+        self.assertIsNone(Unification.unify(b, a))
+
+    def test_unify_one_direction(self):
+        '''Terms of a replace terms of b in all positions'''
+        sk_fun = SkolemovFunction([Variable('x')])
+        a = CustomFunctionOrPredicate('R', [Variable('x'), sk_fun])
+        b = CustomFunctionOrPredicate('R', [SkolemovFunction([Variable('y')]), Variable('y')])
+        self.assertIsNone(Unification.unify_either(a, b))
+
+    def test_skolemov_terms_are_not_unified(self):
+        sk_const_1 = SkolemovConstant()
+        sk_const_2 = SkolemovConstant()
+        sk_fun = SkolemovFunction([Variable('x')])
+        self.assertIsNone(Unification.unify_either(sk_const_1, sk_const_2))
+        self.assertIsNone(Unification.unify_either(sk_const_1, sk_fun))
+        self.assertIsNone(Unification.unify_either(
+            CustomFunctionOrPredicate('R', [sk_const_1, Variable('y')]),
+            CustomFunctionOrPredicate('R', [sk_const_2, sk_const_2])))
+
+    def test_terms_deeper_than_recursion_limit(self):
+        depth = 10 ** 5
+        pattern, target = Variable('x'), Constant('c')
+        for _ in range(depth):
+            pattern, target = Not([pattern]), Not([target])
+        subst = Substitution()
+        subst.bind(Variable('x'), Constant('c'))
+        self.assertIs(subst.apply(pattern), target)
+        self.assertEqual(Unification.try_match(pattern, target, dict()),
+                         {Variable('x'): Constant('c')})
+        self.assertEqual(term_depth(target), depth + 1)
+
     def test_try_resolve_negation_1(self):
         '''B is negation of A'''
         self.try_resolve_test(Variable('x'), Not([Variable('x')]), True, dict())
@@ -80,3 +130,23 @@ class UnificationTests(TestCase):
         '''Negation on inner level'''
         self.try_resolve_test(Or([Variable('x'), Variable('y')]),
                               Or([Variable('x'), Not([Variable('y')])]), True, dict())
+
+    def test_resolve_encoded_exact(self):
+        store = ClauseStore()
+        a = store.encode(Or([Variable('x'), Variable('y')]))
+        b = store.encode(Or([Not([Variable('x')]), Variable('z')]))
+        res, new_clause, unif = Unification.resolve_encoded(store, a, b)
+        self.assertTrue(res)
+        self.assertEqual(new_clause, store.encode(Or([Variable('y'), Variable('z')])))
+        self.assertEqual(unif, [])
+
+    def test_resolve_encoded_unifier(self):
+        store = ClauseStore()
+        a = store.encode(CustomFunctionOrPredicate('P', [Constant('V')]))
+        b = store.encode(
+            Or([Not([CustomFunctionOrPredicate('P', [Variable('x')])]),
+                CustomFunctionOrPredicate('Q', [Variable('x')])]))
+        res, new_clause, unif = Unification.resolve_encoded(store, a, b)
+        self.assertTrue(res)
+        self.assertEqual(repr(store.decode(new_clause)), 'cfp_Q(c_\'V\')')
+        self.assertEqual(unif, [UnifierInfo(Constant('V'), Variable('x'))])
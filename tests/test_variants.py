@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+from src.model.formula_representation import *
+from src.core.variants import variant_key, remove_variants
+from src.core.resolution import Resolution
+
+
+class VariantsTests(TestCase):
+
+    def setUp(self):
+        self.p = lambda *args: CustomFunctionOrPredicate('P', list(args))
+        self.q = lambda *args: CustomFunctionOrPredicate('Q', list(args))
+
+    def test_renaming(self):
+        p, q = self.p, self.q
+        x, y = Variable('x'), Variable('y')
+        a, b = Variable('tmp3'), Variable('tmp7')
+        self.assertEqual(variant_key(Or([p(x), q(y)])), variant_key(Or([p(a), q(b)])))
+        self.assertEqual(variant_key(Or([p(x), q(y)])), variant_key(Or([q(b), p(a)])))
+        self.assertNotEqual(variant_key(Or([p(x), q(y)])), variant_key(Or([p(x), q(x)])))
+
+    def test_same_structure_literals(self):
+        p = self.p
+        x, y, z = Variable('x'), Variable('y'), Variable('z')
+        self.assertEqual(variant_key(Or([p(x, y), p(y, x)])), variant_key(Or([p(z, x), p(x, z)])))
+        self.assertNotEqual(variant_key(Or([p(x, y), p(y, x)])),
+                            variant_key(Or([p(x, y), p(y, y)])))
+
+    def test_propositional_letters_kept(self):
+        x, y = Variable('x'), Variable('y')
+        self.assertNotEqual(variant_key(x), variant_key(y))
+        self.assertNotEqual(variant_key(Or([x, Not([y])])), variant_key(Or([y, Not([x])])))
+
+    def test_constants_kept(self):
+        p = self.p
+        self.assertNotEqual(variant_key(p(Constant('I'))), variant_key(p(Constant('T'))))
+        self.assertNotEqual(variant_key(p(Constant('I'))), variant_key(p(Variable('x'))))
+
+    def test_remove_variants(self):
+        p, q = self.p, self.q
+        x, y = Variable('x'), Variable('y')
+        clauses = [Or([p(x), q(y)]), Or([q(x), p(y)]), p(x), Or([p(y), q(y)])]
+        self.assertEqual(remove_variants(clauses), [Or([p(x), q(y)]), p(x), Or([p(y), q(y)])])
+        self.assertEqual(len(Resolution.comb_clauses(clauses)), 3)